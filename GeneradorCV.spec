@@ -6,7 +6,8 @@ a = Analysis(
     pathex=[],
     binaries=[],
     datas=[('templates', 'templates'), ('static', 'static'), ('config', 'config'), ('models', 'models'), ('services', 'services'), ('routes', 'routes')],
-    hiddenimports=[],
+    # PyMuPDF se importa al pedir la primera vista previa (services/preview_service.py)
+    hiddenimports=['pymupdf'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
@@ -2,11 +2,23 @@
 Aplicación principal del Generador de CV.
 Punto de entrada de la aplicación Flask.
 """
-import webbrowser
-import threading
-from flask import Flask
-from config import config
-from routes import cv_bp, general_bp
+from services.startup import startup_timer
+
+with startup_timer.phase('import flask'):
+    import webbrowser
+    import threading
+    from flask import Flask
+
+with startup_timer.phase('import config'):
+    from config import config
+    from config.settings import Config
+
+with startup_timer.phase('import routes'):
+    from routes import cv_bp, general_bp
+    from services.codec import CodecJSONProvider
+
+HOST = '127.0.0.1'
+PORT = 5000
 
 
 def create_app(config_name='default'):
@@ -24,6 +36,9 @@ def create_app(config_name='default'):
     # Cargar configuración
     app.config.from_object(config[config_name])
     
+    # JSON de peticiones y respuestas con el codificador configurado
+    app.json = CodecJSONProvider(app)
+    
     # Registrar blueprints
     app.register_blueprint(cv_bp)
     app.register_blueprint(general_bp)
@@ -31,22 +46,187 @@ def create_app(config_name='default'):
     return app
 
 
-def open_browser():
+def open_browser(timeout=15.0):
     """
-    Abre el navegador automáticamente después de un pequeño delay.
+    Abre el navegador en cuanto el servidor responde a /healthz.
+    
+    Args:
+        timeout: Segundos máximos de espera antes de abrirlo de todos modos.
     """
     import time
-    time.sleep(1.5)  # Esperar a que el servidor esté listo
-    webbrowser.open('http://localhost:5000')
+    import urllib.request
+    
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(f'http://{HOST}:{PORT}/healthz', timeout=1) as response:
+                if response.status == 200:
+                    break
+        except OSError:
+            time.sleep(0.05)
+    startup_timer.mark('browser opened')
+    webbrowser.open(f'http://localhost:{PORT}')
 
 
-if __name__ == '__main__':
-    app = create_app('production')  # Usar producción para evitar reloader
+def warm_up():
+    """
+    Carga ReportLab en segundo plano, arranca el pool de /generate_pdf_batch
+    e imprime los tiempos de arranque.
+    
+    Con --serve y varios procesos se ejecuta en cada hijo después del fork,
+    así cada uno tiene su propio pool.
+    """
+    from routes.cv_routes import get_pdf_services
+    from services.startup import warm_up_pdf
+    
+    warm_up_pdf(get_pdf_services)
+    if Config.PDF_BATCH_WARM_UP and startup_timer.warmup_error is None:
+        with startup_timer.phase('warm-up: batch workers'):
+            get_pdf_services().batch.warm_up()
+    print(startup_timer.format_report())
+
+
+def parse_args():
+    """
+    Lee los argumentos de línea de comandos.
+    
+    Returns:
+        argparse.Namespace: Argumentos reconocidos.
+    """
+    import argparse
+    parser = argparse.ArgumentParser(description="Generador de CV")
+    parser.add_argument('--migrate-sqlite', action='store_true',
+                        help="Importa los archivos JSON a la base de datos SQLite y termina")
+    parser.add_argument('--overwrite', action='store_true',
+                        help="Con --migrate-sqlite, reemplaza los datos que ya existan en SQLite")
+    parser.add_argument('--serve', action='store_true',
+                        help="Modo servidor compartido con waitress (sin abrir el navegador)")
+    parser.add_argument('--host', default=None,
+                        help=f"Interfaz de escucha (por defecto {HOST}; con --serve, {Config.SERVE_HOST})")
+    parser.add_argument('--port', type=int, default=None,
+                        help=f"Puerto de escucha (por defecto {PORT}; con --serve, {Config.SERVE_PORT})")
+    parser.add_argument('--threads', type=int, default=Config.SERVE_THREADS,
+                        help="Con --serve, hilos por proceso")
+    parser.add_argument('--processes', type=int, default=Config.SERVE_PROCESSES,
+                        help="Con --serve, procesos que comparten el socket (solo POSIX)")
+    parser.add_argument('--keepalive', type=int, default=Config.SERVE_KEEPALIVE,
+                        help="Con --serve, segundos que se mantiene una conexión inactiva")
+    parser.add_argument('--no-browser', action='store_true',
+                        help="No abrir el navegador al arrancar")
+    return parser.parse_args()
+
+
+def serve(app, host, port, threads, processes, keepalive):
+    """
+    Sirve la aplicación con waitress para uso compartido.
+    
+    Con más de un proceso (solo POSIX) el socket se abre una vez y los
+    procesos hijos lo comparten; los datos se coordinan a través de los
+    archivos (ver DataService.enable_multiprocess).
     
-    # Solo abrir el navegador si no es el proceso de recarga de Flask
-    # WERKZEUG_RUN_MAIN es None en el proceso principal
+    Args:
+        app: Aplicación Flask.
+        host: Interfaz de escucha.
+        port: Puerto de escucha.
+        threads: Hilos de waitress por proceso.
+        processes: Número de procesos.
+        keepalive: Segundos que se mantiene abierta una conexión inactiva.
+    """
     import os
-    if os.environ.get('WERKZEUG_RUN_MAIN') != 'true':
+    import signal
+    import socket
+    try:
+        from waitress import serve as waitress_serve
+    except ImportError:
+        raise SystemExit("El modo --serve requiere waitress: pip install waitress")
+    
+    options = {
+        'threads': max(1, threads),
+        'channel_timeout': keepalive,
+        'connection_limit': Config.SERVE_CONNECTION_LIMIT,
+        'ident': 'GeneradorCV'
+    }
+    if processes > 1 and not hasattr(os, 'fork'):
+        print("Varios procesos solo están disponibles en POSIX; se usará uno")
+        processes = 1
+    
+    print(f" * Serving on http://{host}:{port} ({processes} proceso(s) x {options['threads']} hilos)")
+    if processes <= 1:
+        threading.Thread(target=warm_up, name='pdf-warm-up', daemon=True).start()
+        waitress_serve(app, host=host, port=port, **options)
+        return
+    
+    from services.data_service import DataService
+    DataService.enable_multiprocess()
+    listener = socket.create_server((host, port), backlog=1024)
+    
+    # Los hilos no sobreviven a fork(): el precalentamiento se lanza en cada hijo
+    children = []
+    for _ in range(processes):
+        pid = os.fork()
+        if pid == 0:
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            threading.Thread(target=warm_up, name='pdf-warm-up', daemon=True).start()
+            try:
+                waitress_serve(app, sockets=[listener], **options)
+            finally:
+                os._exit(0)
+        children.append(pid)
+    listener.close()
+    
+    def stop(signum, frame):
+        for child in children:
+            try:
+                os.kill(child, signal.SIGTERM)
+            except OSError:
+                pass
+    
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    for child in children:
+        try:
+            os.waitpid(child, 0)
+        except ChildProcessError:
+            pass
+
+
+if __name__ == '__main__':
+    # Necesario para el pool de procesos de /generate_pdf_batch en el ejecutable de PyInstaller
+    import multiprocessing
+    multiprocessing.freeze_support()
+    
+    args = parse_args()
+    if args.migrate_sqlite:
+        from services.sqlite_storage import migrate_json_to_sqlite
+        for document, result in migrate_json_to_sqlite(overwrite=args.overwrite).items():
+            print(f"{document}: {result}")
+        raise SystemExit(0)
+    
+    with startup_timer.phase('create app'):
+        app = create_app('production')  # Usar producción para evitar reloader
+    
+    if args.serve:
+        serve(app, args.host or Config.SERVE_HOST, args.port or Config.SERVE_PORT,
+              args.threads, args.processes, args.keepalive)
+        raise SystemExit(0)
+    
+    PORT = args.port or PORT
+    HOST = args.host or HOST
+    
+    # Abrir el socket antes de cargar ReportLab: las páginas se sirven de inmediato
+    from werkzeug.serving import make_server
+    with startup_timer.phase('bind server'):
+        server = make_server(HOST, PORT, app, threaded=True)
+    startup_timer.mark('server bound')
+    
+    threading.Thread(target=warm_up, name='pdf-warm-up', daemon=True).start()
+    if not args.no_browser:
         threading.Thread(target=open_browser, daemon=True).start()
     
-    app.run(debug=False, use_reloader=False)  # Desactivar debug y reloader
+    print(f" * Running on http://{HOST}:{PORT}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
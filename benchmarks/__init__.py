@@ -0,0 +1 @@
+"""Scripts de medición de rendimiento del Generador de CV."""
@@ -0,0 +1,68 @@
+"""
+Punto de entrada de las mediciones.
+
+Ejemplos:
+    python -m benchmarks --sizes 1,20,200 --repeat 20 --output bench.json
+    python -m benchmarks --baseline bench.json          # compara con una ejecución guardada
+    python -m benchmarks load --compare                 # prueba de carga HTTP (ver load_test)
+"""
+import argparse
+import json
+import os
+import sys
+from typing import List, Optional
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == 'load':
+        from benchmarks import load_test
+        return load_test.main(argv[1:])
+
+    from benchmarks.suite import (DEFAULT_SIZES, compare_results, format_comparison,
+                                  format_results, run_suite)
+
+    parser = argparse.ArgumentParser(prog='python -m benchmarks',
+                                     description="Mediciones de generación de PDF y E/S de datos")
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)),
+                        help="Números de experiencias separados por comas")
+    parser.add_argument('--repeat', type=int, default=10, help="Mediciones por métrica")
+    parser.add_argument('--output', help="Archivo JSON donde guardar los resultados")
+    parser.add_argument('--baseline', help="Resultados anteriores con los que comparar")
+    parser.add_argument('--threshold', type=float, default=10.0,
+                        help="Empeoramiento (%%) del p50 considerado regresión")
+    parser.add_argument('--json', action='store_true', help="Imprime los resultados en JSON")
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(',') if size.strip()]
+    progress = (lambda message: print(message, file=sys.stderr)) if args.json else print
+    data = run_suite(sizes, args.repeat, progress)
+
+    exit_code = 0
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            rows = compare_results(json.load(f), data, args.threshold)
+        data['comparison'] = {'baseline': args.baseline, 'thresholdPct': args.threshold, 'rows': rows}
+        if any(row['status'] == 'regression' for row in rows):
+            exit_code = 1
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+
+    if args.json:
+        print(json.dumps(data, indent=2, ensure_ascii=False))
+    else:
+        print(format_results(data))
+        if args.baseline:
+            print()
+            print(format_comparison(data['comparison']['rows']))
+    return exit_code
+
+
+if __name__ == '__main__':
+    sys.exit(main())
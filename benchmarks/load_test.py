@@ -0,0 +1,239 @@
+"""
+Prueba de carga HTTP del Generador de CV.
+
+Ejemplos:
+    python -m benchmarks.load_test --url http://127.0.0.1:5000 --scenario mixed
+    python -m benchmarks.load_test --compare --processes 4 --threads 8
+
+Con --compare arranca la aplicación dos veces (servidor de desarrollo y
+--serve con waitress) y ejecuta la misma carga contra ambos.
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+from typing import Dict, Any, List, Optional, Tuple
+from urllib.parse import urlparse
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (peso, método, ruta) de cada escenario
+SCENARIOS = {
+    'read': [(1.0, 'GET', '/get_cv_data')],
+    'pdf': [(1.0, 'POST', '/generate_pdf')],
+    'mixed': [(0.75, 'GET', '/get_cv_data'), (0.15, 'GET', '/'), (0.10, 'POST', '/generate_pdf')],
+}
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Percentil por interpolación lineal (values debe estar ordenada)."""
+    if not values:
+        return 0.0
+    position = (len(values) - 1) * pct / 100
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+
+def load_payload() -> Dict[str, Any]:
+    """Datos del CV usados para /generate_pdf (los del proyecto, o uno mínimo)."""
+    try:
+        with open(os.path.join(BASE_DIR, 'cv_data.json'), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {'fullName': 'Load Test', 'skills': [], 'experience': [], 'education': []}
+
+
+def run_load(url: str, scenario: str, concurrency: int, duration: float,
+             unique_pdfs: bool = False) -> Dict[str, Any]:
+    """
+    Ejecuta la carga con conexiones keep-alive (una por hilo).
+
+    Args:
+        url: URL base del servidor.
+        scenario: Nombre del escenario (ver SCENARIOS).
+        concurrency: Número de clientes simultáneos.
+        duration: Segundos de carga.
+        unique_pdfs: Si cada PDF lleva tamaños distintos para evitar la caché.
+
+    Returns:
+        Dict: Peticiones, errores, throughput y latencias (ms).
+    """
+    target = urlparse(url)
+    routes = SCENARIOS[scenario]
+    weights = [weight for weight, _, _ in routes]
+    payload = load_payload()
+    latencies: List[float] = []
+    errors: Dict[str, int] = {}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def client(seed: int) -> None:
+        rng = random.Random(seed)
+        connection = http.client.HTTPConnection(target.hostname, target.port or 80, timeout=60)
+        local_latencies = []
+        local_errors: Dict[str, int] = {}
+        while time.perf_counter() < deadline:
+            _, method, path = rng.choices(routes, weights)[0]
+            body = None
+            headers = {}
+            if method == 'POST':
+                data = payload
+                if unique_pdfs:
+                    data = dict(payload, fontSizes=dict(payload.get('fontSizes') or {},
+                                                        name=round(2 + rng.random(), 4)))
+                body = json.dumps(data)
+                headers['Content-Type'] = 'application/json'
+            start = time.perf_counter()
+            try:
+                connection.request(method, path, body=body, headers=headers)
+                response = connection.getresponse()
+                response.read()
+                if response.status >= 400:
+                    key = f"HTTP {response.status}"
+                    local_errors[key] = local_errors.get(key, 0) + 1
+                    continue
+                if response.getheader('Connection', '').lower() == 'close':
+                    connection.close()
+            except (OSError, http.client.HTTPException) as e:
+                key = type(e).__name__
+                local_errors[key] = local_errors.get(key, 0) + 1
+                connection.close()
+                connection = http.client.HTTPConnection(target.hostname, target.port or 80, timeout=60)
+                continue
+            local_latencies.append((time.perf_counter() - start) * 1000)
+        connection.close()
+        with lock:
+            latencies.extend(local_latencies)
+            for key, count in local_errors.items():
+                errors[key] = errors.get(key, 0) + count
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        'url': url,
+        'scenario': scenario,
+        'concurrency': concurrency,
+        'durationS': round(elapsed, 2),
+        'requests': len(latencies),
+        'errors': errors,
+        'rps': round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        'latencyMs': {
+            'p50': round(percentile(latencies, 50), 2),
+            'p95': round(percentile(latencies, 95), 2),
+            'p99': round(percentile(latencies, 99), 2),
+            'max': round(latencies[-1], 2) if latencies else 0.0
+        }
+    }
+
+
+def wait_ready(url: str, timeout: float = 30.0) -> None:
+    """Espera a que /healthz indique que los servicios de PDF están listos."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(f"{url}/healthz", timeout=1) as response:
+                if json.load(response).get('pdfReady'):
+                    return
+        except (OSError, ValueError):
+            pass
+        time.sleep(0.1)
+    raise RuntimeError(f"El servidor {url} no respondió a tiempo")
+
+
+def start_server(extra_args: List[str], port: int) -> Tuple[subprocess.Popen, str]:
+    """Arranca app.py en un subproceso y retorna (proceso, URL base)."""
+    command = [sys.executable, os.path.join(BASE_DIR, 'app.py'), '--no-browser',
+               '--host', '127.0.0.1', '--port', str(port)] + extra_args
+    process = subprocess.Popen(command, cwd=BASE_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    url = f"http://127.0.0.1:{port}"
+    try:
+        wait_ready(url)
+    except RuntimeError:
+        process.kill()
+        raise
+    return process, url
+
+
+def stop_server(process: subprocess.Popen) -> None:
+    """Detiene un servidor arrancado con start_server()."""
+    process.terminate()
+    try:
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+def compare(args) -> List[Dict[str, Any]]:
+    """Ejecuta la misma carga contra el servidor de desarrollo y contra --serve."""
+    modes = [
+        ('werkzeug (dev)', []),
+        (f'waitress {args.processes}x{args.threads}',
+         ['--serve', '--threads', str(args.threads), '--processes', str(args.processes)]),
+    ]
+    results = []
+    for index, (label, extra_args) in enumerate(modes):
+        process, url = start_server(extra_args, args.base_port + index)
+        try:
+            result = run_load(url, args.scenario, args.concurrency, args.duration, args.unique)
+        finally:
+            stop_server(process)
+        result['server'] = label
+        results.append(result)
+    return results
+
+
+def print_table(results: List[Dict[str, Any]]) -> None:
+    """Imprime los resultados en formato de tabla."""
+    print(f"{'servidor':<22} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errores':>8}")
+    for result in results:
+        latency = result['latencyMs']
+        error_count = sum(result['errors'].values())
+        print(f"{result.get('server', result['url']):<22} {result['rps']:>9.1f} {latency['p50']:>9.2f} "
+              f"{latency['p95']:>9.2f} {latency['p99']:>9.2f} {error_count:>8}")
+    if len(results) == 2 and results[0]['rps']:
+        print(f"Mejora de throughput: x{results[1]['rps'] / results[0]['rps']:.2f}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Prueba de carga del Generador de CV")
+    parser.add_argument('--url', default='http://127.0.0.1:5000', help="Servidor ya en ejecución")
+    parser.add_argument('--scenario', choices=sorted(SCENARIOS), default='mixed')
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=10.0, help="Segundos de carga por servidor")
+    parser.add_argument('--unique', action='store_true', help="PDFs distintos en cada petición (sin caché)")
+    parser.add_argument('--compare', action='store_true',
+                        help="Arranca el servidor de desarrollo y --serve y compara ambos")
+    parser.add_argument('--threads', type=int, default=8, help="Con --compare, hilos de waitress")
+    parser.add_argument('--processes', type=int, default=1, help="Con --compare, procesos de waitress")
+    parser.add_argument('--base-port', type=int, default=5101, help="Con --compare, primer puerto libre")
+    parser.add_argument('--json', action='store_true', help="Imprime los resultados en JSON")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        results = compare(args)
+    else:
+        results = [run_load(args.url, args.scenario, args.concurrency, args.duration, args.unique)]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_table(results)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,284 @@
+"""
+Mediciones de generación de PDF y de entrada/salida de datos.
+
+Por cada tamaño de CV mide:
+- render: PDFService.generate con la caché de secciones fría y caliente.
+- sections: tiempo de construcción de cada sección (sin caché).
+- from_dict / to_dict / json_roundtrip: conversión del modelo y JSON.
+- save_raw / load_raw: DataService contra un archivo temporal.
+- memoria: pico de tracemalloc por render y RSS máximo del proceso.
+"""
+import gc
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import defaultdict
+from typing import Callable, Dict, Any, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from benchmarks.load_test import percentile
+from benchmarks.synthetic import make_cv
+
+DEFAULT_SIZES = [1, 5, 20, 50, 100, 200]
+# Duración mínima (segundos) de cada muestra de measure()
+MIN_SAMPLE_TIME = 0.005
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """
+    Resume una lista de duraciones en segundos.
+
+    Returns:
+        Dict: n, media, mínimo, percentiles y máximo en milisegundos.
+    """
+    values = sorted(sample * 1000 for sample in samples)
+    return {
+        'n': len(values),
+        'mean': round(sum(values) / len(values), 3),
+        'min': round(values[0], 3),
+        'p50': round(percentile(values, 50), 3),
+        'p95': round(percentile(values, 95), 3),
+        'p99': round(percentile(values, 99), 3),
+        'max': round(values[-1], 3)
+    }
+
+
+def measure(fn: Callable[[], Any], repeat: int, warmup: int = 1,
+            setup: Optional[Callable[[], Any]] = None) -> Dict[str, float]:
+    """
+    Mide fn() `repeat` veces (setup() se ejecuta antes de cada una, fuera del tiempo).
+
+    Las funciones muy rápidas se repiten dentro de cada muestra hasta
+    sumar MIN_SAMPLE_TIME, para que el resultado no sea ruido del reloj.
+
+    Args:
+        fn: Función a medir.
+        repeat: Número de mediciones.
+        warmup: Ejecuciones previas descartadas.
+        setup: Preparación opcional antes de cada ejecución.
+
+    Returns:
+        Dict: Resumen de summarize() más el número de llamadas por muestra.
+    """
+    elapsed = 0.0
+    for _ in range(max(1, warmup)):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+    loops = 1 if setup or elapsed >= MIN_SAMPLE_TIME else int(MIN_SAMPLE_TIME / max(elapsed, 1e-7)) + 1
+
+    samples = []
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            if setup:
+                setup()
+            start = time.perf_counter()
+            for _ in range(loops):
+                fn()
+            samples.append((time.perf_counter() - start) / loops)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return dict(summarize(samples), loops=loops)
+
+
+def max_rss_kb() -> Optional[int]:
+    """RSS máximo del proceso en KB (None si la plataforma no lo expone)."""
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reporta bytes; Linux, kilobytes
+    return rss // 1024 if sys.platform == 'darwin' else rss
+
+
+def section_timings(cv_data, font_sizes, config, repeat: int) -> Dict[str, Dict[str, float]]:
+    """
+    Mide el tiempo de construcción de cada sección del PDF, sin caché.
+
+    Returns:
+        Dict: Resumen por nombre de sección.
+    """
+    from services.pdf_service import PDFContentBuilder, PDFStyleBuilder
+
+    samples: Dict[str, List[float]] = defaultdict(list)
+
+    class TimedContentBuilder(PDFContentBuilder):
+        def _section(self, name, payload, factory):
+            start = time.perf_counter()
+            elements = super()._section(name, payload, factory)
+            samples[name].append(time.perf_counter() - start)
+            return elements
+
+    style_builder = PDFStyleBuilder(config, font_sizes, cv_data.font_family)
+    TimedContentBuilder(style_builder, cache=None).build_document(cv_data)
+    samples.clear()
+    for _ in range(repeat):
+        TimedContentBuilder(style_builder, cache=None).build_document(cv_data)
+    return {name: summarize(values) for name, values in samples.items()}
+
+
+def bench_size(entries: int, repeat: int, workdir: str) -> Dict[str, Any]:
+    """
+    Ejecuta todas las mediciones para un CV de `entries` experiencias.
+
+    Args:
+        entries: Número de experiencias del CV sintético.
+        repeat: Mediciones por métrica.
+        workdir: Directorio temporal para las pruebas de DataService.
+
+    Returns:
+        Dict: Métricas, secciones y memoria para este tamaño.
+    """
+    from config.settings import Config
+    from models.cv_data import CVData
+    from services.data_service import DataService
+    from services.pdf_service import PDFService, section_cache
+
+    raw = make_cv(entries)
+    cv_data = CVData.from_dict(raw)
+    font_sizes = None
+    pdf_service = PDFService(Config, use_output_cache=False)
+    text = json.dumps(raw, ensure_ascii=False)
+
+    metrics = {
+        'render_cold': measure(lambda: pdf_service.generate(cv_data, font_sizes), repeat,
+                               setup=section_cache.clear),
+        'render_warm': measure(lambda: pdf_service.generate(cv_data, font_sizes), repeat),
+        'from_dict': measure(lambda: CVData.from_dict(raw), repeat),
+        'to_dict': measure(cv_data.to_dict, repeat),
+        'json_roundtrip': measure(lambda: CVData.from_dict(json.loads(json.dumps(cv_data.to_dict()))), repeat),
+    }
+
+    path = os.path.join(workdir, f"cv_{entries}.json")
+    writer = DataService(path)
+    metrics['save_raw'] = measure(lambda: writer.save_raw(raw), repeat)
+    # Una instancia nueva por lectura: mide el parseo desde disco, no la copia en memoria
+    metrics['load_raw'] = measure(lambda: DataService(path).load_raw(), repeat)
+
+    section_cache.clear()
+    tracemalloc.start()
+    pdf = pdf_service.generate(cv_data, font_sizes).getvalue()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'entries': entries,
+        'jsonBytes': len(text.encode('utf-8')),
+        'pdfBytes': len(pdf),
+        'metrics': metrics,
+        'sections': section_timings(cv_data, font_sizes, Config, repeat),
+        'renderPeakAllocKB': peak // 1024,
+        'maxRssKB': max_rss_kb()
+    }
+
+
+def environment() -> Dict[str, Any]:
+    """Datos del entorno de la medición."""
+    import reportlab
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'reportlab': reportlab.Version,
+        'cpus': os.cpu_count(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z')
+    }
+
+
+def run_suite(sizes: List[int], repeat: int, progress: Callable[[str], None] = print) -> Dict[str, Any]:
+    """
+    Ejecuta las mediciones para todos los tamaños.
+
+    Args:
+        sizes: Números de experiencias a medir, en orden creciente.
+        repeat: Mediciones por métrica.
+        progress: Función que recibe mensajes de avance.
+
+    Returns:
+        Dict: {'environment': ..., 'repeat': ..., 'results': [...]}.
+    """
+    workdir = tempfile.mkdtemp(prefix='cv_bench_')
+    results = []
+    try:
+        for entries in sorted(sizes):
+            progress(f"Midiendo CV con {entries} experiencias...")
+            results.append(bench_size(entries, repeat, workdir))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return {'environment': environment(), 'repeat': repeat, 'results': results}
+
+
+def compare_results(baseline: Dict[str, Any], current: Dict[str, Any],
+                    threshold: float) -> List[Dict[str, Any]]:
+    """
+    Compara el p50 de cada métrica con una ejecución guardada.
+
+    Args:
+        baseline: Resultados anteriores (salida de run_suite).
+        current: Resultados actuales.
+        threshold: Porcentaje de empeoramiento a partir del cual se marca regresión.
+
+    Returns:
+        Lista de filas con tamaño, métrica, p50 de ambas ejecuciones, cambio (%) y estado.
+    """
+    previous = {result['entries']: result for result in baseline.get('results', [])}
+    rows = []
+    for result in current['results']:
+        old = previous.get(result['entries'])
+        if old is None:
+            continue
+        for name, summary in result['metrics'].items():
+            old_summary = old['metrics'].get(name)
+            if not old_summary or not old_summary['p50']:
+                continue
+            change = (summary['p50'] - old_summary['p50']) / old_summary['p50'] * 100
+            if change > threshold:
+                status = 'regression'
+            elif change < -threshold:
+                status = 'improvement'
+            else:
+                status = 'same'
+            rows.append({
+                'entries': result['entries'],
+                'metric': name,
+                'baselineP50': old_summary['p50'],
+                'currentP50': summary['p50'],
+                'changePct': round(change, 1),
+                'status': status
+            })
+    return rows
+
+
+def format_results(data: Dict[str, Any]) -> str:
+    """Tabla de p50/p95 (ms) por tamaño y métrica."""
+    lines = [f"{'entradas':>8} {'métrica':<16} {'p50 ms':>10} {'p95 ms':>10}"]
+    for result in data['results']:
+        for name, summary in result['metrics'].items():
+            lines.append(f"{result['entries']:>8} {name:<16} {summary['p50']:>10.3f} {summary['p95']:>10.3f}")
+        rss = result['maxRssKB']
+        lines.append(f"{result['entries']:>8} {'pdf/memoria':<16} {result['pdfBytes']:>9}B "
+                     f"pico {result['renderPeakAllocKB']} KB, RSS máx {rss if rss is not None else '-'} KB")
+    return "\n".join(lines)
+
+
+def format_comparison(rows: List[Dict[str, Any]]) -> str:
+    """Tabla de la comparación contra la ejecución base."""
+    lines = [f"{'entradas':>8} {'métrica':<16} {'base ms':>10} {'actual ms':>10} {'cambio':>8}"]
+    for row in rows:
+        mark = {'regression': '  ▲', 'improvement': '  ▼'}.get(row['status'], '')
+        lines.append(f"{row['entries']:>8} {row['metric']:<16} {row['baselineP50']:>10.3f} "
+                     f"{row['currentP50']:>10.3f} {row['changePct']:>7.1f}%{mark}")
+    return "\n".join(lines)
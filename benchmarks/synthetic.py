@@ -0,0 +1,70 @@
+"""
+CVs sintéticos para las mediciones.
+Generan documentos deterministas (misma semilla, mismo CV) de tamaño creciente.
+"""
+import random
+from typing import Dict, Any
+
+WORDS = (
+    "design implement migrate optimize service platform latency throughput cache queue "
+    "deploy monitor pipeline database schema api client frontend backend team lead "
+    "customer revenue report analytics testing automation cloud kubernetes python "
+    "reduced improved delivered maintained scaled integrated refactored documented"
+).split()
+
+
+def sentence(rng: random.Random, words: int) -> str:
+    """Frase de `words` palabras tomadas de WORDS."""
+    text = " ".join(rng.choice(WORDS) for _ in range(words))
+    return text[0].upper() + text[1:] + "."
+
+
+def make_cv(entries: int, bullets: int = 4, bullet_words: int = 30, seed: int = 0) -> Dict[str, Any]:
+    """
+    Genera el diccionario de un CV (formato de cv_data.json).
+
+    Args:
+        entries: Número de experiencias laborales.
+        bullets: Responsabilidades por experiencia.
+        bullet_words: Palabras por responsabilidad.
+        seed: Semilla del generador.
+
+    Returns:
+        Dict: Datos del CV con habilidades y educación proporcionales a entries.
+    """
+    rng = random.Random(seed * 100003 + entries)
+    return {
+        'fullName': 'Benchmark Candidate',
+        'emailUser': 'bench',
+        'emailDomain': 'example.com',
+        'phone': '+1 555 0100',
+        'location': 'Remote',
+        'linkText': 'github.com/bench',
+        'linkUrl': 'https://github.com/bench',
+        'skillsSectionTitle': 'TECHNICAL SKILLS',
+        'skills': [
+            {'title': f"Skill group {i + 1}", 'description': ", ".join(rng.sample(WORDS, 8))}
+            for i in range(5 + entries // 2)
+        ],
+        'experienceSectionTitle': 'WORK EXPERIENCE',
+        'experience': [
+            {
+                'company': f"Company {i + 1}",
+                'position': sentence(rng, 3).rstrip('.'),
+                'duration': f"{2000 + i % 25} - {2001 + i % 25}",
+                'responsibilities': [sentence(rng, bullet_words) for _ in range(bullets)]
+            }
+            for i in range(entries)
+        ],
+        'educationSectionTitle': 'EDUCATION',
+        'education': [
+            {
+                'institution': f"University {i + 1}",
+                'degree': sentence(rng, 4).rstrip('.'),
+                'date': str(1995 + i),
+                'description': sentence(rng, 12)
+            }
+            for i in range(1 + entries // 10)
+        ],
+        'fontFamily': 'Helvetica'
+    }
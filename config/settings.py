@@ -25,6 +25,63 @@ class Config:
     PROMPTS_DATA_FILE = os.path.join(BASE_DIR, 'prompts_data.json')
     EMPLEOS_DATA_FILE = os.path.join(BASE_DIR, 'empleos_data.json')
     
+    # Variantes del CV por empleo (diferencias sobre cv_data.json)
+    PROFILES_DIR = os.path.join(BASE_DIR, 'profiles')
+    PROFILE_CACHE_SIZE = 32  # variantes resueltas en memoria
+    PROFILE_MAX_DEPTH = 8  # capas máximas (variante sobre variante)
+    
+    # Búsqueda de empleos (GET /empleos)
+    EMPLEOS_PAGE_SIZE = 50
+    EMPLEOS_MAX_PAGE_SIZE = 200
+    
+    # Compatibilidad CV / puesto (POST /ats_score). NumPy es opcional.
+    ATS_CACHE_SIZE = 512  # vectores de puestos y de CVs en memoria
+    ATS_MISSING_KEYWORDS = 15  # palabras clave faltantes reportadas por puesto
+    ATS_MAX_JOBS = 1000  # puestos por petición
+    
+    # Armado del prompt de IA (/prompt/render). Plantillas adicionales por nombre,
+    # con marcadores {{prompt}}, {{job_info}} y {{cv_json}} y bloques
+    # {{#nombre}}...{{/nombre}} que solo se incluyen si el valor no está vacío.
+    PROMPT_TEMPLATES = {}
+    PROMPT_DEFAULT_TEMPLATE = 'combined'
+    PROMPT_CACHE_SIZE = 64  # prompts armados en memoria
+    
+    # Almacenamiento: 'json' (archivos JSON, por defecto) o 'sqlite'.
+    # Para pasar a SQLite: python app.py --migrate-sqlite y luego STORAGE_BACKEND=sqlite
+    STORAGE_BACKEND = os.environ.get('STORAGE_BACKEND', 'json')
+    SQLITE_DB_FILE = os.path.join(BASE_DIR, 'generador_cv.db')
+    # Empleos en instantánea + diario de eventos (empleos_data.jsonl): cada alta
+    # agrega una línea en lugar de reescribir el archivo. Se compacta en segundo
+    # plano cuando el diario supera EMPLEOS_JOURNAL_COMPACT_BYTES.
+    EMPLEOS_JOURNAL = os.environ.get('EMPLEOS_JOURNAL', '') == '1'
+    EMPLEOS_JOURNAL_COMPACT_BYTES = 1024 * 1024
+    
+    # Caché de lectura de los archivos JSON. Con True se asume que la
+    # aplicación es la única que escribe en ellos y no se hace stat por lectura.
+    DATA_CACHE_TRUST_WRITES = False
+    # Ventana (segundos) para agrupar guardados seguidos del mismo archivo
+    # en una sola escritura a disco. Por defecto 0: cada guardado llega al
+    # disco antes de responder. Con una ventana, un corte dentro de ella
+    # pierde el último guardado ya confirmado al cliente.
+    DATA_WRITE_COALESCE_SECONDS = float(os.environ.get('DATA_WRITE_COALESCE_SECONDS', '0'))
+    # Codificador JSON: 'auto' (orjson si está instalado), 'orjson' o 'json'
+    JSON_CODEC = os.environ.get('JSON_CODEC', 'auto')
+    # Escribir los archivos JSON sin sangría (más pequeños y rápidos de guardar)
+    DATA_JSON_COMPACT = os.environ.get('DATA_JSON_COMPACT', '') == '1'
+    
+    # Modo servidor (python app.py --serve): waitress con pool de hilos
+    # y, en POSIX, varios procesos compartiendo el mismo socket
+    SERVE_HOST = os.environ.get('SERVE_HOST', '0.0.0.0')
+    SERVE_PORT = int(os.environ.get('SERVE_PORT', 5000))
+    SERVE_THREADS = int(os.environ.get('SERVE_THREADS', 8))
+    SERVE_PROCESSES = int(os.environ.get('SERVE_PROCESSES', 1))
+    SERVE_KEEPALIVE = 30  # segundos que se mantiene abierta una conexión inactiva
+    SERVE_CONNECTION_LIMIT = 200
+    
+    # Métricas de rendimiento (/metrics) y encabezado Server-Timing
+    METRICS_ENABLED = True
+    SERVER_TIMING_ENABLED = True
+    
     # Configuración de PDF
     PDF_PAGE_SIZE = 'letter'
     PDF_MARGINS = {
@@ -54,6 +111,55 @@ class Config:
         'section_title': 14,
         'skill': 11
     }
+    
+    # Caché de estilos PDF (combinaciones de fuente/tamaños/paleta retenidas)
+    PDF_STYLE_CACHE_SIZE = 32
+    
+    # Caché de secciones PDF (flowables por sección, datos y estilos)
+    PDF_SECTION_CACHE_SIZE = 128
+    
+    # Ajuste automático de tamaños de fuente (/autofit)
+    AUTOFIT_MEASURE_CACHE_SIZE = 8192
+    AUTOFIT_MAX_PAGES = 10
+    
+    # Vista previa del servidor (/preview, requiere PyMuPDF)
+    PREVIEW_CACHE_SIZE = 32
+    PREVIEW_DEFAULT_DPI = 50
+    PREVIEW_MAX_DPI = 150
+    
+    # Perfilado de renders lentos.
+    # 'cprofile' guarda .pstats; 'sampling' guarda pilas .collapsed (para flamegraphs)
+    # con menos sobrecarga, útil si se deja habilitado siempre.
+    PDF_PROFILE_ENABLED = os.environ.get('PDF_PROFILE_ENABLED', '') == '1'
+    # ?profile=1 en /generate_pdf fuerza un render sin cachés y guarda el perfil y el
+    # CV recibido en PDF_PROFILE_DIR: solo para uso local, nunca con --serve público.
+    PDF_PROFILE_ALLOW_QUERY = os.environ.get('PDF_PROFILE_ALLOW_QUERY', '') == '1'
+    PDF_PROFILE_MODE = 'cprofile'
+    PDF_PROFILE_THRESHOLD_MS = 500
+    PDF_PROFILE_SAMPLE_INTERVAL = 0.001  # segundos entre muestras (modo 'sampling')
+    PDF_PROFILE_DIR = os.path.join(BASE_DIR, '.profiles')
+    
+    # Caché de PDFs generados (por hash del contenido)
+    PDF_CACHE_ENABLED = True
+    PDF_CACHE_MAX_BYTES = 32 * 1024 * 1024
+    PDF_CACHE_MAX_AGE = 60 * 60  # segundos
+    # Volcado opcional a disco de las entradas expulsadas de memoria
+    PDF_CACHE_SPILL_ENABLED = False
+    PDF_CACHE_SPILL_DIR = os.path.join(os.path.dirname(CV_DATA_FILE), '.pdf_cache')
+    PDF_CACHE_SPILL_MAX_BYTES = 256 * 1024 * 1024
+    
+    # Generación de PDFs por lotes (pool de procesos)
+    PDF_BATCH_WORKERS = int(os.environ.get('PDF_BATCH_WORKERS', min(4, os.cpu_count() or 1)))
+    PDF_BATCH_MAX_ITEMS = 50
+    # Arrancar los procesos trabajadores al iniciar (en cada proceso del servidor)
+    # en lugar de en el primer /generate_pdf_batch
+    PDF_BATCH_WARM_UP = os.environ.get('PDF_BATCH_WARM_UP', '1') == '1'
+    
+    # Cola de trabajos PDF asíncronos (/pdf_jobs)
+    PDF_JOB_WORKERS = 2
+    PDF_JOB_MAX_QUEUE = 16
+    PDF_JOB_TTL = 5 * 60  # segundos que se conserva un PDF terminado
+    PDF_JOB_MAX_RETAINED = 64  # PDFs terminados en memoria; se descartan los más antiguos
 
 
 class DevelopmentConfig(Config):
@@ -1,4 +1,5 @@
 """Paquete de modelos de datos."""
 from .cv_data import CVData, ContactInfo, Skill
+from .decoder import ValidationError
 
-__all__ = ['CVData', 'ContactInfo', 'Skill']
+__all__ = ['CVData', 'ContactInfo', 'Skill', 'ValidationError']
@@ -1,12 +1,17 @@
 """
 Modelos de datos para el CV.
 Define las estructuras de datos utilizadas en la aplicación.
+
+Los modelos usan __slots__. from_dict usa un decodificador generado por
+models.decoder que valida y convierte los tipos, y lanza ValidationError
+con la ruta del dato inválido.
 """
 from dataclasses import dataclass, field
 from typing import List, Optional, Dict, Any
+from models.decoder import Field, ValidationError, compile_decoder
 
 
-@dataclass
+@dataclass(slots=True)
 class Skill:
     """Representa una habilidad técnica."""
     title: str
@@ -22,13 +27,10 @@ class Skill:
     @classmethod
     def from_dict(cls, data: Dict[str, str]) -> 'Skill':
         """Crea una habilidad desde un diccionario."""
-        return cls(
-            title=data.get('title', ''),
-            description=data.get('description', '')
-        )
+        return _decode_skill(data)
 
 
-@dataclass
+@dataclass(slots=True)
 class EducationItem:
     """Representa un item de educación."""
     institution: str
@@ -48,15 +50,10 @@ class EducationItem:
     @classmethod
     def from_dict(cls, data: Dict[str, str]) -> 'EducationItem':
         """Crea un item desde un diccionario."""
-        return cls(
-            institution=data.get('institution', ''),
-            degree=data.get('degree', ''),
-            date=data.get('date', ''),
-            description=data.get('description', '')
-        )
+        return _decode_education(data)
 
 
-@dataclass
+@dataclass(slots=True)
 class ContactInfo:
     """Información de contacto del CV."""
     email_user: Optional[str] = None
@@ -87,17 +84,10 @@ class ContactInfo:
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'ContactInfo':
         """Crea información de contacto desde un diccionario."""
-        return cls(
-            email_user=data.get('emailUser'),
-            email_domain=data.get('emailDomain'),
-            phone=data.get('phone'),
-            location=data.get('location'),
-            link_text=data.get('linkText'),
-            link_url=data.get('linkUrl')
-        )
+        return _decode_contact(data)
 
 
-@dataclass
+@dataclass(slots=True)
 class WorkExperience:
     """Representa una experiencia laboral."""
     company: str
@@ -117,15 +107,10 @@ class WorkExperience:
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'WorkExperience':
         """Crea una experiencia desde un diccionario."""
-        return cls(
-            company=data.get('company', ''),
-            position=data.get('position', ''),
-            duration=data.get('duration', ''),
-            responsibilities=data.get('responsibilities', [])
-        )
+        return _decode_experience(data)
 
 
-@dataclass
+@dataclass(slots=True)
 class CVData:
     """Modelo principal de datos del CV."""
     full_name: str = ""
@@ -133,7 +118,6 @@ class CVData:
     skills: List[Skill] = field(default_factory=list)
     skills_section_title: str = "TECHNICAL SKILLS"
     experience: List[WorkExperience] = field(default_factory=list)
-    experience: List[WorkExperience] = field(default_factory=list)
     experience_section_title: str = "WORK EXPERIENCE"
     education: List[EducationItem] = field(default_factory=list)
     education_section_title: str = "EDUCATION"
@@ -146,7 +130,6 @@ class CVData:
             'skillsSectionTitle': self.skills_section_title,
             'skills': [skill.to_dict() for skill in self.skills],
             'experienceSectionTitle': self.experience_section_title,
-            'experienceSectionTitle': self.experience_section_title,
             'experience': [exp.to_dict() for exp in self.experience],
             'educationSectionTitle': self.education_section_title,
             'education': [edu.to_dict() for edu in self.education],
@@ -157,31 +140,53 @@ class CVData:
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'CVData':
-        """Crea un CV desde un diccionario."""
-        skills_data = data.get('skills', [])
-        skills = []
-        
-        for skill_data in skills_data:
-            if isinstance(skill_data, dict):
-                skills.append(Skill.from_dict(skill_data))
-            elif isinstance(skill_data, str):
-                # Compatibilidad con formato antiguo
-                skills.append(Skill(title='', description=skill_data))
-        
-        experience_data = data.get('experience', [])
-        experience = [WorkExperience.from_dict(exp) for exp in experience_data]
-        
-        education_data = data.get('education', [])
-        education = [EducationItem.from_dict(edu) for edu in education_data]
-        
-        return cls(
-            full_name=data.get('fullName', ''),
-            contact_info=ContactInfo.from_dict(data),
-            skills=skills,
-            skills_section_title=data.get('skillsSectionTitle', 'TECHNICAL SKILLS'),
-            experience=experience,
-            experience_section_title=data.get('experienceSectionTitle', 'WORK EXPERIENCE'),
-            education=education,
-            education_section_title=data.get('educationSectionTitle', 'EDUCATION'),
-            font_family=data.get('fontFamily', 'Helvetica')
-        )
+        """Crea un CV desde un diccionario (lanza ValidationError si es inválido)."""
+        return _decode_cv(data)
+
+
+def _decode_skill_item(data: Any) -> Skill:
+    """Habilidad; un texto suelto es el formato antiguo (solo descripción)."""
+    if type(data) is str:
+        return Skill(title='', description=data)
+    return _decode_skill(data)
+
+
+_decode_skill = compile_decoder(Skill, (
+    Field('title', 'title', 'str'),
+    Field('description', 'description', 'str'),
+))
+
+_decode_education = compile_decoder(EducationItem, (
+    Field('institution', 'institution', 'str'),
+    Field('degree', 'degree', 'str'),
+    Field('date', 'date', 'str'),
+    Field('description', 'description', 'str'),
+))
+
+_decode_contact = compile_decoder(ContactInfo, (
+    Field('email_user', 'emailUser', 'optstr'),
+    Field('email_domain', 'emailDomain', 'optstr'),
+    Field('phone', 'phone', 'optstr'),
+    Field('location', 'location', 'optstr'),
+    Field('link_text', 'linkText', 'optstr'),
+    Field('link_url', 'linkUrl', 'optstr'),
+))
+
+_decode_experience = compile_decoder(WorkExperience, (
+    Field('company', 'company', 'str'),
+    Field('position', 'position', 'str'),
+    Field('duration', 'duration', 'str'),
+    Field('responsibilities', 'responsibilities', 'strlist'),
+))
+
+_decode_cv = compile_decoder(CVData, (
+    Field('full_name', 'fullName', 'str'),
+    Field('contact_info', None, 'inline', decoder=_decode_contact),
+    Field('skills', 'skills', 'list', decoder=_decode_skill_item),
+    Field('skills_section_title', 'skillsSectionTitle', 'str', 'TECHNICAL SKILLS'),
+    Field('experience', 'experience', 'list', decoder=_decode_experience),
+    Field('experience_section_title', 'experienceSectionTitle', 'str', 'WORK EXPERIENCE'),
+    Field('education', 'education', 'list', decoder=_decode_education),
+    Field('education_section_title', 'educationSectionTitle', 'str', 'EDUCATION'),
+    Field('font_family', 'fontFamily', 'str', 'Helvetica'),
+))
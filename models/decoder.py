@@ -0,0 +1,207 @@
+"""
+Decodificador validante de los modelos.
+
+Para cada modelo se genera (una sola vez, al importar) una función
+especializada que lee los campos del diccionario, comprueba y convierte sus
+tipos y asigna directamente los slots del objeto, sin pasar por __init__.
+Los errores indican la ruta exacta del dato inválido (ej: "experience[3].company").
+"""
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple, Union
+
+PathPart = Union[str, int]
+
+JSON_TYPE_NAMES = {
+    dict: 'un objeto', list: 'una lista', str: 'texto', bool: 'un booleano',
+    int: 'un número', float: 'un número', type(None): 'null'
+}
+
+
+class ValidationError(ValueError):
+    """Datos del CV con una estructura o tipo inválido."""
+
+    def __init__(self, message: str, *path: PathPart):
+        """
+        Inicializa el error.
+
+        Args:
+            message: Descripción del problema.
+            path: Ruta del dato (claves e índices) desde el objeto decodificado.
+        """
+        super().__init__(message)
+        self.message = message
+        self.path: List[PathPart] = list(path)
+
+    def within(self, *parts: PathPart) -> 'ValidationError':
+        """Antepone partes a la ruta (al propagar el error hacia el objeto padre)."""
+        self.path[:0] = parts
+        return self
+
+    @property
+    def location(self) -> str:
+        """Ruta legible, ej: "experience[3].responsibilities[0]"."""
+        text = ''
+        for part in self.path:
+            text += f"[{part}]" if isinstance(part, int) else (f".{part}" if text else part)
+        return text
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Representación para respuestas JSON."""
+        return {'path': self.location, 'error': self.message}
+
+    def __str__(self) -> str:
+        return f"{self.location}: {self.message}" if self.path else self.message
+
+
+def describe_type(value: Any) -> str:
+    """Nombre en términos de JSON del tipo de un valor."""
+    return JSON_TYPE_NAMES.get(type(value), type(value).__name__)
+
+
+def coerce_str(value: Any, *path: PathPart) -> str:
+    """
+    Convierte números a texto; cualquier otro tipo es un error.
+
+    Raises:
+        ValidationError: Si el valor no es texto ni número.
+    """
+    if type(value) in (int, float):
+        return str(value)
+    raise ValidationError(f"se esperaba texto, no {describe_type(value)}", *path)
+
+
+def coerce_str_list(values: list, *path: PathPart) -> List[str]:
+    """Convierte cada elemento con coerce_str, indicando el índice del que falle."""
+    return [item if type(item) is str else coerce_str(item, *path, index) for index, item in enumerate(values)]
+
+
+def locate_item_error(values: list, decode: Callable[[Any], Any], key: str) -> ValidationError:
+    """Vuelve a decodificar una lista para indicar el índice del elemento inválido."""
+    for index, item in enumerate(values):
+        try:
+            decode(item)
+        except ValidationError as e:
+            return e.within(key, index)
+    return ValidationError("elemento inválido", key)
+
+
+def require_object(data: Any) -> None:
+    """
+    Comprueba que el valor sea un objeto JSON.
+
+    Raises:
+        ValidationError: Si no es un diccionario.
+    """
+    if not isinstance(data, dict):
+        raise ValidationError(f"se esperaba un objeto, no {describe_type(data)}")
+
+
+class Field(NamedTuple):
+    """
+    Descripción de un campo para el decodificador.
+
+    kind puede ser:
+    - 'str': texto (None o ausente -> default).
+    - 'optstr': texto opcional (ausente -> None).
+    - 'strlist': lista de textos.
+    - 'list': lista de objetos; decoder decodifica cada elemento.
+    - 'inline': objeto cuyos campos están en el mismo diccionario; decoder lo decodifica.
+    """
+    attr: str
+    key: Optional[str]
+    kind: str
+    default: Any = ''
+    decoder: Optional[Callable[[Any], Any]] = None
+
+
+def compile_decoder(cls: type, fields: Tuple[Field, ...]) -> Callable[[Any], Any]:
+    """
+    Genera la función que decodifica un diccionario en una instancia de cls.
+
+    Los atributos se asignan sin llamar a __init__. En clases frozen se
+    usan los descriptores de los slots, algo más lentos que la asignación
+    normal que se usa en las demás.
+
+    Args:
+        cls: Dataclass con slots (puede ser frozen).
+        fields: Campos en cualquier orden; deben cubrir todos los de cls.
+
+    Returns:
+        Función decode(data) que retorna la instancia o lanza ValidationError.
+    """
+    namespace: Dict[str, Any] = {
+        '_cls': cls,
+        '_new': object.__new__,
+        '_require_object': require_object,
+        '_coerce_str': coerce_str,
+        '_coerce_str_list': coerce_str_list,
+        '_locate': locate_item_error,
+        'ValidationError': ValidationError,
+    }
+    lines = [
+        "def decode(data):",
+        "    if type(data) is not dict:",
+        "        _require_object(data)",
+        "    get = data.get",
+        "    obj = _new(_cls)",
+    ]
+    frozen = cls.__dataclass_params__.frozen
+    for index, spec in enumerate(fields):
+        if frozen:
+            namespace[f"_set_{index}"] = getattr(cls, spec.attr).__set__
+            assign = f"    _set_{index}(obj, {{}})"
+        else:
+            assign = f"    obj.{spec.attr} = {{}}"
+        key = repr(spec.key)
+
+        if spec.kind == 'inline':
+            namespace[f"_dec_{index}"] = spec.decoder
+            lines.append(assign.format(f"_dec_{index}(data)"))
+            continue
+
+        lines.append(f"    v = get({key})")
+        if spec.kind in ('str', 'optstr'):
+            default = repr(spec.default if spec.kind == 'str' else None)
+            lines += [
+                "    if v is None:",
+                f"        v = {default}",
+                "    elif type(v) is not str:",
+                f"        v = _coerce_str(v, {key})",
+            ]
+        elif spec.kind == 'strlist':
+            lines += [
+                "    if v is None:",
+                "        v = []",
+                "    elif type(v) is not list:",
+                f"        raise ValidationError('se esperaba una lista de textos', {key})",
+                "    else:",
+                "        for item in v:",
+                "            if type(item) is not str:",
+                f"                v = _coerce_str_list(v, {key})",
+                "                break",
+                "        else:",
+                "            v = v[:]",
+            ]
+        elif spec.kind == 'list':
+            namespace[f"_dec_{index}"] = spec.decoder
+            lines += [
+                "    if v is None:",
+                "        v = []",
+                "    elif type(v) is not list:",
+                f"        raise ValidationError('se esperaba una lista', {key})",
+                "    else:",
+                "        try:",
+                f"            v = [_dec_{index}(item) for item in v]",
+                "        except ValidationError:",
+                f"            raise _locate(v, _dec_{index}, {key}) from None",
+            ]
+        else:
+            raise ValueError(f"Tipo de campo desconocido: {spec.kind}")
+        lines.append(assign.format('v'))
+    lines.append("    return obj")
+
+    source = "\n".join(lines)
+    exec(compile(source, f"<decoder {cls.__name__}>", 'exec'), namespace)
+    decode = namespace['decode']
+    decode.__qualname__ = f"decode_{cls.__name__}"
+    decode.source = source
+    return decode
@@ -2,20 +2,86 @@
 Rutas relacionadas con el CV.
 Maneja las peticiones HTTP para el generador de CV.
 """
-from flask import Blueprint, render_template, request, jsonify, send_file
+from flask import Blueprint, Response, render_template, request, jsonify, send_file
+from dataclasses import dataclass
+from io import BytesIO
+import os
+import threading
 import traceback
 import re
-from services.data_service import DataService
-from services.pdf_service import PDFService
+from services.data_service import DataService, RevisionConflictError, content_revision
+from services.json_patch import JsonPatchError, apply_patch, changes_to_operations
+from services.profile_store import ProfileStore, VariantConflictError, VariantNotFoundError
+from services.ats_service import ATSScorer
+from services.batch_service import BatchPDFRenderer, stream_zip
+from services.pdf_jobs import PDFJobQueue, QueueFullError
+from services.preview_service import PreviewService, PreviewUnavailableError
+from services.metrics import span
+from routes.instrumentation import instrument_blueprint
 from models.cv_data import CVData
+from models.decoder import ValidationError
 from config.settings import Config
 
 # Crear blueprint
 cv_bp = Blueprint('cv', __name__)
+instrument_blueprint(cv_bp)
 
 # Inicializar servicios
-data_service = DataService(Config.CV_DATA_FILE)
-pdf_service = PDFService(Config)
+data_service = DataService.for_file(Config.CV_DATA_FILE)
+profile_store = ProfileStore(data_service, Config.PROFILES_DIR, Config.PROFILE_CACHE_SIZE,
+                             Config.PROFILE_MAX_DEPTH)
+ats_scorer = ATSScorer(Config.ATS_CACHE_SIZE, Config.ATS_MISSING_KEYWORDS)
+
+
+@dataclass
+class PDFServices:
+    """Servicios que generan PDFs (dependen de ReportLab)."""
+    pdf: object
+    batch: BatchPDFRenderer
+    jobs: PDFJobQueue
+    preview: PreviewService
+
+
+_pdf_services = None
+_pdf_services_lock = threading.Lock()
+
+
+def get_pdf_services() -> PDFServices:
+    """
+    Retorna los servicios de PDF, creándolos la primera vez.
+    
+    ReportLab se importa aquí y no al cargar el módulo, para que el
+    servidor arranque sin esperarlo (ver services.startup.warm_up_pdf).
+    
+    Returns:
+        PDFServices: Instancia única compartida por todas las peticiones.
+    """
+    global _pdf_services
+    if _pdf_services is None:
+        with _pdf_services_lock:
+            if _pdf_services is None:
+                from services.pdf_service import PDFService
+                pdf_service = PDFService(Config)
+                _pdf_services = PDFServices(
+                    pdf=pdf_service,
+                    batch=BatchPDFRenderer(pdf_service, Config.PDF_BATCH_WORKERS),
+                    jobs=PDFJobQueue(pdf_service, Config.PDF_JOB_WORKERS,
+                                     Config.PDF_JOB_MAX_QUEUE, Config.PDF_JOB_TTL,
+                                     Config.PDF_JOB_MAX_RETAINED),
+                    preview=PreviewService(pdf_service, Config.PREVIEW_CACHE_SIZE, Config.PREVIEW_MAX_DPI)
+                )
+    return _pdf_services
+
+
+def _parse_cv(data) -> CVData:
+    """Convierte el JSON recibido en CVData, midiendo el tramo 'cv.from_dict'."""
+    with span('cv.from_dict'):
+        return CVData.from_dict(data)
+
+
+def _invalid_cv(error: ValidationError, prefix: str = ''):
+    """Respuesta 400 para un CV inválido, con la ruta del dato que falló."""
+    return jsonify({"success": False, "error": f"{prefix}{error}", "path": error.location}), 400
 
 
 @cv_bp.route('/')
@@ -32,8 +98,14 @@ def get_cv_data():
     Returns:
         JSON con los datos del CV.
     """
-    data = data_service.load_raw()
-    return jsonify(data)
+    encoded, revision = data_service.load_encoded()
+    etag = str(revision)
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        response = Response(encoded, mimetype='application/json')
+    response.set_etag(etag)
+    return response
 
 
 @cv_bp.route('/save_cv_data', methods=['POST'])
@@ -46,48 +118,521 @@ def save_cv_data():
     """
     data = request.json
     if data_service.save_raw(data):
-        return jsonify({"success": True})
+        return jsonify({"success": True, "revision": content_revision(data)})
     return jsonify({"success": False}), 500
 
 
+def _expected_revision(body):
+    """
+    Obtiene la revisión sobre la que el cliente calculó el patch.
+    
+    Se toma del encabezado If-Match o del campo "revision" del cuerpo.
+    
+    Returns:
+        Número de revisión, o None si el cliente no la indicó.
+
+    Raises:
+        ValueError: Si la revisión indicada no es un número entero.
+    """
+    if request.if_match and not request.if_match.star_tag:
+        tags = request.if_match.as_set()
+        if len(tags) != 1:
+            raise ValueError("If-Match debe contener una sola revisión")
+        value, source = tags.pop(), 'If-Match'
+    elif isinstance(body, dict) and body.get('revision') is not None:
+        value, source = body['revision'], "El campo 'revision'"
+    else:
+        return None
+    try:
+        if isinstance(value, (bool, float)):  # int() aceptaría True o 3.7 en silencio
+            raise TypeError
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{source} debe ser un número de revisión, se recibió {value!r}") from None
+
+
+@cv_bp.route('/cv_data', methods=['PATCH'])
+def patch_cv_data():
+    """
+    Actualiza parcialmente los datos del CV.
+    
+    Acepta una lista de operaciones JSON Patch (RFC 6902), o un objeto
+    {"ops": [...]} / {"changes": {campo: valor}} con "revision" opcional.
+    Si la revisión (o If-Match) no es la vigente responde 409 y el
+    cliente debe recargar o enviar los datos completos.
+    
+    Returns:
+        JSON con la nueva revisión.
+    """
+    body = request.get_json(silent=True)
+    try:
+        expected = _expected_revision(body)
+        if isinstance(body, list):
+            operations = body
+        elif isinstance(body, dict) and 'ops' in body:
+            operations = body['ops']
+        elif isinstance(body, dict) and 'changes' in body:
+            operations = changes_to_operations(body['changes'])
+        else:
+            return jsonify({"success": False, "error": "Se esperaba un JSON Patch"}), 400
+        _, revision = data_service.patch(operations, expected, validate=_parse_cv)
+    except ValidationError as e:
+        return _invalid_cv(e)
+    except RevisionConflictError as e:
+        response = jsonify({"success": False, "error": str(e), "revision": e.current})
+        response.status_code = 409
+        response.set_etag(str(e.current))
+        return response
+    except (JsonPatchError, ValueError, TypeError, AttributeError) as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+    except OSError as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+    
+    response = jsonify({"success": True, "revision": revision})
+    response.set_etag(str(revision))
+    return response
+
+
+@cv_bp.route('/profiles', methods=['GET'])
+def list_profiles():
+    """
+    Lista las variantes del CV (solo lee el índice).
+    
+    Returns:
+        JSON con la revisión del CV base y las variantes.
+    """
+    return jsonify({"base": {"revision": data_service.revision}, "variants": profile_store.list_variants()})
+
+
+@cv_bp.route('/profiles/<name>', methods=['GET'])
+def get_profile(name):
+    """
+    Obtiene el CV de una variante, resuelto sobre el CV base.
+    
+    Con ?ops=1 retorna solo sus diferencias respecto de su padre.
+    
+    Returns:
+        JSON con los datos del CV de la variante.
+    """
+    try:
+        if request.args.get('ops') == '1':
+            return jsonify({"variant": profile_store.entry(name), "ops": profile_store.operations(name)})
+        data, revision = profile_store.resolve(name)
+    except VariantNotFoundError:
+        return jsonify({"success": False, "error": f"No existe la variante {name!r}"}), 404
+    except VariantConflictError as e:
+        return jsonify({"success": False, "error": str(e)}), 409
+    
+    etag = str(revision)
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        response = jsonify(data)
+    response.set_etag(etag)
+    return response
+
+
+@cv_bp.route('/profiles/<name>', methods=['PUT'])
+def save_profile(name):
+    """
+    Crea o reemplaza una variante del CV.
+    
+    El cuerpo indica el CV completo de la variante ({"data": {...}}) o los
+    cambios sobre su padre ({"ops": [...]} o {"changes": {...}}), además de
+    "parent" (otra variante, opcional), "empleoId" y "title". Solo se guardan
+    las diferencias respecto del padre.
+    
+    Returns:
+        JSON con la entrada de la variante.
+    """
+    body = request.get_json(silent=True)
+    if not isinstance(body, dict):
+        return jsonify({"success": False, "error": "Se esperaba un objeto JSON"}), 400
+    parent = body.get('parent')
+    metadata = {key: body[key] for key in ('empleoId', 'title') if body.get(key) is not None}
+    try:
+        if 'data' in body:
+            data = body['data']
+        else:
+            if 'ops' in body:
+                operations = body['ops']
+            elif 'changes' in body:
+                operations = changes_to_operations(body['changes'])
+            else:
+                return jsonify({"success": False, "error": "Se esperaba 'data', 'ops' o 'changes'"}), 400
+            origin = profile_store.resolve(parent)[0] if parent is not None else data_service.load_raw()
+            data = apply_patch(origin, operations)
+        entry = profile_store.save(name, data, parent, metadata, validate=_parse_cv)
+    except ValidationError as e:
+        return _invalid_cv(e)
+    except VariantNotFoundError as e:
+        return jsonify({"success": False, "error": f"No existe la variante {e.args[0]!r}"}), 404
+    except VariantConflictError as e:
+        return jsonify({"success": False, "error": str(e)}), 409
+    except (JsonPatchError, ValueError, TypeError) as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+    except OSError as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+    return jsonify({"success": True, "variant": entry})
+
+
+@cv_bp.route('/profiles/<name>', methods=['DELETE'])
+def delete_profile(name):
+    """
+    Elimina una variante del CV.
+    
+    Returns:
+        JSON con el resultado de la operación.
+    """
+    try:
+        profile_store.delete(name)
+    except VariantNotFoundError:
+        return jsonify({"success": False, "error": f"No existe la variante {name!r}"}), 404
+    except VariantConflictError as e:
+        return jsonify({"success": False, "error": str(e)}), 409
+    return jsonify({"success": True})
+
+
+@cv_bp.route('/ats_score', methods=['POST'])
+def ats_score():
+    """
+    Calcula la compatibilidad del CV con uno o varios puestos.
+    
+    El cuerpo trae "job" (texto de un puesto) o "jobs" (lista de textos) y
+    opcionalmente el CV a evaluar: "cv" (datos del CV) o "profile" (nombre
+    de una variante). Sin ellos se usa el CV guardado.
+    
+    Returns:
+        JSON con el resultado ("result") o los resultados ("results") por puesto.
+    """
+    body = request.get_json(silent=True)
+    if not isinstance(body, dict):
+        return jsonify({"success": False, "error": "Se esperaba un objeto JSON"}), 400
+    jobs = body.get('jobs', [body.get('job')] if 'job' in body else None)
+    if not isinstance(jobs, list) or not all(isinstance(job, str) for job in jobs):
+        return jsonify({"success": False, "error": "Se esperaba 'job' (texto) o 'jobs' (lista de textos)"}), 400
+    if len(jobs) > Config.ATS_MAX_JOBS:
+        return jsonify({"success": False, "error": f"Máximo {Config.ATS_MAX_JOBS} puestos por petición"}), 400
+    try:
+        if body.get('cv') is not None:
+            data = body['cv']
+        elif body.get('profile') is not None:
+            data = profile_store.resolve(body['profile'])[0]
+        else:
+            data = data_service.load_raw()
+        cv_data = _parse_cv(data)
+    except ValidationError as e:
+        return _invalid_cv(e)
+    except VariantNotFoundError:
+        return jsonify({"success": False, "error": f"No existe la variante {body['profile']!r}"}), 404
+    except VariantConflictError as e:
+        return jsonify({"success": False, "error": str(e)}), 409
+    
+    with span('ats.score'):
+        results = ats_scorer.score_many(cv_data, jobs)
+    if 'jobs' in body:
+        return jsonify({"success": True, "results": results})
+    return jsonify({"success": True, "result": results[0]})
+
+
+def _pdf_filename(cv_data: CVData) -> str:
+    """
+    Genera el nombre del archivo PDF a partir del nombre del CV.
+    
+    Args:
+        cv_data: Datos del CV.
+        
+    Returns:
+        Nombre de archivo (ej: "ViberthEduardoCV.pdf").
+    """
+    full_name = cv_data.full_name.strip()
+    if full_name:
+        # Eliminar espacios y caracteres no alfanuméricos simples si se desea "todo junto"
+        # El usuario pidió "ViberthEduardoCV.pdf", así que quitamos espacios.
+        # También es buena práctica sanitizar un poco para evitar caracteres inválidos en nombres de archivo.
+        cleaned_name = re.sub(r'[^a-zA-Z0-9]', '', full_name)
+        return f"{cleaned_name}CV.pdf"
+    return 'mi_cv.pdf'
+
+
 @cv_bp.route('/generate_pdf', methods=['POST'])
 def generate_pdf():
     """
     Genera un PDF del CV.
     
+    Si el cliente envía If-None-Match con el ETag de un PDF idéntico,
+    responde 304 sin volver a generarlo. Con ?profile=1 (si
+    Config.PDF_PROFILE_ALLOW_QUERY) el PDF se genera sin cachés y se
+    guarda su perfil (ver services.profiling).
+    
     Returns:
         Archivo PDF para descargar.
     """
     try:
         data = request.json
-        cv_data = CVData.from_dict(data)
+        cv_data = _parse_cv(data)
         
         # Extraer font sizes si existen
         font_sizes = data.get('fontSizes', None)
+        profile = Config.PDF_PROFILE_ALLOW_QUERY and request.args.get('profile') == '1'
         
-        # Generar PDF con font sizes personalizados
-        buffer = pdf_service.generate(cv_data, font_sizes)
+        # El hash del contenido sirve como ETag
+        pdf_service = get_pdf_services().pdf
+        etag = pdf_service.cache_key(cv_data, font_sizes)
+        if not profile and request.if_none_match.contains(etag):
+            response = Response(status=304)
+            response.set_etag(etag)
+            return response
         
-        # Generar nombre del archivo
-        full_name = cv_data.full_name.strip()
-        if full_name:
-            # Eliminar espacios y caracteres no alfanuméricos simples si se desea "todo junto"
-            # El usuario pidió "ViberthEduardoCV.pdf", así que quitamos espacios.
-            # También es buena práctica sanitizar un poco para evitar caracteres inválidos en nombres de archivo.
-            cleaned_name = re.sub(r'[^a-zA-Z0-9]', '', full_name)
-            filename = f"{cleaned_name}CV.pdf"
-        else:
-            filename = 'mi_cv.pdf'
-
-        # Enviar archivo
-        return send_file(
-            buffer,
+        # Generar PDF con font sizes personalizados (o recuperarlo de la caché)
+        result = pdf_service.render(cv_data, font_sizes, profile=profile)
+        response = send_file(
+            BytesIO(result.data),
             as_attachment=True,
-            download_name=filename,
-            mimetype='application/pdf'
+            download_name=_pdf_filename(cv_data),
+            mimetype='application/pdf',
+            etag=result.key
         )
+        
+        response.headers['X-PDF-Cache'] = 'HIT' if result.cached else 'MISS'
+        if result.sections_rebuilt is not None:
+            response.headers['X-PDF-Sections-Rebuilt'] = ','.join(result.sections_rebuilt) or 'none'
+        if result.profile_path:
+            response.headers['X-PDF-Profile'] = os.path.basename(result.profile_path)
+        return response
     
+    except ValidationError as e:
+        return _invalid_cv(e)
     except Exception as e:
         print(f"Error generating PDF: {e}")
         traceback.print_exc()
         return jsonify({"success": False, "error": str(e)}), 500
+
+
+@cv_bp.route('/preview', methods=['POST'])
+def preview():
+    """
+    Genera la vista previa exacta del PDF (una imagen por página).
+    
+    Parámetros de consulta: format (png o svg) y dpi (solo PNG). Si el
+    cliente envía If-None-Match con el ETag de la misma vista previa,
+    responde 304.
+    
+    Returns:
+        JSON con las páginas como data URIs, o 501 si no hay PyMuPDF.
+    """
+    data = request.json
+    try:
+        cv_data = _parse_cv(data)
+        fmt = request.args.get('format', 'png')
+        dpi = request.args.get('dpi', Config.PREVIEW_DEFAULT_DPI, type=int)
+        font_sizes = data.get('fontSizes', None)
+    except ValidationError as e:
+        return _invalid_cv(e)
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+    
+    services = get_pdf_services()
+    preview_service = services.preview
+    if not preview_service.available:
+        return jsonify({"success": False, "error": "Vista previa no disponible: instala PyMuPDF"}), 501
+    
+    etag = f"{services.pdf.cache_key(cv_data, font_sizes)}-{fmt}-{dpi}"
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+        response.set_etag(etag)
+        return response
+    
+    try:
+        result = preview_service.render(cv_data, font_sizes, fmt, dpi)
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+    except PreviewUnavailableError as e:
+        return jsonify({"success": False, "error": str(e)}), 501
+    except Exception as e:
+        print(f"Error generating preview: {e}")
+        traceback.print_exc()
+        return jsonify({"success": False, "error": str(e)}), 500
+    
+    response = jsonify(result.to_dict())
+    response.set_etag(etag)
+    return response
+
+
+@cv_bp.route('/autofit', methods=['POST'])
+def autofit():
+    """
+    Calcula los tamaños de fuente más grandes con los que el CV cabe en N páginas.
+    
+    Acepta los datos del CV (con sus fontSizes actuales) más "maxPages"
+    (por defecto 1) y "mode" ("uniform" o "sections").
+    
+    Returns:
+        JSON con los fontSizes elegidos, las páginas y si cabe.
+    """
+    from services.autofit_service import LayoutTooLargeError
+    
+    data = request.json
+    try:
+        cv_data = _parse_cv(data)
+        max_pages = int(data.get('maxPages', 1))
+        if max_pages > Config.AUTOFIT_MAX_PAGES:
+            raise ValueError(f"maxPages no puede ser mayor que {Config.AUTOFIT_MAX_PAGES}")
+        result = get_pdf_services().pdf.autofit(
+            cv_data, data.get('fontSizes', None), max_pages, data.get('mode', 'uniform')
+        )
+    except LayoutTooLargeError as e:
+        return jsonify({"success": False, "error": str(e)}), 422
+    except ValidationError as e:
+        return _invalid_cv(e)
+    except (ValueError, TypeError, AttributeError) as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+    
+    return jsonify(result.to_dict())
+
+
+@cv_bp.route('/generate_pdf_batch', methods=['POST'])
+def generate_pdf_batch():
+    """
+    Genera varios PDFs en paralelo y los devuelve en un ZIP.
+    
+    Acepta una lista de CVs o un objeto {"items": [...]}; cada CV puede
+    incluir sus propios fontSizes. El ZIP se envía por partes a medida que
+    los PDFs terminan de generarse.
+    
+    Returns:
+        Archivo ZIP con un PDF por CV.
+    """
+    data = request.json
+    items = data.get('items') if isinstance(data, dict) else data
+    if not isinstance(items, list) or not items or not all(isinstance(item, dict) for item in items):
+        return jsonify({"success": False, "error": "Se esperaba una lista de CVs"}), 400
+    if len(items) > Config.PDF_BATCH_MAX_ITEMS:
+        return jsonify({
+            "success": False,
+            "error": f"Máximo {Config.PDF_BATCH_MAX_ITEMS} CVs por lote"
+        }), 400
+    
+    jobs = []
+    for index, item in enumerate(items):
+        try:
+            jobs.append((_parse_cv(item), item.get('fontSizes')))
+        except ValidationError as e:
+            return _invalid_cv(e, f"CV #{index + 1} inválido: ")
+        except Exception as e:
+            return jsonify({"success": False, "error": f"CV #{index + 1} inválido: {e}"}), 400
+    
+    # Nombres únicos dentro del ZIP
+    filenames = []
+    seen = {}
+    for cv_data, _ in jobs:
+        base_name = _pdf_filename(cv_data)
+        count = seen.get(base_name, 0) + 1
+        seen[base_name] = count
+        filenames.append(base_name if count == 1 else base_name.replace('.pdf', f'_{count}.pdf'))
+    
+    def entries():
+        errors = []
+        for index, pdf_bytes, error in get_pdf_services().batch.render_many(jobs):
+            if error is not None:
+                errors.append(f"{filenames[index]}: {error}")
+                continue
+            yield filenames[index], pdf_bytes
+        if errors:
+            yield 'errores.txt', "\n".join(errors).encode('utf-8')
+    
+    return Response(
+        stream_zip(entries()),
+        mimetype='application/zip',
+        headers={'Content-Disposition': 'attachment; filename=cvs.zip'}
+    )
+
+
+@cv_bp.route('/pdf_jobs', methods=['POST'])
+def create_pdf_job():
+    """
+    Encola la generación de un PDF en segundo plano.
+    
+    Returns:
+        JSON con el id y el estado del trabajo (202), o 429 si la cola está llena.
+    """
+    data = request.json
+    try:
+        cv_data = _parse_cv(data)
+    except ValidationError as e:
+        return _invalid_cv(e)
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+    
+    try:
+        job = get_pdf_services().jobs.submit(cv_data, data.get('fontSizes', None), _pdf_filename(cv_data))
+    except QueueFullError as e:
+        response = jsonify({"success": False, "error": str(e)})
+        response.status_code = 429
+        response.headers['Retry-After'] = '2'
+        return response
+    
+    return jsonify(job.to_dict()), 202
+
+
+@cv_bp.route('/pdf_jobs/<job_id>', methods=['GET'])
+def get_pdf_job(job_id):
+    """
+    Consulta el estado de un trabajo PDF.
+    
+    Returns:
+        JSON con el estado (queued/running/done/failed) y tiempos.
+    """
+    job = get_pdf_services().jobs.get(job_id)
+    if job is None:
+        return jsonify({"success": False, "error": "Trabajo no encontrado"}), 404
+    return jsonify(job.to_dict())
+
+
+@cv_bp.route('/pdf_jobs/<job_id>/file', methods=['GET'])
+def get_pdf_job_file(job_id):
+    """
+    Descarga el PDF de un trabajo terminado.
+    
+    Returns:
+        Archivo PDF, o un error si el trabajo no existe o no ha terminado.
+    """
+    job = get_pdf_services().jobs.get(job_id)
+    if job is None:
+        return jsonify({"success": False, "error": "Trabajo no encontrado"}), 404
+    if job.status == 'failed':
+        return jsonify({"success": False, "error": job.error}), 500
+    if job.status != 'done':
+        return jsonify({"success": False, "error": "El PDF aún no está listo"}), 409
+    
+    return send_file(
+        BytesIO(job.result.data),
+        as_attachment=True,
+        download_name=job.filename,
+        mimetype='application/pdf',
+        etag=job.result.key
+    )
+
+
+@cv_bp.route('/cache_stats', methods=['GET'])
+def cache_stats():
+    """
+    Obtiene las estadísticas de las cachés del servidor.
+    
+    Returns:
+        JSON con aciertos/fallos de cada caché.
+    """
+    stats = {}
+    # Sin forzar la carga de ReportLab si todavía no se generó ningún PDF
+    if _pdf_services is not None:
+        from services.autofit_service import measure_cache
+        stats = _pdf_services.pdf.cache_stats()
+        stats['pdfJobs'] = _pdf_services.jobs.stats()
+        stats['preview'] = _pdf_services.preview.stats()
+        stats['autofitMeasures'] = measure_cache.stats()
+    stats['data'] = DataService.all_stats()
+    stats['profiles'] = profile_store.stats()
+    stats['ats'] = ats_scorer.stats()
+    from routes.general_routes import prompt_builder
+    stats['prompts'] = prompt_builder.stats()
+    return jsonify(stats)
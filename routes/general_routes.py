@@ -2,12 +2,58 @@
 Rutas generales de la aplicación.
 Maneja las páginas generales como perfil y configuración.
 """
-from flask import Blueprint, render_template, request, jsonify
-from services.data_service import DataService
+from flask import Blueprint, Response, render_template, request, jsonify
+from services.data_service import DataService, content_revision
+from services.empleos_service import EmpleoNotFoundError, EmpleosService
+from services.json_patch import JsonPatchError
+from services.metrics import registry
+from services.startup import startup_timer
+from services.profile_store import VariantConflictError, VariantNotFoundError
+from services.prompt_builder import PromptBuilder, TemplateNotFoundError
+from routes.instrumentation import instrument_blueprint
+from routes.cv_routes import ats_scorer, data_service as cv_service, profile_store
+from models.cv_data import CVData
+from models.decoder import ValidationError
 from config.settings import Config
 
 # Crear blueprint
 general_bp = Blueprint('general', __name__)
+instrument_blueprint(general_bp)
+
+# Servicios compartidos (uno por archivo)
+prompts_service = DataService.for_file(Config.PROMPTS_DATA_FILE)
+empleos_service = DataService.for_file(Config.EMPLEOS_DATA_FILE)
+empleos_index = EmpleosService(empleos_service, ats_scorer)
+prompt_builder = PromptBuilder(Config.PROMPT_CACHE_SIZE, Config.PROMPT_TEMPLATES)
+
+
+@general_bp.route('/healthz', methods=['GET'])
+def healthz():
+    """
+    Sonda de disponibilidad del servidor.
+    
+    Responde en cuanto el servidor acepta conexiones; "pdfReady" indica
+    si ReportLab ya terminó de cargarse en segundo plano.
+    
+    Returns:
+        JSON con el estado y el desglose del arranque.
+    """
+    report = startup_timer.report()
+    report['status'] = 'ok'
+    return jsonify(report)
+
+
+@general_bp.route('/metrics', methods=['GET'])
+def metrics():
+    """
+    Métricas de latencia en formato de texto de Prometheus.
+    
+    Returns:
+        Histogramas de peticiones y de tramos internos, o 404 si están deshabilitadas.
+    """
+    if not Config.METRICS_ENABLED:
+        return jsonify({"success": False, "error": "Métricas deshabilitadas"}), 404
+    return Response(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
 
 
 @general_bp.route('/perfil')
@@ -30,22 +76,81 @@ def prompt_ia():
 
 @general_bp.route('/get_prompt', methods=['GET'])
 def get_prompt():
-    """Recupera el prompt guardado."""
-    service = DataService(Config.PROMPTS_DATA_FILE)
-    data = service.load_raw()
-    return jsonify(data)
+    """Recupera el prompt guardado (304 si el cliente ya tiene esta revisión)."""
+    encoded, revision = prompts_service.load_encoded()
+    etag = str(revision)
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        response = Response(encoded, mimetype='application/json')
+    response.set_etag(etag)
+    return response
 
 
 @general_bp.route('/save_prompt', methods=['POST'])
 def save_prompt():
     """Guarda el prompt del usuario."""
     data = request.json
-    service = DataService(Config.PROMPTS_DATA_FILE)
-    if service.save_raw(data):
+    if prompts_service.save_raw(data):
         return jsonify({"success": True})
     return jsonify({"success": False}), 500
 
 
+@general_bp.route('/prompt/render', methods=['GET', 'POST'])
+def render_prompt():
+    """
+    Arma en el servidor el texto para la IA: prompt, información del puesto y CV.
+    
+    Con GET usa el prompt, el puesto y el CV guardados; con POST el cuerpo
+    puede reemplazar "prompt", "job_info" y "cv" (lo que no venga se toma
+    de lo guardado). Parámetros (o campos del cuerpo): template y profile
+    (variante del CV). El ETag identifica el texto armado: con If-None-Match
+    responde 304.
+    
+    Returns:
+        JSON con "text", "chars", "template" y "tokens" (estimados por parte y total).
+    """
+    body = request.get_json(silent=True) if request.method == 'POST' else None
+    if body is None:
+        body = {}
+    elif not isinstance(body, dict):
+        return jsonify({"success": False, "error": "Se esperaba un objeto JSON"}), 400
+    template = body.get('template') or request.args.get('template') or Config.PROMPT_DEFAULT_TEMPLATE
+    profile = body.get('profile') or request.args.get('profile') or None
+    
+    saved = prompts_service.load_raw()
+    prompt = body.get('prompt', saved.get('prompt') or '')
+    job_info = body.get('job_info', saved.get('job_info') or '')
+    if not isinstance(prompt, str) or not isinstance(job_info, str):
+        return jsonify({"success": False, "error": "'prompt' y 'job_info' deben ser texto"}), 400
+    try:
+        if body.get('cv') is not None:
+            cv = body['cv']
+            if not isinstance(cv, dict):
+                return jsonify({"success": False, "error": "'cv' debe ser un objeto"}), 400
+            cv_revision = content_revision(cv)
+        elif profile:
+            cv, cv_revision = profile_store.resolve(profile)
+        else:
+            cv, cv_revision = cv_service.load_with_revision()
+        rendered = prompt_builder.render(template, prompt, job_info, cv, cv_revision)
+    except TemplateNotFoundError:
+        return jsonify({"success": False, "error": f"No existe la plantilla {template!r}",
+                        "templates": prompt_builder.template_names()}), 404
+    except VariantNotFoundError:
+        return jsonify({"success": False, "error": f"No existe la variante {profile!r}"}), 404
+    except VariantConflictError as e:
+        return jsonify({"success": False, "error": str(e)}), 409
+    
+    if request.if_none_match.contains(rendered.etag):
+        response = Response(status=304)
+    else:
+        response = Response(rendered.encoded(), mimetype='application/json')
+    response.set_etag(rendered.etag)
+    response.cache_control.no_cache = True
+    return response
+
+
 @general_bp.route('/registro-empleo')
 def registro_empleo():
     """Página de Registro de Empleos."""
@@ -55,16 +160,114 @@ def registro_empleo():
 @general_bp.route('/get_empleos', methods=['GET'])
 def get_empleos():
     """Recupera los empleos guardados."""
-    service = DataService(Config.EMPLEOS_DATA_FILE)
-    data = service.load_raw()
-    return jsonify(data)
+    encoded, _ = empleos_service.load_encoded()
+    return Response(encoded, mimetype='application/json')
 
 
 @general_bp.route('/save_empleos', methods=['POST'])
 def save_empleos():
     """Guarda los empleos del usuario."""
     data = request.json
-    service = DataService(Config.EMPLEOS_DATA_FILE)
-    if service.save_raw(data):
+    if empleos_service.save_raw(data):
         return jsonify({"success": True})
     return jsonify({"success": False}), 500
+
+
+@general_bp.route('/empleos', methods=['GET'])
+def search_empleos():
+    """
+    Busca empleos por páginas, del más reciente al más antiguo.
+    
+    Parámetros: q (palabras del nombre de la empresa o del host del link),
+    cursor (retornado por la página anterior) y limit.
+    
+    Returns:
+        JSON con "empleos", "total" y "nextCursor".
+    """
+    try:
+        limit = min(max(int(request.args.get('limit', Config.EMPLEOS_PAGE_SIZE)), 1), Config.EMPLEOS_MAX_PAGE_SIZE)
+        result = empleos_index.search(request.args.get('q', ''), request.args.get('cursor') or None, limit)
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+    return jsonify(result)
+
+
+@general_bp.route('/empleos/rank', methods=['GET'])
+def rank_empleos():
+    """
+    Ordena los empleos guardados por compatibilidad con el CV.
+    
+    Parámetros: profile (variante del CV; sin él se usa el CV guardado) y
+    limit. Se comparan las habilidades y la experiencia del CV con la
+    descripción de cada empleo; los empleos sin descripción no se puntúan.
+    
+    Returns:
+        JSON con "empleos" ({"empleo", "score", "similarity"}), "total" y "sinDescripcion".
+    """
+    profile = request.args.get('profile') or None
+    try:
+        limit = min(max(int(request.args.get('limit', Config.EMPLEOS_PAGE_SIZE)), 1), Config.EMPLEOS_MAX_PAGE_SIZE)
+        data = profile_store.resolve(profile)[0] if profile else cv_service.load_raw()
+        query = ats_scorer.cv_vectors(CVData.from_dict(data)).query
+    except VariantNotFoundError:
+        return jsonify({"success": False, "error": f"No existe la variante {profile!r}"}), 404
+    except VariantConflictError as e:
+        return jsonify({"success": False, "error": str(e)}), 409
+    except ValidationError as e:
+        return jsonify({"success": False, "error": f"CV inválido: {e}", "path": e.location}), 400
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+    return jsonify(empleos_index.rank(query, limit))
+
+
+@general_bp.route('/empleos', methods=['POST'])
+def add_empleo():
+    """Agrega un empleo sin reescribir la lista desde el cliente."""
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({"success": False, "error": "Se esperaba un objeto JSON"}), 400
+    try:
+        empleo = empleos_index.add(data)
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+    except OSError as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+    return jsonify({"success": True, "empleo": empleo}), 201
+
+
+@general_bp.route('/empleos/<empleo_id>', methods=['GET'])
+def get_empleo(empleo_id):
+    """Obtiene un empleo por su id."""
+    try:
+        return jsonify(empleos_index.get(empleo_id))
+    except EmpleoNotFoundError:
+        return jsonify({"success": False, "error": "No existe el empleo"}), 404
+
+
+@general_bp.route('/empleos/<empleo_id>', methods=['PATCH'])
+def update_empleo(empleo_id):
+    """Modifica los campos enviados de un empleo."""
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({"success": False, "error": "Se esperaba un objeto JSON"}), 400
+    try:
+        empleo = empleos_index.update(empleo_id, data)
+    except EmpleoNotFoundError:
+        return jsonify({"success": False, "error": "No existe el empleo"}), 404
+    except (JsonPatchError, ValueError) as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+    except OSError as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+    return jsonify({"success": True, "empleo": empleo})
+
+
+@general_bp.route('/empleos/<empleo_id>', methods=['DELETE'])
+def delete_empleo(empleo_id):
+    """Elimina un empleo."""
+    try:
+        empleos_index.delete(empleo_id)
+    except EmpleoNotFoundError:
+        return jsonify({"success": False, "error": "No existe el empleo"}), 404
+    except OSError as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+    return jsonify({"success": True})
@@ -0,0 +1,51 @@
+"""
+Medición de las peticiones de cada blueprint.
+Registra la latencia en services.metrics (incluidas las peticiones que fallan
+con una excepción) y añade el encabezado Server-Timing.
+"""
+import time
+from flask import Blueprint, Response, g, request
+from services.metrics import end_request, request_latency, server_timing_header, start_request
+from config.settings import Config
+
+
+def instrument_blueprint(blueprint: Blueprint) -> None:
+    """
+    Mide todas las peticiones atendidas por un blueprint.
+
+    Args:
+        blueprint: Blueprint a instrumentar.
+    """
+    @blueprint.before_request
+    def _start_timing():
+        if not Config.METRICS_ENABLED:
+            return
+        g.metrics_start = time.perf_counter()
+        g.metrics_token = start_request()
+
+    # after_request no se ejecuta si la vista lanza una excepción no
+    # controlada (con PROPAGATE_EXCEPTIONS); la petición se cuenta aquí como 500
+    @blueprint.teardown_request
+    def _finish_failed_timing(exc) -> None:
+        start = g.pop('metrics_start', None)
+        token = g.pop('metrics_token', None)
+        if start is None:
+            return
+        duration = time.perf_counter() - start
+        end_request(token)
+        endpoint = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+        request_latency.observe(duration, request.method, endpoint, '500')
+
+    @blueprint.after_request
+    def _finish_timing(response: Response) -> Response:
+        start = g.pop('metrics_start', None)
+        token = g.pop('metrics_token', None)
+        if start is None:
+            return response
+        duration = time.perf_counter() - start
+        spans = end_request(token)
+        endpoint = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+        request_latency.observe(duration, request.method, endpoint, str(response.status_code))
+        if Config.SERVER_TIMING_ENABLED:
+            response.headers['Server-Timing'] = server_timing_header(spans, duration)
+        return response
@@ -1,5 +1,12 @@
 """Paquete de servicios."""
 from .data_service import DataService
-from .pdf_service import PDFService
 
 __all__ = ['DataService', 'PDFService']
+
+
+def __getattr__(name):
+    # PDFService importa ReportLab: se carga solo cuando se usa
+    if name == 'PDFService':
+        from .pdf_service import PDFService
+        return PDFService
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
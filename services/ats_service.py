@@ -0,0 +1,494 @@
+"""
+Puntaje de compatibilidad (estilo ATS) entre un CV y descripciones de puestos.
+
+El texto se normaliza (minúsculas, sin acentos), se eliminan las palabras
+vacías en español e inglés y se reducen las palabras a su raíz con un
+stemmer liviano común a ambos idiomas. Cada texto se representa como un
+vector de frecuencias (unigramas y bigramas, con peso 1 + log(tf)) y se
+compara con las secciones del CV por similitud coseno.
+
+Los vectores se indexan por el término mismo, sin un vocabulario global
+que crezca con cada puesto visto: la memoria queda acotada por las cachés
+LRU de vectores. Comparar un puesto con el CV solo recorre los términos en
+común (intersecciones de claves hechas en C). Con NumPy instalado
+(opcional), PostingMatrix ordena muchos documentos con un producto
+matriz-vector disperso.
+"""
+import hashlib
+import math
+import operator
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+from functools import lru_cache
+from itertools import islice
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # opcional
+    np = None
+
+from models.cv_data import CVData
+
+SECTIONS = ('skills', 'experience', 'education')
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9]+)*')
+# Los bigramas no cruzan signos de puntuación ni saltos de línea
+PHRASE_PATTERN = re.compile(r'[,;:()\[\]|•\n]|\.(?:\s|$)')
+
+STOPWORDS = frozenset("""
+a al algo algunas algunos ante antes como con contra cual cuales cuando de del desde donde durante e el
+ella ellas ellos en entre era es esa esas ese eso esos esta estas este esto estos fue ha hace hacer hasta
+hay la las le les lo los mas me mi mis mucho muy nada ni no nos nosotros o otra otras otro otros para pero
+poco por porque que quien se sea ser si sin sobre somos son su sus tambien tan tanto te tener tiene tienen
+todo todos tu tus u un una unas uno unos usted vez y ya buscamos ofrecemos requisitos experiencia deseable
+conocimiento conocimientos manejo nivel puesto perfil funciones responsabilidades empresa
+a about above after all also an and any are as at be been being both but by can could did do does doing
+for from had has have having he her here his how i if in into is it its just may more most must no nor
+not of off on once only or other our out over own same she should so some such than that the their them
+then there these they this those through to too under until up very was we were what when where which
+while who whom why will with would you your yours years year work working team looking plus strong
+experience knowledge skills requirements responsibilities role
+""".split())
+
+# Sufijos del español y del inglés, del más largo al más corto
+SUFFIXES = tuple(sorted(set("""
+amientos imientos aciones iciones amiento imiento idades ational ization iveness fulness ousness
+adores adoras mente ments ation acion icion idad ismos istas ables ibles ador adora ismo ista able
+ible ment ings ivos ivas edly ing ies ers ivo iva ed es er ly os as s
+""".split()), key=len, reverse=True))
+
+
+@lru_cache(maxsize=65536)
+def stem(token: str) -> str:
+    """
+    Raíz aproximada de una palabra normalizada.
+
+    Las palabras con números o símbolos (python3, c++, node.js) se conservan.
+    """
+    if not token.isalpha() or len(token) <= 4:
+        return token
+    for suffix in SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= 4:
+            token = token[:-len(suffix)]
+            break
+    if len(token) > 4 and token[-1] in 'aeo':
+        token = token[:-1]
+    return token
+
+
+def normalize(text: str) -> str:
+    """Texto en minúsculas y sin acentos (los demás caracteres no ASCII se descartan)."""
+    text = text.lower()
+    if text.isascii():
+        return text
+    return unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode('ascii')
+
+
+def tokenize(text: str) -> List[Optional[Tuple[str, str]]]:
+    """
+    Palabras significativas de un texto.
+
+    Returns:
+        Lista de (raíz, palabra original normalizada). Las palabras vacías y
+        los signos de puntuación dejan un None (cortan los bigramas).
+    """
+    result: List[Optional[Tuple[str, str]]] = []
+    for phrase in PHRASE_PATTERN.split(text):
+        for token in TOKEN_PATTERN.findall(normalize(phrase)):
+            if token in STOPWORDS or (len(token) < 2 and token not in ('c', 'r')):
+                result.append(None)
+            else:
+                result.append((stem(token), token))
+        result.append(None)
+    return result
+
+
+def term_counts(text: str) -> Tuple[Dict[str, int], Dict[str, str]]:
+    """
+    Frecuencias de unigramas y bigramas de un texto.
+
+    Returns:
+        Tupla (término -> frecuencia, término -> forma legible), en orden de aparición.
+    """
+    counts: Dict[str, int] = {}
+    surfaces: Dict[str, str] = {}
+    previous: Optional[Tuple[str, str]] = None
+    for token in tokenize(text):
+        if token is None:
+            previous = None
+            continue
+        term, surface = token
+        counts[term] = counts.get(term, 0) + 1
+        surfaces.setdefault(term, surface)
+        if previous is not None:
+            bigram = f"{previous[0]} {term}"
+            counts[bigram] = counts.get(bigram, 0) + 1
+            surfaces.setdefault(bigram, f"{previous[1]} {surface}")
+        previous = token
+    return counts, surfaces
+
+
+class TermVector:
+    """Vector de términos de un texto."""
+
+    __slots__ = ('weights', 'terms', 'norm', 'total', 'surfaces', 'keywords')
+
+    def __init__(self, weights: Dict[str, float], surfaces: Dict[str, str], keywords: List[str]):
+        """
+        Inicializa el vector.
+
+        Args:
+            weights: Término -> peso (1 + log(tf)).
+            surfaces: Término -> forma legible.
+            keywords: Términos que pueden reportarse como palabras clave, de mayor a menor peso.
+        """
+        self.weights = weights
+        # Para intersecar: entre dos frozenset es el doble de rápido que entre claves de dict
+        self.terms = frozenset(weights)
+        self.surfaces = surfaces
+        self.keywords = keywords
+        self.total = sum(weights.values())
+        self.norm = math.sqrt(sum(value * value for value in weights.values()))
+
+
+class CVVectors:
+    """Vectores de cada sección del CV, de su texto completo y de habilidades + experiencia."""
+
+    def __init__(self, sections: Dict[str, TermVector], combined: TermVector, query: TermVector):
+        self.sections = sections
+        self.combined = combined
+        # Vector con el que se ordenan los empleos guardados (ver PostingMatrix)
+        self.query = query
+        # Filas de los productos punto: las secciones y el CV completo
+        self.rows = [sections[name] for name in SECTIONS] + [combined]
+
+
+def _weights(counts: Dict[str, int]) -> Dict[str, float]:
+    return {term: 1.0 + math.log(count) for term, count in counts.items()}
+
+
+def cv_section_texts(cv: CVData) -> Dict[str, str]:
+    """Texto de cada sección del CV que se compara con el puesto."""
+    return {
+        'skills': "\n".join(f"{skill.title}. {skill.description}" for skill in cv.skills),
+        'experience': "\n".join(
+            "\n".join([f"{exp.position}. {exp.company}."] + list(exp.responsibilities))
+            for exp in cv.experience
+        ),
+        'education': "\n".join(
+            f"{edu.degree}. {edu.institution}. {edu.description}" for edu in cv.education
+        ),
+    }
+
+
+class ATSScorer:
+    """
+    Calcula la compatibilidad entre un CV y uno o varios puestos.
+
+    Es seguro usar una instancia desde varios hilos.
+    """
+
+    def __init__(self, cache_size: int = 256, missing_keywords: int = 15, use_numpy: Optional[bool] = None):
+        """
+        Inicializa el evaluador.
+
+        Args:
+            cache_size: Vectores de puestos (y de CVs) que se guardan en caché.
+            missing_keywords: Palabras clave faltantes que se reportan por puesto.
+            use_numpy: Usar NumPy en PostingMatrix (None: si está instalado).
+        """
+        self.cache_size = cache_size
+        self.missing_keywords = missing_keywords
+        self.use_numpy = (np is not None) if use_numpy is None else (use_numpy and np is not None)
+        # Puestos por su texto (el hash del str se calcula en C y se guarda en el objeto)
+        self._jobs: 'OrderedDict[str, TermVector]' = OrderedDict()
+        self._cvs: 'OrderedDict[str, CVVectors]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _vector(text: str) -> TermVector:
+        """Vector de un texto."""
+        counts, surfaces = term_counts(text)
+        weights = _weights(counts)
+        # Un bigrama es palabra clave si se repite (ej: "machine learning")
+        keywords = [term for term in weights if ' ' not in term or counts[term] > 1]
+        keywords.sort(key=weights.__getitem__, reverse=True)
+        return TermVector(weights, surfaces, keywords)
+
+    @staticmethod
+    def _key(text: str) -> str:
+        return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+    def _cached(self, cache: OrderedDict, key: str, build):
+        """Busca en una caché LRU o construye el valor (requiere el lock)."""
+        value = cache.get(key)
+        if value is not None:
+            cache.move_to_end(key)
+            self.hits += 1
+            return value
+        self.misses += 1
+        value = cache[key] = build()
+        while len(cache) > self.cache_size:
+            cache.popitem(last=False)
+        return value
+
+    def vector(self, text: str) -> TermVector:
+        """Vector de un texto, sin guardarlo en la caché."""
+        return self._vector(text)
+
+    def job_vector(self, text: str) -> TermVector:
+        """Vector (en caché) de la descripción de un puesto."""
+        with self._lock:
+            return self._cached(self._jobs, text, lambda: self._vector(text))
+
+    def cv_vectors(self, cv: CVData) -> CVVectors:
+        """Vectores (en caché, por contenido) de las secciones de un CV."""
+        texts = cv_section_texts(cv)
+        key = self._key("\x00".join(texts[name] for name in SECTIONS))
+
+        def build() -> CVVectors:
+            sections = {name: self._vector(texts[name]) for name in SECTIONS}
+            return CVVectors(sections, self._vector("\n".join(texts.values())),
+                             self._vector(f"{texts['skills']}\n{texts['experience']}"))
+
+        with self._lock:
+            return self._cached(self._cvs, key, build)
+
+    def score(self, cv: CVData, job_text: str) -> Dict[str, Any]:
+        """
+        Compatibilidad de un CV con un puesto.
+
+        Returns:
+            Dict con "score" (0-100: porcentaje del peso de las palabras clave
+            del puesto presentes en el CV), "similarity" (coseno con el CV
+            completo), "sections" (coseno por sección) y "missingKeywords".
+        """
+        return self.score_many(cv, [job_text])[0]
+
+    def score_many(self, cv: CVData, job_texts: Iterable[str]) -> List[Dict[str, Any]]:
+        """
+        Compatibilidad de un CV con varios puestos (mismo formato que score()).
+
+        Args:
+            cv: CV a evaluar.
+            job_texts: Descripciones de los puestos.
+
+        Returns:
+            Un resultado por puesto, en el mismo orden.
+        """
+        cv_vectors = self.cv_vectors(cv)
+        jobs = [self.job_vector(text or '') for text in job_texts]
+        return [self._result(cv_vectors, job, self._dots(cv_vectors, job)) for job in jobs]
+
+    @staticmethod
+    def _dots(cv_vectors: CVVectors, job: TermVector) -> List[float]:
+        """Productos punto del puesto con cada sección y el CV completo, y la presencia."""
+        job_weight = job.weights.__getitem__
+        # Solo aportan los términos en común (las intersecciones y las sumas se hacen en C).
+        # Las secciones son parte del CV completo: basta con cruzarlas con lo ya común.
+        common = cv_vectors.combined.terms & job.terms
+        dots = []
+        for vector in cv_vectors.rows:
+            terms = common if vector is cv_vectors.combined else vector.terms & common
+            dots.append(sum(map(operator.mul, map(job_weight, terms), map(vector.weights.__getitem__, terms))))
+        dots.append(sum(map(job_weight, common)))
+        return dots
+
+    def _result(self, cv_vectors: CVVectors, job: TermVector, dots: List[float]) -> Dict[str, Any]:
+        def cosine(dot: float, vector: TermVector) -> float:
+            return round(dot / (job.norm * vector.norm), 4) if job.norm and vector.norm else 0.0
+
+        combined = cv_vectors.combined.weights
+        missing = islice((term for term in job.keywords if term not in combined), self.missing_keywords)
+        return {
+            'score': round(100 * dots[-1] / job.total, 1) if job.total else 0.0,
+            'similarity': cosine(dots[len(SECTIONS)], cv_vectors.combined),
+            'sections': {
+                name: cosine(dots[row], cv_vectors.sections[name]) for row, name in enumerate(SECTIONS)
+            },
+            'missingKeywords': [job.surfaces[term] for term in missing]
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """Retorna el tamaño y la eficacia de las cachés."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'numpy': self.use_numpy,
+                'jobsCached': len(self._jobs),
+                'cvsCached': len(self._cvs),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hitRatio': round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+
+class PostingMatrix:
+    """
+    Matriz dispersa documento-término de un conjunto de textos (ej: los empleos).
+
+    Se guarda por columnas (término -> {fila: peso}): agregar, reemplazar o
+    quitar un documento solo toca las columnas de sus términos, y puntuar
+    todos los documentos contra un vector solo recorre las columnas de los
+    términos de ese vector. No es seguro entre hilos: lo usa el dueño bajo
+    su propio lock.
+    """
+
+    def __init__(self, scorer: ATSScorer):
+        """
+        Inicializa la matriz vacía.
+
+        Args:
+            scorer: Evaluador cuya tokenización se comparte.
+        """
+        self.scorer = scorer
+        self._rows: Dict[str, int] = {}
+        self._keys: List[Optional[str]] = []
+        self._vectors: List[Optional[TermVector]] = []
+        self._texts: Dict[str, str] = {}
+        self._columns: Dict[str, Dict[int, float]] = {}
+        # Columnas como arreglos de NumPy (se crean al necesitarlas)
+        self._arrays: Dict[str, Tuple[Any, Any]] = {}
+        self._free: List[int] = []
+        self.updates = 0
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def set(self, key: str, text: str) -> bool:
+        """
+        Agrega o reemplaza el documento de una clave (un texto vacío lo quita).
+
+        Returns:
+            True si la matriz cambió (False si el texto es el mismo).
+        """
+        if self._texts.get(key) == text:
+            return False
+        self.remove(key)
+        if not text.strip():
+            return True
+        vector = self.scorer.vector(text)
+        row = self._free.pop() if self._free else len(self._keys)
+        if row == len(self._keys):
+            self._keys.append(key)
+            self._vectors.append(vector)
+        else:
+            self._keys[row] = key
+            self._vectors[row] = vector
+        self._rows[key] = row
+        self._texts[key] = text
+        for term, weight in vector.weights.items():
+            self._columns.setdefault(term, {})[row] = weight
+            self._arrays.pop(term, None)
+        self.updates += 1
+        return True
+
+    def remove(self, key: str) -> None:
+        """Quita el documento de una clave (si existe)."""
+        row = self._rows.pop(key, None)
+        if row is None:
+            return
+        for term in self._vectors[row].weights:
+            column = self._columns[term]
+            del column[row]
+            if not column:
+                del self._columns[term]
+            self._arrays.pop(term, None)
+        self._keys[row] = None
+        self._vectors[row] = None
+        self._texts.pop(key, None)
+        self._free.append(row)
+        self.updates += 1
+
+    def sync(self, texts: Dict[str, str]) -> int:
+        """
+        Deja en la matriz exactamente los textos indicados, procesando solo los que cambiaron.
+
+        Returns:
+            Número de documentos agregados, reemplazados o quitados.
+        """
+        changed = 0
+        for key in [key for key in self._texts if key not in texts]:
+            self.remove(key)
+            changed += 1
+        for key, text in texts.items():
+            if self._texts.get(key, '') != text and self.set(key, text):
+                changed += 1
+        return changed
+
+    def rank(self, query: TermVector) -> List[Dict[str, Any]]:
+        """
+        Puntúa todos los documentos contra un vector, en una sola pasada.
+
+        Args:
+            query: Vector (ej: habilidades y experiencia de un CV).
+
+        Returns:
+            Lista de {"key", "score", "similarity"} de mayor a menor "score"
+            (porcentaje del peso de los términos del documento presentes en query).
+        """
+        if self.scorer.use_numpy:
+            dots, covered = self._products_numpy(query)
+        else:
+            dots, covered = self._products_python(query)
+        ranked = []
+        for row, key in enumerate(self._keys):
+            if key is None:
+                continue
+            vector = self._vectors[row]
+            norm = vector.norm * query.norm
+            ranked.append({
+                'key': key,
+                'score': round(100 * covered[row] / vector.total, 1) if vector.total else 0.0,
+                'similarity': round(dots[row] / norm, 4) if norm else 0.0
+            })
+        ranked.sort(key=lambda item: (-item['score'], -item['similarity']))
+        return ranked
+
+    def _products_python(self, query: TermVector) -> Tuple[List[float], List[float]]:
+        dots = [0.0] * len(self._keys)
+        covered = [0.0] * len(self._keys)
+        for term, query_weight in query.weights.items():
+            for row, weight in self._columns.get(term, {}).items():
+                dots[row] += query_weight * weight
+                covered[row] += weight
+        return dots, covered
+
+    def _products_numpy(self, query: TermVector):
+        """Producto matriz-vector: las columnas de los términos de query, sumadas por fila."""
+        rows, weights, query_weights = [], [], []
+        for term, query_weight in query.weights.items():
+            column = self._columns.get(term)
+            if not column:
+                continue
+            arrays = self._arrays.get(term)
+            if arrays is None:
+                arrays = self._arrays[term] = (
+                    np.fromiter(column.keys(), dtype=np.int64, count=len(column)),
+                    np.fromiter(column.values(), dtype=np.float64, count=len(column))
+                )
+            rows.append(arrays[0])
+            weights.append(arrays[1])
+            query_weights.append(np.full(len(column), query_weight))
+        size = len(self._keys)
+        if not rows:
+            return np.zeros(size), np.zeros(size)
+        rows = np.concatenate(rows)
+        weights = np.concatenate(weights)
+        dots = np.bincount(rows, weights=weights * np.concatenate(query_weights), minlength=size)
+        covered = np.bincount(rows, weights=weights, minlength=size)
+        return dots, covered
+
+    def stats(self) -> Dict[str, Any]:
+        """Retorna el tamaño de la matriz."""
+        return {
+            'documents': len(self._rows),
+            'terms': len(self._columns),
+            'nonZero': sum(len(column) for column in self._columns.values()),
+            'updates': self.updates
+        }
@@ -0,0 +1,393 @@
+"""
+Ajuste automático de tamaños de fuente.
+Busca los tamaños más grandes con los que el CV cabe en un número de páginas,
+simulando la maquetación de ReportLab sin generar el PDF.
+"""
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Tuple
+from reportlab import rl_config
+from reportlab.lib.pagesizes import letter
+from reportlab.platypus import Flowable, Paragraph, Table
+from models.cv_data import CVData
+from config.settings import Config
+from services.pdf_service import (
+    PDFContentBuilder, PDFStyleBuilder, SectionCache, StyleRegistry, normalize_font_sizes
+)
+
+# Tamaños por defecto (rem) de cada elemento, iguales a los de PDFStyleBuilder
+DEFAULT_FONT_SIZES = {
+    'name': 2.5,
+    'contact': 0.9,
+    'sectionTitle': 1.2,
+    'skillsContent': 0.95,
+    'experienceCompany': 1.0,
+    'experiencePosition': 0.95,
+    'experienceDuration': 0.9,
+    'experienceBullet': 0.9,
+    'educationInstitution': 0.95,
+    'educationDegree': 0.95,
+    'educationDate': 0.85,
+    'educationDescription': 0.9,
+}
+
+# (mínimo, máximo, paso) de cada tamaño, iguales a los controles del editor
+FONT_SIZE_RANGES = {
+    'name': (1.5, 4.0, 0.1),
+    'contact': (0.7, 1.3, 0.05),
+    'sectionTitle': (0.9, 2.0, 0.05),
+    'skillsContent': (0.7, 1.3, 0.05),
+    'experienceCompany': (0.8, 1.5, 0.05),
+    'experiencePosition': (0.7, 1.3, 0.05),
+    'experienceDuration': (0.7, 1.2, 0.05),
+    'experienceBullet': (0.7, 1.2, 0.05),
+    'educationInstitution': (0.7, 1.3, 0.05),
+    'educationDegree': (0.7, 1.3, 0.05),
+    'educationDate': (0.6, 1.2, 0.05),
+    'educationDescription': (0.7, 1.2, 0.05),
+}
+
+# Grupos que se escalan juntos en el modo por sección (en orden de prioridad)
+SECTION_GROUPS = OrderedDict([
+    ('experience', ('experienceCompany', 'experiencePosition', 'experienceDuration', 'experienceBullet')),
+    ('skills', ('skillsContent',)),
+    ('education', ('educationInstitution', 'educationDegree', 'educationDate', 'educationDescription')),
+    ('titles', ('sectionTitle',)),
+    ('header', ('name', 'contact')),
+])
+
+AUTOFIT_MODES = ('uniform', 'sections')
+
+# Padding por defecto de los Frame de ReportLab
+FRAME_PADDING = 6
+
+
+class LayoutTooLargeError(Exception):
+    """Un elemento no cabe ni en una página vacía."""
+
+
+def _style_fingerprint(style) -> Tuple:
+    """Atributos del estilo que afectan al alto de un párrafo."""
+    return (
+        style.fontName, style.fontSize, style.leading, style.leftIndent, style.rightIndent,
+        style.firstLineIndent, style.alignment, style.wordWrap, style.splitLongWords
+    )
+
+
+def _flowable_fingerprint(flowable: Flowable) -> Optional[Tuple]:
+    """
+    Identifica el contenido de un flowable para la caché de medidas.
+
+    Returns:
+        Tupla hashable, o None si el flowable no se puede cachear.
+    """
+    if isinstance(flowable, Paragraph):
+        return ('P', flowable.text, _style_fingerprint(flowable.style))
+    if isinstance(flowable, Table):
+        cells = []
+        for row in flowable._cellvalues:
+            for cell in row:
+                fingerprint = _flowable_fingerprint(cell) if isinstance(cell, Flowable) else ('S', str(cell))
+                if fingerprint is None:
+                    return None
+                cells.append(fingerprint)
+        return ('T', tuple(cells), tuple(flowable._argW), tuple(flowable._argH))
+    return None
+
+
+class MeasureCache:
+    """
+    Caché LRU de medidas (ancho, alto) de flowables por contenido, estilo y ancho disponible.
+
+    Se comparte entre peticiones: los párrafos que no cambian entre
+    iteraciones de la búsqueda (o entre llamadas) no se vuelven a medir.
+    """
+
+    def __init__(self, maxsize: int = 8192):
+        """
+        Inicializa la caché.
+
+        Args:
+            maxsize: Número máximo de medidas retenidas.
+        """
+        self.maxsize = max(1, maxsize)
+        self._entries: 'OrderedDict[Tuple, Tuple[float, float]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def wrap(self, flowable: Flowable, avail_width: float, avail_height: float) -> Tuple[float, float]:
+        """
+        Retorna las medidas del flowable, usando la caché si es posible.
+
+        Los párrafos y tablas sin dividir miden lo mismo con cualquier alto
+        disponible, por lo que el alto no forma parte de la clave.
+        """
+        fingerprint = _flowable_fingerprint(flowable)
+        if fingerprint is None:
+            return flowable.wrap(avail_width, avail_height)
+        key = (fingerprint, round(avail_width, 3))
+        with self._lock:
+            size = self._entries.get(key)
+            if size is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return size
+            self.misses += 1
+        size = flowable.wrap(avail_width, avail_height)
+        with self._lock:
+            self._entries[key] = size
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return size
+
+    def stats(self) -> Dict[str, Any]:
+        """Retorna los contadores de la caché."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hitRatio': round(self.hits / lookups, 4) if lookups else 0.0,
+                'entries': len(self._entries),
+                'maxsize': self.maxsize
+            }
+
+
+measure_cache = MeasureCache(Config.AUTOFIT_MEASURE_CACHE_SIZE)
+
+# Registro de estilos propio: las combinaciones de prueba no desplazan a las del PDF real
+autofit_styles = StyleRegistry(Config.PDF_STYLE_CACHE_SIZE * 4)
+
+
+class PageCounter:
+    """
+    Cuenta las páginas que ocupa una lista de flowables.
+
+    Reproduce la lógica de Frame.add/Frame.split y de
+    BaseDocTemplate.handle_flowable para un SimpleDocTemplate de una
+    columna, usando wrap/split de ReportLab pero sin dibujar nada.
+    """
+
+    def __init__(self, config: Config, cache: MeasureCache = measure_cache):
+        """
+        Inicializa el contador con la geometría de página del PDF.
+
+        Args:
+            config: Configuración de la aplicación (márgenes).
+            cache: Caché de medidas.
+        """
+        margins = config.PDF_MARGINS
+        page_width, page_height = letter
+        self.avail_width = page_width - margins['left'] - margins['right'] - 2 * FRAME_PADDING
+        self.avail_height = page_height - margins['top'] - margins['bottom'] - 2 * FRAME_PADDING
+        self.cache = cache
+
+    def count(self, flowables: List[Flowable], max_pages: int) -> int:
+        """
+        Cuenta páginas, deteniéndose al superar max_pages.
+
+        Args:
+            flowables: Elementos sin maquetar (no se reutilizan después).
+            max_pages: Límite a partir del cual no interesa seguir contando.
+
+        Returns:
+            int: Número de páginas (max_pages + 1 si se supera el límite).
+
+        Raises:
+            LayoutTooLargeError: Si un elemento no cabe en una página vacía.
+        """
+        fuzz = rl_config._FUZZ
+        pending = deque(flowables)
+        pages = 1
+        y = self.avail_height
+        at_top = True
+        prev_space = 0
+
+        while pending:
+            flowable = pending.popleft()
+            space = 0 if at_top else max(flowable.getSpaceBefore() - prev_space, 0)
+            avail = y - space
+            if avail > 0:
+                _, height = self.cache.wrap(flowable, self.avail_width, avail)
+                if height + space <= avail + fuzz:
+                    y -= height + space
+                    prev_space = flowable.getSpaceAfter()
+                    y -= prev_space
+                    at_top = at_top and y == self.avail_height
+                    continue
+
+                # No cabe entero: intentar dividirlo en el espacio restante
+                flowable.wrap(self.avail_width, avail)
+                parts = flowable.split(self.avail_width, avail)
+                if parts:
+                    first = parts[0]
+                    _, height = first.wrap(self.avail_width, avail)
+                    y -= height + space
+                    prev_space = first.getSpaceAfter()
+                    y -= prev_space
+                    at_top = False
+                    pending.extendleft(reversed(parts[1:]))
+                    continue
+
+            if at_top:
+                raise LayoutTooLargeError("Un elemento no cabe en una página")
+            pages += 1
+            if pages > max_pages:
+                return pages
+            pending.appendleft(flowable)
+            y = self.avail_height
+            at_top = True
+            prev_space = 0
+
+        return pages
+
+
+@dataclass
+class AutofitResult:
+    """Resultado del ajuste automático."""
+    font_sizes: Dict[str, float]
+    pages: int
+    fits: bool
+    mode: str
+    scales: Dict[str, float] = field(default_factory=dict)
+    iterations: int = 0
+    elapsed_ms: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convierte el resultado a diccionario."""
+        return {
+            'fontSizes': self.font_sizes,
+            'pages': self.pages,
+            'fits': self.fits,
+            'mode': self.mode,
+            'scales': self.scales,
+            'iterations': self.iterations,
+            'elapsedMs': round(self.elapsed_ms, 2)
+        }
+
+
+class FontAutofitter:
+    """
+    Busca por bisección la mayor escala de fuentes que cabe en N páginas.
+
+    Modo 'uniform': un único factor para todos los tamaños.
+    Modo 'sections': parte del factor uniforme y luego agranda cada grupo
+    de secciones (SECTION_GROUPS) por separado mientras siga cabiendo.
+    """
+
+    def __init__(self, config: Config, min_scale: float = 0.5, max_scale: float = 2.0,
+                 tolerance: float = 0.005, max_iterations: int = 20):
+        """
+        Inicializa el buscador.
+
+        Args:
+            config: Configuración de la aplicación.
+            min_scale: Factor mínimo permitido.
+            max_scale: Factor máximo permitido.
+            tolerance: Precisión de la bisección.
+            max_iterations: Máximo de pasos de bisección por búsqueda.
+        """
+        self.config = config
+        self.min_scale = min_scale
+        self.max_scale = max_scale
+        self.tolerance = tolerance
+        self.max_iterations = max_iterations
+        self.counter = PageCounter(config)
+
+    def fit(self, cv_data: CVData, font_sizes: Optional[Dict[str, Any]] = None,
+            max_pages: int = 1, mode: str = 'uniform') -> AutofitResult:
+        """
+        Calcula los tamaños de fuente con los que el CV cabe en max_pages.
+
+        Args:
+            cv_data: Datos del CV.
+            font_sizes: Tamaños actuales; sus proporciones se conservan.
+            max_pages: Número máximo de páginas.
+            mode: 'uniform' o 'sections'.
+
+        Returns:
+            AutofitResult: Tamaños elegidos y páginas resultantes.
+        """
+        if mode not in AUTOFIT_MODES:
+            raise ValueError(f"Modo no soportado: {mode}")
+        if max_pages < 1:
+            raise ValueError("max_pages debe ser al menos 1")
+
+        start = time.perf_counter()
+        base = dict(DEFAULT_FONT_SIZES)
+        base.update({k: v for k, v in normalize_font_sizes(font_sizes).items() if k in base})
+        # Las secciones sin cambios entre iteraciones se reutilizan ya construidas
+        sections = SectionCache(maxsize=64)
+        iterations = 0
+
+        def pages_for(scales: Dict[str, float]) -> int:
+            nonlocal iterations
+            iterations += 1
+            sizes = self._apply(base, scales)
+            flowables = self._build(cv_data, sizes, sections)
+            return self.counter.count(flowables, max_pages)
+
+        def fits(scales: Dict[str, float]) -> bool:
+            return pages_for(scales) <= max_pages
+
+        def search(make_scales, low: float, high: float) -> float:
+            """Mayor factor en [low, high] que cabe, sabiendo que low cabe."""
+            if fits(make_scales(high)):
+                return high
+            for _ in range(self.max_iterations):
+                if high - low <= self.tolerance:
+                    break
+                middle = (low + high) / 2
+                if fits(make_scales(middle)):
+                    low = middle
+                else:
+                    high = middle
+            return low
+
+        def uniform(factor: float) -> Dict[str, float]:
+            return {group: factor for group in SECTION_GROUPS}
+
+        scales = uniform(self.min_scale)
+        if fits(scales):
+            factor = search(uniform, self.min_scale, self.max_scale)
+            scales = uniform(factor)
+            if mode == 'sections':
+                for group in SECTION_GROUPS:
+                    grow = lambda value, group=group: dict(scales, **{group: value})
+                    scales = grow(search(grow, scales[group], self.max_scale))
+
+        sizes = self._apply(base, scales)
+        pages = self.counter.count(self._build(cv_data, sizes, sections), max_pages)
+        return AutofitResult(
+            font_sizes=sizes,
+            pages=pages,
+            fits=pages <= max_pages,
+            mode=mode,
+            scales={group: round(value, 4) for group, value in scales.items()},
+            iterations=iterations,
+            elapsed_ms=(time.perf_counter() - start) * 1000
+        )
+
+    @staticmethod
+    def _apply(base: Dict[str, float], scales: Dict[str, float]) -> Dict[str, float]:
+        """
+        Escala los tamaños base por grupo, ajustándolos al rango y paso de cada control.
+
+        Se redondea hacia abajo para que el resultado no ocupe más que lo medido.
+        """
+        sizes = {}
+        for group, keys in SECTION_GROUPS.items():
+            for key in keys:
+                minimum, maximum, step = FONT_SIZE_RANGES[key]
+                value = base[key] * scales[group]
+                value = int(value / step + 1e-9) * step
+                sizes[key] = round(min(max(value, minimum), maximum), 4)
+        return sizes
+
+    def _build(self, cv_data: CVData, sizes: Dict[str, float], sections: SectionCache) -> List[Flowable]:
+        """Construye los flowables del CV igual que PDFService.generate()."""
+        style_builder = PDFStyleBuilder(self.config, sizes, cv_data.font_family, registry=autofit_styles)
+        return PDFContentBuilder(style_builder, cache=sections).build_document(cv_data)
@@ -0,0 +1,186 @@
+"""
+Servicio de generación de PDFs por lotes.
+Renderiza varios CVs en paralelo usando un pool de procesos reutilizable.
+"""
+import io
+import os
+import threading
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Iterator, List, Optional, Tuple
+from models.cv_data import CVData
+from config.settings import Config
+
+# Servicio de PDF propio de cada proceso trabajador (se crea en el initializer)
+_worker_pdf_service = None
+
+
+def _init_worker() -> None:
+    """Inicializa un proceso trabajador importando ReportLab una sola vez."""
+    global _worker_pdf_service
+    from services.pdf_service import PDFService
+    # La caché de resultados vive en el proceso principal
+    _worker_pdf_service = PDFService(Config, use_output_cache=False)
+
+
+def _warm_worker() -> int:
+    """Tarea vacía usada para arrancar los procesos antes del primer lote."""
+    return os.getpid()
+
+
+def _render_in_worker(cv_data: CVData, font_sizes: Optional[Dict[str, float]]) -> bytes:
+    """
+    Renderiza un CV dentro de un proceso trabajador.
+
+    Args:
+        cv_data: Datos del CV.
+        font_sizes: Tamaños de fuente personalizados (opcional).
+
+    Returns:
+        bytes: Contenido del PDF.
+    """
+    return _worker_pdf_service.generate(cv_data, font_sizes).getvalue()
+
+
+class BatchPDFRenderer:
+    """Renderizador de lotes de PDFs sobre un ProcessPoolExecutor persistente."""
+
+    def __init__(self, pdf_service, max_workers: int):
+        """
+        Inicializa el renderizador.
+
+        Args:
+            pdf_service: Servicio de PDF del proceso principal (aporta la caché).
+            max_workers: Número de procesos trabajadores.
+        """
+        self.pdf_service = pdf_service
+        self.max_workers = max(1, max_workers)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Retorna el pool de procesos, creándolo y calentándolo la primera vez."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    initializer=_init_worker
+                )
+                # Enviar una tarea por trabajador fuerza el arranque de todos los procesos
+                for _ in range(self.max_workers):
+                    self._executor.submit(_warm_worker)
+            return self._executor
+
+    def warm_up(self) -> None:
+        """Arranca los procesos trabajadores sin esperar a la primera petición."""
+        try:
+            self._get_executor()
+        except OSError as e:
+            print(f"Error starting PDF batch workers: {e}")
+
+    def shutdown(self) -> None:
+        """Detiene el pool de procesos."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def render_many(self, jobs: List[Tuple[CVData, Optional[Dict[str, float]]]]
+                    ) -> Iterator[Tuple[int, Optional[bytes], Optional[str]]]:
+        """
+        Renderiza varios CVs, entregando cada PDF en cuanto está listo.
+
+        Los PDFs presentes en la caché se entregan sin pasar por el pool.
+
+        Args:
+            jobs: Lista de tuplas (datos del CV, tamaños de fuente opcionales).
+
+        Yields:
+            Tuplas (índice en jobs, bytes del PDF, error) en orden de finalización.
+            Si un CV falla, los bytes son None y error contiene el mensaje.
+        """
+        pending = {}
+        for index, (cv_data, font_sizes) in enumerate(jobs):
+            key = self.pdf_service.cache_key(cv_data, font_sizes)
+            cached = self.pdf_service.output_cache.get(key) if self.pdf_service.output_cache else None
+            if cached is not None:
+                yield index, cached, None
+            else:
+                pending[index] = (key, cv_data, font_sizes)
+
+        if not pending:
+            return
+
+        try:
+            executor = self._get_executor()
+            futures = {
+                executor.submit(_render_in_worker, cv_data, font_sizes): index
+                for index, (_, cv_data, font_sizes) in pending.items()
+            }
+        except (OSError, BrokenProcessPool) as e:
+            # Sin procesos disponibles: renderizar en este proceso
+            print(f"PDF batch pool unavailable, rendering in-process: {e}")
+            self.shutdown()
+            for index, (_, cv_data, font_sizes) in pending.items():
+                try:
+                    yield index, self.pdf_service.render(cv_data, font_sizes).data, None
+                except Exception as render_error:
+                    yield index, None, str(render_error)
+            return
+
+        for future in as_completed(futures):
+            index = futures[future]
+            try:
+                data = future.result()
+            except BrokenProcessPool as e:
+                # Un trabajador murió; el próximo lote creará un pool nuevo
+                self.shutdown()
+                yield index, None, str(e)
+                continue
+            except Exception as e:
+                yield index, None, str(e)
+                continue
+            if self.pdf_service.output_cache is not None:
+                self.pdf_service.output_cache.put(pending[index][0], data)
+            yield index, data, None
+
+
+class ZipStream(io.RawIOBase):
+    """Destino no posicionable para zipfile que acumula los bytes escritos."""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks: List[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        """Retorna y descarta los bytes acumulados desde la última llamada."""
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def stream_zip(entries: Iterator[Tuple[str, bytes]]) -> Iterator[bytes]:
+    """
+    Genera un archivo ZIP por partes a medida que llegan sus entradas.
+
+    Args:
+        entries: Iterador de tuplas (nombre de archivo, contenido).
+
+    Yields:
+        Fragmentos del ZIP listos para enviar al cliente.
+    """
+    stream = ZipStream()
+    # Los PDFs ya están comprimidos; ZIP_STORED evita trabajo inútil
+    with zipfile.ZipFile(stream, mode='w', compression=zipfile.ZIP_STORED) as archive:
+        for name, data in entries:
+            archive.writestr(name, data)
+            yield stream.drain()
+    yield stream.drain()
@@ -0,0 +1,108 @@
+"""
+Codificación JSON intercambiable.
+
+Usa orjson si está instalado (pip install orjson) y, si no, el módulo json
+de la biblioteca estándar. DataService lo usa para leer y escribir los
+archivos y CodecJSONProvider para las peticiones y respuestas de Flask.
+"""
+import json
+from typing import Any, Callable, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # opcional
+    orjson = None
+
+from flask.json.provider import DefaultJSONProvider
+
+from config.settings import Config
+
+
+class JSONCodec:
+    """Codificador basado en el módulo json de la biblioteca estándar."""
+
+    name = 'json'
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        """Decodifica JSON desde bytes (UTF-8) o texto."""
+        return json.loads(data)
+
+    def dumps(self, obj: Any, pretty: bool = False, sort_keys: bool = False,
+              default: Optional[Callable[[Any], Any]] = None) -> bytes:
+        """
+        Codifica a JSON en UTF-8.
+
+        Args:
+            obj: Valor a codificar.
+            pretty: Con sangría (legible) o compacto.
+            sort_keys: Ordenar las claves de los objetos.
+            default: Conversión de los tipos no soportados.
+
+        Returns:
+            bytes: Documento JSON.
+        """
+        text = json.dumps(
+            obj,
+            ensure_ascii=False,
+            sort_keys=sort_keys,
+            default=default,
+            indent=4 if pretty else None,
+            separators=None if pretty else (',', ':')
+        )
+        return text.encode('utf-8')
+
+
+class OrjsonCodec(JSONCodec):
+    """Codificador basado en orjson (la sangría del modo legible es de 2 espacios)."""
+
+    name = 'orjson'
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return orjson.loads(data)
+
+    def dumps(self, obj: Any, pretty: bool = False, sort_keys: bool = False,
+              default: Optional[Callable[[Any], Any]] = None) -> bytes:
+        option = orjson.OPT_NON_STR_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=default, option=option)
+
+
+def get_codec(name: str = 'auto') -> JSONCodec:
+    """
+    Retorna el codificador pedido.
+
+    Args:
+        name: 'auto' (orjson si está disponible), 'orjson' o 'json'.
+
+    Returns:
+        JSONCodec: Codificador a usar.
+    """
+    if name == 'orjson' and orjson is None:
+        print("orjson no está instalado; se usa json")
+    if name in ('auto', 'orjson') and orjson is not None:
+        return OrjsonCodec()
+    return JSONCodec()
+
+
+codec = get_codec(Config.JSON_CODEC)
+
+
+class CodecJSONProvider(DefaultJSONProvider):
+    """Proveedor JSON de Flask que usa el codificador configurado."""
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return self._encode(obj, bool(kwargs.get('indent'))).decode('utf-8')
+
+    def loads(self, s: Union[str, bytes], **kwargs: Any) -> Any:
+        return codec.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any):
+        obj = self._prepare_response_obj(args, kwargs)
+        pretty = (self.compact is None and self._app.debug) or self.compact is False
+        return self._app.response_class(self._encode(obj, pretty) + b"\n", mimetype=self.mimetype)
+
+    def _encode(self, obj: Any, pretty: bool) -> bytes:
+        return codec.dumps(obj, pretty=pretty, sort_keys=self.sort_keys, default=self.default)
@@ -2,91 +2,595 @@
 Servicio de manejo de datos del CV.
 Responsable de la persistencia y recuperación de datos.
 """
-import json
+import atexit
+import hashlib
 import os
-from typing import Dict, Any, Optional
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Any, Hashable, List, Optional, Tuple
 from models.cv_data import CVData
+from config.settings import Config
+from services.codec import codec
+from services.json_patch import apply_patch
+from services.metrics import record_span, span
+
+try:
+    import fcntl
+except ImportError:  # Windows: sin bloqueo entre procesos
+    fcntl = None
+
+
+def content_revision(data: Any) -> int:
+    """
+    Calcula la revisión de un documento a partir de su contenido.
+
+    Al depender solo del contenido, coincide entre procesos que sirven el
+    mismo archivo. Se limita a 48 bits para que JavaScript la represente
+    sin pérdida.
+
+    Args:
+        data: Documento JSON.
+
+    Returns:
+        int: Revisión del documento.
+    """
+    canonical = codec.dumps(data, sort_keys=True)
+    return int.from_bytes(hashlib.blake2b(canonical, digest_size=6).digest(), 'big')
+
+
+class RevisionConflictError(Exception):
+    """La revisión esperada por el cliente ya no es la vigente."""
+
+    def __init__(self, expected: int, current: int):
+        super().__init__(f"Revisión {expected} obsoleta; la vigente es {current}")
+        self.expected = expected
+        self.current = current
+
+
+class JSONFileBackend:
+    """
+    Almacenamiento de un documento en un archivo JSON (backend por defecto).
+
+    Todos los backends exponen la misma interfaz: signature(), read() y
+    write(). La firma permite a DataService saber si su copia en memoria
+    sigue vigente sin volver a leer el documento. Este backend además
+    expone read_encoded() y write() retorna los bytes escritos, para que
+    DataService pueda servir el documento ya serializado.
+    """
+
+    def __init__(self, data_file_path: str, compact: Optional[bool] = None):
+        """
+        Inicializa el backend.
+
+        Args:
+            data_file_path: Ruta al archivo de datos JSON.
+            compact: Escribir sin sangría (por defecto, Config.DATA_JSON_COMPACT).
+        """
+        self.data_file_path = data_file_path
+        self.compact = Config.DATA_JSON_COMPACT if compact is None else compact
+        # Asegurar que el directorio existe
+        directory = os.path.dirname(data_file_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def signature(self) -> Optional[Tuple[int, int]]:
+        """Retorna (mtime_ns, tamaño) del archivo, o None si no existe."""
+        try:
+            stat = os.stat(self.data_file_path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def read(self) -> Dict[str, Any]:
+        """Lee y parsea el archivo completo."""
+        return self.read_encoded()[0]
+
+    def read_encoded(self) -> Tuple[Dict[str, Any], bytes]:
+        """Lee el archivo completo y retorna (datos, bytes leídos)."""
+        with open(self.data_file_path, 'rb') as f:
+            raw = f.read()
+        return codec.loads(raw), raw
+
+    def write(self, data: Dict[str, Any]) -> bytes:
+        """
+        Escribe el archivo completo de forma atómica.
+
+        Un fallo a mitad de escritura deja intacto el archivo anterior.
+
+        Returns:
+            bytes: Contenido escrito.
+        """
+        encoded = codec.dumps(data, pretty=not self.compact)
+        directory = os.path.dirname(self.data_file_path) or '.'
+        fd, tmp_path = tempfile.mkstemp(
+            dir=directory,
+            prefix=f".{os.path.basename(self.data_file_path)}.",
+            suffix='.tmp'
+        )
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(encoded)
+                f.flush()
+                os.fsync(f.fileno())
+            # mkstemp crea el archivo con permisos 0600; conservar los del original
+            try:
+                os.chmod(tmp_path, os.stat(self.data_file_path).st_mode & 0o777)
+            except OSError:
+                os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, self.data_file_path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+        return encoded
 
 
 class DataService:
-    """Servicio para manejar la persistencia de datos del CV."""
-    
-    def __init__(self, data_file_path: str):
+    """
+    Servicio para manejar la persistencia de datos del CV.
+
+    Mantiene en memoria el último contenido leído del archivo y solo lo
+    vuelve a parsear cuando cambia su firma (mtime/tamaño) o cuando el
+    propio servicio escribe en él. Usar DataService.for_file() para
+    compartir una única instancia por archivo.
+
+    Las escrituras son atómicas (archivo temporal + fsync + os.replace) y
+    las ráfagas de guardados dentro de la ventana de coalescencia se
+    agrupan en una sola escritura a disco.
+
+    Cada contenido recibe un número de revisión (hash del contenido), usado
+    para control de concurrencia optimista en patch().
+
+    Junto a la copia en memoria se guarda su forma serializada (los bytes
+    del archivo o los recién escritos), que load_encoded() entrega sin
+    volver a codificar.
+
+    Es seguro usar una misma instancia desde varios hilos. Si varios
+    procesos sirven los mismos archivos, llamar antes a
+    DataService.enable_multiprocess().
+    """
+
+    _instances: Dict[str, 'DataService'] = {}
+    _instances_lock = threading.Lock()
+    _multiprocess = False
+
+    def __init__(self, data_file_path: str, trust_own_writes: bool = False,
+                 coalesce_window: float = 0.0, backend=None):
         """
         Inicializa el servicio de datos.
-        
+
         Args:
             data_file_path: Ruta al archivo de datos JSON.
+            trust_own_writes: Si es True, asume que este servicio es el único
+                escritor del archivo y sirve la copia en memoria sin hacer stat.
+            coalesce_window: Segundos que se espera para agrupar guardados
+                consecutivos en una sola escritura (0 escribe de inmediato).
+            backend: Almacenamiento del documento (por defecto, el archivo JSON).
         """
         self.data_file_path = data_file_path
-        # Asegurar que el directorio existe
-        os.makedirs(os.path.dirname(data_file_path), exist_ok=True)
-    
+        self.trust_own_writes = trust_own_writes
+        self.coalesce_window = coalesce_window
+        self.backend = backend or JSONFileBackend(data_file_path)
+
+        self._lock = threading.RLock()
+        # Serializa las escrituras a disco sin bloquear a los lectores
+        self._write_lock = threading.Lock()
+        self._snapshot: Optional[Dict[str, Any]] = None
+        self._encoded: Optional[bytes] = None
+        self._signature: Optional[Hashable] = None
+        self._dirty = False
+        self._revision: Optional[int] = None
+        self._process_lock_path: Optional[str] = None
+        self._flush_timer: Optional[threading.Timer] = None
+        # Último error de una escritura diferida (se reporta en el próximo guardado)
+        self._write_error: Optional[Exception] = None
+        self._write_failures = 0
+        self.hits = 0
+        self.misses = 0
+        self.parse_time_total = 0.0
+        self.last_parse_time = 0.0
+        self.saves = 0
+        self.disk_writes = 0
+
+    @classmethod
+    def for_file(cls, data_file_path: str) -> 'DataService':
+        """
+        Retorna la instancia compartida del servicio para un archivo.
+
+        Args:
+            data_file_path: Ruta al archivo de datos JSON.
+
+        Returns:
+            DataService: Instancia única por ruta absoluta.
+        """
+        key = os.path.abspath(data_file_path)
+        with cls._instances_lock:
+            service = cls._instances.get(key)
+            if service is None:
+                service = cls(
+                    data_file_path,
+                    trust_own_writes=Config.DATA_CACHE_TRUST_WRITES,
+                    coalesce_window=Config.DATA_WRITE_COALESCE_SECONDS,
+                    backend=cls._backend_for(data_file_path)
+                )
+                if cls._multiprocess:
+                    service._use_process_lock()
+                cls._instances[key] = service
+            return service
+
+    @classmethod
+    def enable_multiprocess(cls) -> None:
+        """
+        Prepara las instancias compartidas para varios procesos sobre los mismos archivos.
+
+        Desactiva la coalescencia de escrituras y la confianza en la copia
+        en memoria (cada proceso ve lo que escriben los demás) y serializa
+        patch() entre procesos con un bloqueo de archivo (solo POSIX).
+        """
+        with cls._instances_lock:
+            cls._multiprocess = True
+            services = list(cls._instances.values())
+        for service in services:
+            service.flush()
+            service._use_process_lock()
+
+    def _use_process_lock(self) -> None:
+        """Configura esta instancia para convivir con otros procesos."""
+        with self._lock:
+            self.coalesce_window = 0.0
+            self.trust_own_writes = False
+            if fcntl is not None:
+                self._process_lock_path = f"{self.data_file_path}.lock"
+
+    @contextmanager
+    def _process_lock(self):
+        """Bloqueo exclusivo entre procesos (no hace nada si no está habilitado)."""
+        if self._process_lock_path is None:
+            yield
+            return
+        with open(self._process_lock_path, 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    @classmethod
+    def all_stats(cls) -> List[Dict[str, Any]]:
+        """Retorna las estadísticas de todas las instancias compartidas."""
+        with cls._instances_lock:
+            services = list(cls._instances.values())
+        return [service.stats() for service in services]
+
+    @classmethod
+    def flush_all(cls) -> None:
+        """Escribe a disco los guardados pendientes de todas las instancias compartidas."""
+        with cls._instances_lock:
+            services = list(cls._instances.values())
+        for service in services:
+            service.flush()
+
+    @staticmethod
+    def _backend_for(data_file_path: str):
+        """Crea el backend configurado (Config.STORAGE_BACKEND, Config.EMPLEOS_JOURNAL) para un archivo."""
+        if Config.STORAGE_BACKEND == 'sqlite':
+            from services.sqlite_storage import SQLiteDocumentBackend, get_sqlite_storage
+            document = os.path.splitext(os.path.basename(data_file_path))[0]
+            journal_path = f"{os.path.splitext(data_file_path)[0]}.jsonl"
+            if os.path.exists(journal_path):
+                print(f"Advertencia: {journal_path} tiene cambios que no están en SQLite; "
+                      f"ejecute python app.py --migrate-sqlite --overwrite para importarlos")
+            return SQLiteDocumentBackend(get_sqlite_storage(), document)
+        if os.path.abspath(data_file_path) == os.path.abspath(Config.EMPLEOS_DATA_FILE):
+            from services.journal_storage import JournalBackend
+            if Config.EMPLEOS_JOURNAL:
+                return JournalBackend(data_file_path, Config.EMPLEOS_JOURNAL_COMPACT_BYTES)
+            backend = JournalBackend(data_file_path, compact_bytes=0)
+            if os.path.exists(backend.journal_path):
+                # Diario de cuando estaba habilitado: se incorpora en la próxima escritura
+                return backend
+        return JSONFileBackend(data_file_path)
+
     def load(self) -> CVData:
         """
         Carga los datos del CV desde el archivo.
-        
+
         Returns:
             CVData: Objeto con los datos del CV.
         """
-        if os.path.exists(self.data_file_path):
-            try:
-                with open(self.data_file_path, 'r', encoding='utf-8') as f:
-                    data_dict = json.load(f)
-                    return CVData.from_dict(data_dict)
-            except Exception as e:
-                print(f"Error loading data: {e}")
-                return CVData()
-        return CVData()
-    
+        data_dict = self.load_raw()
+        try:
+            return CVData.from_dict(data_dict)
+        except Exception as e:
+            print(f"Error loading data: {e}")
+            return CVData()
+
     def load_raw(self) -> Dict[str, Any]:
         """
         Carga los datos en formato de diccionario.
-        
+
+        El diccionario retornado es compartido con la caché: no debe
+        modificarse (para cambiar datos, construir uno nuevo y usar save_raw).
+
         Returns:
             Dict: Diccionario con los datos del CV.
         """
-        if os.path.exists(self.data_file_path):
+        with self._lock:
+            # Con un guardado pendiente, la copia en memoria es más reciente que el archivo
+            if self._snapshot is not None and (self.trust_own_writes or self._dirty):
+                self.hits += 1
+                return self._snapshot
+
+            signature = self.backend.signature()
+            if signature is None:
+                return {}
+            if self._snapshot is not None and signature == self._signature:
+                self.hits += 1
+                return self._snapshot
+
+            self.misses += 1
             try:
-                with open(self.data_file_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                start = time.perf_counter()
+                if hasattr(self.backend, 'read_encoded'):
+                    data, encoded = self.backend.read_encoded()
+                else:
+                    data, encoded = self.backend.read(), None
+                self.last_parse_time = time.perf_counter() - start
+                self.parse_time_total += self.last_parse_time
+                record_span('data.read', self.last_parse_time)
             except Exception as e:
                 print(f"Error loading data: {e}")
                 return {}
-        return {}
-    
+
+            self._snapshot = data
+            self._encoded = encoded
+            self._signature = signature
+            self._revision = None
+            return data
+
+    @property
+    def revision(self) -> int:
+        """Revisión de la copia en memoria (0 si aún no se cargó nada)."""
+        with self._lock:
+            if self._snapshot is None:
+                return 0
+            if self._revision is None:
+                self._revision = content_revision(self._snapshot)
+            return self._revision
+
+    def load_with_revision(self) -> Tuple[Dict[str, Any], int]:
+        """
+        Carga los datos junto con su número de revisión.
+
+        Returns:
+            Tupla (diccionario compartido con la caché, revisión).
+        """
+        with self._lock:
+            data = self.load_raw()
+            return data, self.revision
+
+    def load_encoded(self) -> Tuple[bytes, int]:
+        """
+        Carga los datos ya serializados en JSON, junto con su revisión.
+
+        Si la copia en memoria proviene del archivo (o se acaba de escribir)
+        se reutilizan esos bytes; si no, se codifica una vez y se guarda.
+
+        Returns:
+            Tupla (documento JSON en UTF-8, revisión).
+        """
+        with self._lock:
+            data = self.load_raw()
+            if data is not self._snapshot:
+                return codec.dumps(data), 0
+            if self._encoded is None:
+                self._encoded = codec.dumps(data)
+            return self._encoded, self.revision
+
     def save(self, cv_data: CVData) -> bool:
         """
         Guarda los datos del CV en el archivo.
-        
+
         Args:
             cv_data: Objeto CVData a guardar.
-            
+
         Returns:
             bool: True si se guardó correctamente, False en caso contrario.
         """
-        try:
-            with open(self.data_file_path, 'w', encoding='utf-8') as f:
-                json.dump(cv_data.to_dict(), f, indent=4, ensure_ascii=False)
-            return True
-        except Exception as e:
-            print(f"Error saving data: {e}")
-            return False
-    
+        return self.save_raw(cv_data.to_dict())
+
     def save_raw(self, data: Dict[str, Any]) -> bool:
         """
         Guarda datos en formato de diccionario.
-        
+
+        Los datos quedan disponibles de inmediato para load_raw(). Si hay
+        ventana de coalescencia, la escritura a disco se difiere; si la
+        anterior escritura diferida falló, esta se hace de inmediato para
+        reportar el error. Si una escritura inmediata falla, la copia en
+        memoria vuelve a la anterior: no se sirven datos que no se guardaron.
+
         Args:
             data: Diccionario con los datos a guardar.
-            
+
         Returns:
             bool: True si se guardó correctamente, False en caso contrario.
         """
-        try:
-            with open(self.data_file_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=4, ensure_ascii=False)
+        with self._lock:
+            previous = self._snapshot_state()
+            self._set_snapshot(data)
+            if self._schedule_flush():
+                return True
+        if self.flush():
             return True
-        except Exception as e:
-            print(f"Error saving data: {e}")
+        self._rollback(data, previous)
+        return False
+
+    def patch(self, operations: List[Dict[str, Any]], expected_revision: Optional[int] = None,
+              validate: Optional[Callable[[Dict[str, Any]], Any]] = None,
+              with_revision: bool = True) -> Tuple[Dict[str, Any], Optional[int]]:
+        """
+        Aplica operaciones JSON Patch sobre la copia en memoria y las guarda.
+
+        El documento vigente no se modifica: el nuevo comparte con él las
+        partes no tocadas, y solo el resultado validado pasa a ser la copia
+        en memoria. Con varios procesos, la lectura, la comprobación de la
+        revisión y la escritura ocurren bajo el bloqueo entre procesos.
+
+        Args:
+            operations: Operaciones RFC 6902.
+            expected_revision: Revisión sobre la que el cliente calculó el patch
+                (None para aplicarlo sobre la vigente).
+            validate: Función que recibe el documento resultante y lanza una
+                excepción si no es válido.
+            with_revision: Calcular la nueva revisión (con False se evita
+                recorrer el documento completo y se retorna None).
+
+        Returns:
+            Tupla (documento resultante, nueva revisión).
+
+        Raises:
+            RevisionConflictError: Si expected_revision no es la vigente.
+            JsonPatchError: Si el patch no puede aplicarse.
+        """
+        with self._process_lock():
+            with self._lock:
+                current = self.load_raw()
+                if expected_revision is not None and expected_revision != self.revision:
+                    raise RevisionConflictError(expected_revision, self.revision)
+                data = apply_patch(current, operations)
+                if not isinstance(data, dict):
+                    raise ValueError("El documento resultante debe ser un objeto")
+                if validate is not None:
+                    validate(data)
+                if data is current or not operations:
+                    return current, self.revision if with_revision else None
+                previous = self._snapshot_state()
+                self._set_snapshot(data)
+                revision = self.revision if with_revision else None
+                deferred = self._schedule_flush()
+            if not deferred and not self.flush():
+                self._rollback(data, previous)
+                raise OSError("No se pudieron guardar los datos")
+        return data, revision
+
+    def _snapshot_state(self) -> Tuple:
+        """Estado de la copia en memoria, para restaurarlo con _rollback() (requiere el lock)."""
+        return (self._snapshot, self._encoded, self._signature, self._dirty, self._revision)
+
+    def _rollback(self, data: Dict[str, Any], previous: Tuple) -> None:
+        """Descarta data de la copia en memoria tras una escritura fallida (si nadie la reemplazó)."""
+        with self._lock:
+            if self._snapshot is data:
+                self._snapshot, self._encoded, self._signature, self._dirty, self._revision = previous
+
+    def _set_snapshot(self, data: Dict[str, Any]) -> None:
+        """Reemplaza la copia en memoria por un guardado nuevo (requiere el lock)."""
+        self._snapshot = data
+        self._encoded = None
+        self._dirty = True
+        self.saves += 1
+        self._revision = None
+
+    def _schedule_flush(self) -> bool:
+        """
+        Programa la escritura diferida si hay ventana de coalescencia (requiere el lock).
+
+        Returns:
+            bool: True si la escritura quedó diferida, False si debe hacerse ya
+                (sin ventana, o porque la última escritura falló).
+        """
+        if self.coalesce_window <= 0 or self._write_error is not None:
             return False
+        self._start_flush_timer(self.coalesce_window)
+        return True
+
+    def _start_flush_timer(self, delay: float) -> None:
+        """Programa flush() dentro de delay segundos si no hay uno programado (requiere el lock)."""
+        if self._flush_timer is None:
+            self._flush_timer = threading.Timer(delay, self.flush)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+
+    def flush(self) -> bool:
+        """
+        Escribe a disco el último guardado pendiente, si lo hay.
+
+        Si falla, los datos siguen pendientes: con ventana de coalescencia se
+        reintenta solo (esperando cada vez más, hasta 30 s) y el próximo
+        guardado escribe de inmediato para reportar el error.
+
+        Returns:
+            bool: True si no había nada pendiente o se escribió correctamente.
+        """
+        with self._write_lock:
+            with self._lock:
+                if self._flush_timer is not None:
+                    self._flush_timer.cancel()
+                    self._flush_timer = None
+                if not self._dirty:
+                    return True
+                data = self._snapshot
+                self._dirty = False
+
+            try:
+                with span('data.write'):
+                    encoded = self.backend.write(data)
+            except Exception as e:
+                print(f"Error saving data: {e}")
+                with self._lock:
+                    self._write_error = e
+                    self._write_failures += 1
+                    # Conservar los datos en memoria para reintentar en el próximo flush
+                    if self._snapshot is data:
+                        self._dirty = True
+                    if self._dirty and self.coalesce_window > 0:
+                        delay = min(self.coalesce_window * 2 ** self._write_failures, 30.0)
+                        self._start_flush_timer(delay)
+                return False
+
+            with self._lock:
+                self._write_error = None
+                self._write_failures = 0
+                self.disk_writes += 1
+                if self._snapshot is data:
+                    # Lo escrito pasa a ser la copia en memoria sin volver a parsear
+                    self._signature = self.backend.signature()
+                    if isinstance(encoded, bytes):
+                        self._encoded = encoded
+            return True
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Retorna las estadísticas de la caché de lectura.
+
+        Returns:
+            Dict: Aciertos, fallos y tiempo de parseo del archivo.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            stats = {
+                'file': os.path.basename(self.data_file_path),
+                'backend': type(self.backend).__name__,
+                'codec': codec.name,
+                'revision': self.revision,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hitRatio': round(self.hits / lookups, 4) if lookups else 0.0,
+                'parseMsTotal': round(self.parse_time_total * 1000, 3),
+                'lastParseMs': round(self.last_parse_time * 1000, 3),
+                'saves': self.saves,
+                'diskWrites': self.disk_writes,
+                'pendingWrite': self._dirty,
+                'lastWriteError': str(self._write_error) if self._write_error else None
+            }
+        if hasattr(self.backend, 'stats'):
+            stats['storage'] = self.backend.stats()
+        return stats
+
+
+# Escribir los guardados pendientes al cerrar la aplicación
+atexit.register(DataService.flush_all)
@@ -0,0 +1,407 @@
+"""
+Servicio del Registro de Empleos.
+
+Mantiene en memoria índices sobre la lista de empleos para buscar y paginar
+sin recorrerla completa:
+- Índice invertido de palabras de nombreEmpresa y del host de linkEmpleo.
+- Índice de (fecha, id) ordenado, para listar del más reciente al más antiguo.
+- Matriz documento-término de las descripciones, para ordenar los empleos
+  por compatibilidad con un CV (se construye la primera vez que se pide).
+
+Los índices se actualizan por empleo al agregar, modificar o eliminar, y se
+reconstruyen si el documento cambia por otra vía (ej: /save_empleos).
+"""
+import base64
+import re
+import threading
+import time
+import unicodedata
+from bisect import bisect_left, insort
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Set, Tuple
+from urllib.parse import urlsplit
+
+from services.ats_service import ATSScorer, PostingMatrix, TermVector
+from services.data_service import DataService
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+
+# Campos que el cliente puede asignar a un empleo
+EMPLEO_TEXT_FIELDS = ('nombreEmpresa', 'linkEmpleo', 'fecha', 'descripcion')
+
+
+class EmpleoNotFoundError(KeyError):
+    """El empleo pedido no existe."""
+
+
+def normalize(text: str) -> str:
+    """Texto en minúsculas y sin acentos."""
+    decomposed = unicodedata.normalize('NFKD', text.lower())
+    return ''.join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def tokenize(text: str) -> List[str]:
+    """Palabras (letras y números) de un texto normalizado."""
+    return TOKEN_PATTERN.findall(normalize(text))
+
+
+def link_host(link: str) -> str:
+    """Host de un link sin 'www.' (acepta links sin esquema)."""
+    if not link:
+        return ''
+    try:
+        host = urlsplit(link if '://' in link else f"http://{link}").hostname or ''
+    except ValueError:
+        return ''
+    return host[4:] if host.startswith('www.') else host
+
+
+def empleo_tokens(empleo: Dict[str, Any]) -> Set[str]:
+    """Palabras por las que se encuentra un empleo."""
+    tokens = set(tokenize(str(empleo.get('nombreEmpresa') or '')))
+    host = link_host(str(empleo.get('linkEmpleo') or ''))
+    if host:
+        tokens.add(host)
+        tokens.update(tokenize(host))
+    return tokens
+
+
+def empleo_description(empleo: Dict[str, Any]) -> str:
+    """Descripción del puesto de un empleo ('' si no tiene)."""
+    description = empleo.get('descripcion')
+    return description if isinstance(description, str) else ''
+
+
+def encode_cursor(key: Tuple[str, str]) -> str:
+    """Cursor opaco a partir de la clave (fecha, id) del último empleo de una página."""
+    return base64.urlsafe_b64encode(f"{key[0]}\n{key[1]}".encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """
+    Clave (fecha, id) de un cursor.
+
+    Raises:
+        ValueError: Si el cursor no es válido.
+    """
+    try:
+        text = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode('utf-8')
+        fecha, empleo_id = text.split('\n', 1)
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError("Cursor inválido") from None
+    return fecha, empleo_id
+
+
+class EmpleosService:
+    """
+    Búsqueda, paginación y edición por empleo sobre empleos_data.json.
+
+    Las modificaciones pasan por DataService.patch(), así que conservan sus
+    escrituras atómicas y su bloqueo entre procesos.
+    """
+
+    def __init__(self, data_service: DataService, scorer: Optional[ATSScorer] = None):
+        """
+        Inicializa el servicio.
+
+        Args:
+            data_service: Servicio de datos de empleos_data.json.
+            scorer: Evaluador para ordenar por compatibilidad (None: sin rank()).
+        """
+        self.data_service = data_service
+        self._matrix = PostingMatrix(scorer) if scorer is not None else None
+        self._matrix_ready = False
+        self._lock = threading.RLock()
+        self._source: Optional[Dict[str, Any]] = None
+        self._by_id: Dict[str, Dict[str, Any]] = {}
+        self._postings: Dict[str, Set[str]] = {}
+        self._vocabulary: List[str] = []
+        self._dates: List[Tuple[str, str]] = []
+        self.rebuilds = 0
+
+    # --- Índices ---
+
+    @staticmethod
+    def _key(empleo_id: str, empleo: Dict[str, Any]) -> Tuple[str, str]:
+        return (str(empleo.get('fecha') or ''), empleo_id)
+
+    def _index(self, empleo_id: str, empleo: Dict[str, Any]) -> None:
+        self._by_id[empleo_id] = empleo
+        insort(self._dates, self._key(empleo_id, empleo))
+        for token in empleo_tokens(empleo):
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = set()
+                insort(self._vocabulary, token)
+            postings.add(empleo_id)
+
+    def _unindex(self, empleo_id: str) -> None:
+        empleo = self._by_id.pop(empleo_id)
+        key = self._key(empleo_id, empleo)
+        position = bisect_left(self._dates, key)
+        if position < len(self._dates) and self._dates[position] == key:
+            del self._dates[position]
+        for token in empleo_tokens(empleo):
+            postings = self._postings.get(token)
+            if postings is None:
+                continue
+            postings.discard(empleo_id)
+            if not postings:
+                del self._postings[token]
+                del self._vocabulary[bisect_left(self._vocabulary, token)]
+
+    def _sync(self) -> List[Dict[str, Any]]:
+        """Reconstruye los índices si el documento cambió por otra vía (requiere el lock)."""
+        data = self.data_service.load_raw()
+        if data is not self._source:
+            self._by_id = {}
+            self._postings = {}
+            empleos = data.get('empleos') or []
+            for empleo in empleos:
+                if isinstance(empleo, dict):
+                    empleo_id = str(empleo.get('id'))
+                    self._by_id[empleo_id] = empleo
+                    for token in empleo_tokens(empleo):
+                        self._postings.setdefault(token, set()).add(empleo_id)
+            self._vocabulary = sorted(self._postings)
+            self._dates = sorted(self._key(empleo_id, empleo) for empleo_id, empleo in self._by_id.items())
+            self._source = data
+            self.rebuilds += 1
+            if self._matrix_ready:
+                # Solo se vuelven a procesar las descripciones que cambiaron
+                self._sync_matrix()
+        return self._source.get('empleos') or []
+
+    def _sync_matrix(self) -> None:
+        self._matrix.sync({
+            empleo_id: empleo_description(empleo) for empleo_id, empleo in self._by_id.items()
+        })
+        self._matrix_ready = True
+
+    def _matching(self, query: str) -> Optional[Set[str]]:
+        """Ids que contienen (como prefijo) todas las palabras de la consulta; None sin consulta."""
+        terms = tokenize(query)
+        if not terms:
+            return None
+        result: Optional[Set[str]] = None
+        for term in sorted(set(terms), key=len, reverse=True):
+            matches: Set[str] = set()
+            position = bisect_left(self._vocabulary, term)
+            while position < len(self._vocabulary) and self._vocabulary[position].startswith(term):
+                matches |= self._postings[self._vocabulary[position]]
+                position += 1
+            result = matches if result is None else result & matches
+            if not result:
+                break
+        return result
+
+    # --- Consultas ---
+
+    def get(self, empleo_id: str) -> Dict[str, Any]:
+        """
+        Retorna un empleo por su id.
+
+        Raises:
+            EmpleoNotFoundError: Si no existe.
+        """
+        with self._lock:
+            self._sync()
+            empleo = self._by_id.get(str(empleo_id))
+            if empleo is None:
+                raise EmpleoNotFoundError(empleo_id)
+            return empleo
+
+    def search(self, query: str = '', cursor: Optional[str] = None, limit: int = 50) -> Dict[str, Any]:
+        """
+        Busca empleos, del más reciente al más antiguo, por páginas.
+
+        Args:
+            query: Palabras (o comienzos de palabra) del nombre de la empresa o del host del link.
+            cursor: Cursor retornado por la página anterior (None para la primera).
+            limit: Empleos por página.
+
+        Returns:
+            Dict con "empleos", "total" (coincidencias) y "nextCursor" (None en la última página).
+
+        Raises:
+            ValueError: Si el cursor no es válido.
+        """
+        after = decode_cursor(cursor) if cursor else None
+        with self._lock:
+            self._sync()
+            matches = self._matching(query)
+            total = len(self._dates) if matches is None else len(matches)
+
+            keys: List[Tuple[str, str]] = []
+            if matches is not None and len(matches) * 8 < len(self._dates):
+                # Pocas coincidencias: ordenar solo esas
+                ordered = sorted(self._key(empleo_id, self._by_id[empleo_id]) for empleo_id in matches)
+                end = len(ordered) if after is None else bisect_left(ordered, after)
+                keys = ordered[max(0, end - limit - 1):end][::-1]
+            else:
+                # Recorrer el índice de fechas desde el cursor hacia atrás
+                position = len(self._dates) if after is None else bisect_left(self._dates, after)
+                while position > 0 and len(keys) <= limit:
+                    position -= 1
+                    key = self._dates[position]
+                    if matches is None or key[1] in matches:
+                        keys.append(key)
+
+            page = keys[:limit]
+            return {
+                'empleos': [self._by_id[key[1]] for key in page],
+                'total': total,
+                'nextCursor': encode_cursor(page[-1]) if len(keys) > limit else None
+            }
+
+    def rank(self, query: TermVector, limit: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Ordena los empleos con descripción por compatibilidad con un vector de CV.
+
+        Args:
+            query: Vector del CV (ver CVVectors.query).
+            limit: Máximo de empleos a retornar (None: todos).
+
+        Returns:
+            Dict con "empleos" (lista de {"empleo", "score", "similarity"}),
+            "total" (empleos puntuados) y "sinDescripcion".
+
+        Raises:
+            RuntimeError: Si el servicio se creó sin evaluador.
+        """
+        if self._matrix is None:
+            raise RuntimeError("EmpleosService sin evaluador: no puede ordenar")
+        with self._lock:
+            self._sync()
+            if not self._matrix_ready:
+                self._sync_matrix()
+            ranked = self._matrix.rank(query)
+            return {
+                'empleos': [
+                    {'empleo': self._by_id[item['key']], 'score': item['score'], 'similarity': item['similarity']}
+                    for item in (ranked if limit is None else ranked[:limit])
+                ],
+                'total': len(ranked),
+                'sinDescripcion': len(self._by_id) - len(ranked)
+            }
+
+    # --- Modificaciones ---
+
+    @staticmethod
+    def _validate(empleo: Dict[str, Any]) -> None:
+        for field in EMPLEO_TEXT_FIELDS:
+            if field in empleo and not isinstance(empleo[field], str):
+                raise ValueError(f"'{field}' debe ser texto")
+        if not str(empleo.get('nombreEmpresa') or '').strip():
+            raise ValueError("Falta el nombre de la empresa")
+
+    def _apply(self, operations: List[Dict[str, Any]], remove: Optional[str] = None,
+               add: Optional[Tuple[str, Dict[str, Any]]] = None) -> None:
+        """Guarda el patch y actualiza los índices por empleo (requiere el lock)."""
+        data, _ = self.data_service.patch(operations, with_revision=False)
+        if DataService._multiprocess:
+            # Otro proceso pudo modificar el documento: reconstruir en la próxima consulta
+            self._source = None
+            return
+        if remove is not None:
+            self._unindex(remove)
+        if add is not None:
+            self._index(*add)
+        if self._matrix_ready:
+            if add is not None:
+                self._matrix.set(add[0], empleo_description(add[1]))
+            elif remove is not None:
+                self._matrix.remove(remove)
+        self._source = data
+
+    def _position(self, empleos: List[Dict[str, Any]], empleo_id: str) -> int:
+        empleo = self._by_id.get(empleo_id)
+        if empleo is None:
+            raise EmpleoNotFoundError(empleo_id)
+        for position, item in enumerate(empleos):
+            if item is empleo:
+                return position
+        raise EmpleoNotFoundError(empleo_id)
+
+    def add(self, fields: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Agrega un empleo al final de la lista.
+
+        Si no trae id se asigna uno (milisegundos desde 1970, como el cliente)
+        y si no trae fecha se usa la actual.
+
+        Args:
+            fields: Datos del empleo (nombreEmpresa obligatorio).
+
+        Returns:
+            Dict: Empleo guardado.
+
+        Raises:
+            ValueError: Si los datos no son válidos o el id ya existe.
+        """
+        empleo = dict(fields)
+        self._validate(empleo)
+        empleo.setdefault('linkEmpleo', '')
+        if not empleo.get('fecha'):
+            empleo['fecha'] = datetime.now(timezone.utc).isoformat(timespec='milliseconds').replace('+00:00', 'Z')
+        with self._lock:
+            empleos = self._sync()
+            if empleo.get('id') is None:
+                empleo_id = int(time.time() * 1000)
+                while str(empleo_id) in self._by_id:
+                    empleo_id += 1
+                empleo['id'] = empleo_id
+            elif str(empleo['id']) in self._by_id:
+                raise ValueError(f"Ya existe un empleo con id {empleo['id']}")
+            if 'empleos' in self._source:
+                operations = [{'op': 'add', 'path': '/empleos/-', 'value': empleo}]
+            else:
+                operations = [{'op': 'add', 'path': '/empleos', 'value': empleos + [empleo]}]
+            self._apply(operations, add=(str(empleo['id']), empleo))
+        return empleo
+
+    def update(self, empleo_id: str, fields: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Modifica los campos indicados de un empleo (el id no cambia).
+
+        Returns:
+            Dict: Empleo actualizado.
+
+        Raises:
+            EmpleoNotFoundError: Si no existe.
+            ValueError: Si los datos resultantes no son válidos.
+        """
+        empleo_id = str(empleo_id)
+        with self._lock:
+            empleos = self._sync()
+            position = self._position(empleos, empleo_id)
+            empleo = dict(empleos[position], **{k: v for k, v in fields.items() if k != 'id'})
+            self._validate(empleo)
+            self._apply([{'op': 'replace', 'path': f"/empleos/{position}", 'value': empleo}],
+                        remove=empleo_id, add=(empleo_id, empleo))
+        return empleo
+
+    def delete(self, empleo_id: str) -> None:
+        """
+        Elimina un empleo.
+
+        Raises:
+            EmpleoNotFoundError: Si no existe.
+        """
+        empleo_id = str(empleo_id)
+        with self._lock:
+            empleos = self._sync()
+            position = self._position(empleos, empleo_id)
+            self._apply([{'op': 'remove', 'path': f"/empleos/{position}"}], remove=empleo_id)
+
+    def stats(self) -> Dict[str, Any]:
+        """Retorna el tamaño de los índices."""
+        with self._lock:
+            stats = {
+                'empleos': len(self._by_id),
+                'tokens': len(self._vocabulary),
+                'rebuilds': self.rebuilds
+            }
+            if self._matrix_ready:
+                stats['matrix'] = self._matrix.stats()
+            return stats
@@ -0,0 +1,345 @@
+"""
+Almacenamiento de empleos en un diario (journal) de solo agregado.
+
+El documento se guarda como una instantánea (empleos_data.json, el mismo
+formato de siempre) más un archivo JSON Lines con los cambios posteriores
+(empleos_data.jsonl): un evento "add", "update" o "delete" por línea. Agregar
+un empleo cuesta una línea en lugar de reescribir toda la lista.
+
+Al leer se aplica el diario sobre la instantánea. Cuando el diario supera
+el umbral configurado, una compactación en segundo plano reescribe la
+instantánea y vacía el diario. Aplicar un evento dos veces deja el mismo
+resultado, así que una compactación interrumpida no pierde ni duplica datos.
+"""
+import os
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Tuple
+
+from services.codec import codec
+from services.data_service import DataService, JSONFileBackend
+
+try:
+    import fcntl
+except ImportError:  # Windows: sin bloqueo entre procesos
+    fcntl = None
+
+JOURNAL_LIST_KEY = 'empleos'
+
+
+def _item_key(item: Any) -> Optional[str]:
+    return str(item.get('id')) if isinstance(item, dict) and item.get('id') is not None else None
+
+
+def diff_events(old: Dict[str, Any], new: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+    """
+    Calcula los eventos que transforman old en new.
+
+    Solo se pueden expresar eliminaciones, cambios en el lugar y agregados
+    al final de la lista, identificados por "id". Para cualquier otro
+    cambio (reordenar, ids repetidos o faltantes, otras claves del
+    documento) retorna None y debe reescribirse la instantánea.
+
+    Args:
+        old: Documento anterior.
+        new: Documento nuevo.
+
+    Returns:
+        Lista de eventos, o None si no se puede expresar como eventos.
+    """
+    if old.keys() != new.keys() or any(old[key] != new[key] for key in old if key != JOURNAL_LIST_KEY):
+        return None
+    old_items = old.get(JOURNAL_LIST_KEY) or []
+    new_items = new.get(JOURNAL_LIST_KEY) or []
+    if not isinstance(old_items, list) or not isinstance(new_items, list):
+        return None
+
+    old_by_key: Dict[str, Any] = {}
+    for item in old_items:
+        key = _item_key(item)
+        if key is None or key in old_by_key:
+            return None
+        old_by_key[key] = item
+    new_keys = []
+    for item in new_items:
+        key = _item_key(item)
+        if key is None:
+            return None
+        new_keys.append(key)
+    if len(set(new_keys)) != len(new_keys):
+        return None
+
+    present = set(new_keys)
+    events: List[Dict[str, Any]] = [
+        {'op': 'delete', 'id': key} for key in old_by_key if key not in present
+    ]
+    # Los que ya existían deben conservar su orden y estar antes que los nuevos
+    kept = [key for key in old_by_key if key in present]
+    if new_keys[:len(kept)] != kept:
+        return None
+    for key, item in zip(kept, new_items):
+        previous = old_by_key[key]
+        if item is not previous and item != previous:
+            events.append({'op': 'update', 'item': item})
+    for item in new_items[len(kept):]:
+        events.append({'op': 'add', 'item': item})
+    return events
+
+
+def replay(data: Dict[str, Any], events: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Aplica eventos sobre un documento (sin modificar el original).
+
+    "add" y "update" reemplazan el elemento con el mismo id o lo agregan al
+    final; "delete" ignora ids inexistentes.
+
+    Returns:
+        Documento resultante.
+    """
+    if not events:
+        return data
+    items = list(data.get(JOURNAL_LIST_KEY) or [])
+    positions = {_item_key(item): index for index, item in enumerate(items)}
+    deleted = False
+    for event in events:
+        op = event.get('op')
+        if op in ('add', 'update'):
+            item = event['item']
+            key = _item_key(item)
+            position = positions.get(key)
+            if position is None:
+                positions[key] = len(items)
+                items.append(item)
+            else:
+                items[position] = item
+        elif op == 'delete':
+            position = positions.pop(str(event.get('id')), None)
+            if position is not None:
+                items[position] = None
+                deleted = True
+    if deleted:
+        items = [item for item in items if item is not None]
+    return dict(data, **{JOURNAL_LIST_KEY: items})
+
+
+class JournalBackend:
+    """
+    Backend de DataService con instantánea JSON más diario de eventos.
+
+    write() compara el documento nuevo con el último leído o escrito y
+    agrega solo los eventos; si el cambio no puede expresarse como eventos,
+    reescribe la instantánea.
+    """
+
+    def __init__(self, data_file_path: str, compact_bytes: int = 1024 * 1024, background: bool = True):
+        """
+        Inicializa el backend.
+
+        Args:
+            data_file_path: Ruta de la instantánea JSON (el diario usa la extensión .jsonl).
+            compact_bytes: Tamaño del diario a partir del cual se compacta
+                (0 no agrega al diario: cada escritura reescribe la instantánea).
+            background: Compactar en un hilo aparte (False compacta durante la escritura).
+        """
+        self.snapshot = JSONFileBackend(data_file_path)
+        self.data_file_path = data_file_path
+        self.journal_path = f"{os.path.splitext(data_file_path)[0]}.jsonl"
+        self.compact_bytes = compact_bytes
+        self.background = background
+        self._lock = threading.RLock()
+        self._state: Optional[Dict[str, Any]] = None
+        # Ids de la lista de _state (se calculan al necesitarlos)
+        self._keys: Optional[set] = None
+        # Firma de los archivos tal como los dejó la última lectura o escritura propia
+        self._known: Optional[Tuple[Any, Any]] = None
+        # Firma tras una compactación propia -> firma equivalente anterior (mismo contenido)
+        self._aliases: Dict[Any, Any] = {}
+        self._compacting = False
+        self.appends = 0
+        self.events_written = 0
+        self.compactions = 0
+        self.replayed = 0
+
+    def _physical_signature(self) -> Optional[Tuple[Any, Any]]:
+        journal = None
+        try:
+            stat = os.stat(self.journal_path)
+            journal = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            pass
+        snapshot = self.snapshot.signature()
+        if snapshot is None and journal is None:
+            return None
+        return (snapshot, journal)
+
+    def signature(self) -> Optional[Tuple[Any, Any]]:
+        """Firma de la instantánea y del diario (sin cambios tras una compactación propia)."""
+        with self._lock:
+            signature = self._physical_signature()
+            return self._aliases.get(signature, signature)
+
+    def read(self) -> Dict[str, Any]:
+        """Lee la instantánea y le aplica el diario."""
+        with self._lock:
+            data = self.snapshot.read() if os.path.exists(self.data_file_path) else {}
+            events = self._read_journal()
+            self.replayed = len(events)
+            data = replay(data, events)
+            self._state = data
+            self._keys = None
+            self._known = self._physical_signature()
+            return data
+
+    def _read_journal(self) -> List[Dict[str, Any]]:
+        try:
+            with open(self.journal_path, 'rb') as f:
+                lines = f.read().splitlines()
+        except FileNotFoundError:
+            return []
+        events = []
+        for number, line in enumerate(lines, 1):
+            if not line.strip():
+                continue
+            try:
+                events.append(codec.loads(line))
+            except ValueError:
+                # Una línea incompleta al final es una escritura interrumpida
+                print(f"Línea {number} inválida en {self.journal_path}; se omite")
+        return events
+
+    def write(self, data: Dict[str, Any]) -> None:
+        """
+        Agrega al diario los cambios respecto del último estado, o reescribe la instantánea.
+
+        Con varios procesos, DataService.patch() ya llama a este método
+        dentro del bloqueo entre procesos.
+        """
+        with self._lock:
+            events = self._events(data) if self.compact_bytes > 0 else None
+            if events is None:
+                self._write_snapshot(data)
+                return
+            if events:
+                self._append(events)
+            self._state = data
+            if self._keys is not None and any(event['op'] != 'update' for event in events):
+                self._keys.update(_item_key(event['item']) for event in events if event['op'] == 'add')
+                self._keys.difference_update(str(event['id']) for event in events if event['op'] == 'delete')
+            if self._journal_size() < self.compact_bytes or self._compacting:
+                return
+            if not self.background:
+                self._compact()
+                return
+            self._compacting = True
+        threading.Thread(target=self.compact, name='journal-compaction', daemon=True).start()
+
+    def _events(self, data: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+        """
+        Eventos desde _state hasta data (requiere el lock).
+
+        Resuelve sin recorrer los elementos en Python los casos habituales,
+        en los que los elementos sin cambios son los mismos objetos (así los
+        deja DataService.patch()): agregar al final y modificar en el lugar.
+        """
+        old = self._state
+        if old is None:
+            return None
+        if old.keys() != data.keys() or any(old[key] is not data[key] for key in old if key != JOURNAL_LIST_KEY):
+            return diff_events(old, data)
+        old_items = old.get(JOURNAL_LIST_KEY) or []
+        new_items = data.get(JOURNAL_LIST_KEY) or []
+        if not isinstance(old_items, list) or not isinstance(new_items, list):
+            return None
+
+        if len(new_items) >= len(old_items) and new_items[:len(old_items)] == old_items:
+            added = new_items[len(old_items):]
+            if self._keys is None:
+                self._keys = {_item_key(item) for item in old_items}
+            added_keys = [_item_key(item) for item in added]
+            if None in added_keys or len(set(added_keys)) != len(added_keys) or not self._keys.isdisjoint(added_keys):
+                return diff_events(old, data)
+            return [{'op': 'add', 'item': item} for item in added]
+
+        if len(new_items) == len(old_items):
+            events = []
+            for previous, item in zip(old_items, new_items):
+                if item is not previous and item != previous:
+                    if _item_key(item) is None or _item_key(item) != _item_key(previous):
+                        return diff_events(old, data)
+                    events.append({'op': 'update', 'item': item})
+            return events
+        return diff_events(old, data)
+
+    def _append(self, events: List[Dict[str, Any]]) -> None:
+        payload = b''.join(codec.dumps(event) + b'\n' for event in events)
+        with open(self.journal_path, 'ab') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        self._known = self._physical_signature()
+        self.appends += 1
+        self.events_written += len(events)
+
+    def _journal_size(self) -> int:
+        try:
+            return os.path.getsize(self.journal_path)
+        except OSError:
+            return 0
+
+    def _write_snapshot(self, data: Dict[str, Any]) -> None:
+        """Reescribe la instantánea y vacía el diario (requiere el lock)."""
+        self.snapshot.write(data)
+        try:
+            os.remove(self.journal_path)
+        except FileNotFoundError:
+            pass
+        self._state = data
+        self._keys = None
+        self._known = self._physical_signature()
+
+    def _compact(self) -> None:
+        """Compacta conservando la firma que ya conoce DataService (requiere el lock)."""
+        before = self.signature()
+        if self._physical_signature() != self._known:
+            # Otro proceso escribió después: partir de lo que hay en disco
+            self.read()
+        self._write_snapshot(self._state)
+        self._aliases = {self._physical_signature(): before}
+        self.compactions += 1
+
+    def compact(self) -> None:
+        """Reescribe la instantánea con el estado actual y vacía el diario."""
+        try:
+            with self._file_lock():
+                with self._lock:
+                    if self._state is not None and self._journal_size() > 0:
+                        self._compact()
+        except Exception as e:
+            print(f"Error compacting journal: {e}")
+        finally:
+            self._compacting = False
+
+    @contextmanager
+    def _file_lock(self):
+        """Bloqueo entre procesos (el mismo archivo que usa DataService) si está habilitado."""
+        if fcntl is None or not DataService._multiprocess:
+            yield
+            return
+        with open(f"{self.data_file_path}.lock", 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def stats(self) -> Dict[str, Any]:
+        """Retorna el tamaño del diario y los contadores de escrituras y compactaciones."""
+        with self._lock:
+            return {
+                'journalBytes': self._journal_size(),
+                'compactBytes': self.compact_bytes,
+                'appends': self.appends,
+                'eventsWritten': self.events_written,
+                'eventsReplayed': self.replayed,
+                'compactions': self.compactions
+            }
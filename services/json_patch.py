@@ -0,0 +1,314 @@
+"""
+Aplicación de JSON Patch (RFC 6902).
+Aplica operaciones sobre documentos JSON copiando solo los contenedores que cambian.
+"""
+from typing import Any, Dict, List, Tuple
+
+
+class JsonPatchError(ValueError):
+    """Operación de patch inválida o que no puede aplicarse al documento."""
+
+
+def parse_pointer(pointer: str) -> List[str]:
+    """
+    Convierte un JSON Pointer (RFC 6901) en su lista de claves.
+
+    Args:
+        pointer: Ruta tipo "/experience/0/company".
+
+    Returns:
+        Lista de claves sin escapar.
+    """
+    if pointer == '':
+        return []
+    if not isinstance(pointer, str) or not pointer.startswith('/'):
+        raise JsonPatchError(f"Ruta inválida: {pointer!r}")
+    return [part.replace('~1', '/').replace('~0', '~') for part in pointer[1:].split('/')]
+
+
+def escape_pointer_part(key: Any) -> str:
+    """Escapa una clave para usarla dentro de un JSON Pointer."""
+    return str(key).replace('~', '~0').replace('/', '~1')
+
+
+def _list_index(container: list, key: str, allow_end: bool = False) -> int:
+    """Convierte una clave en índice de lista validando el rango."""
+    if allow_end and key == '-':
+        return len(container)
+    if not key.isdigit() or (len(key) > 1 and key.startswith('0')):
+        raise JsonPatchError(f"Índice de lista inválido: {key!r}")
+    index = int(key)
+    limit = len(container) + (1 if allow_end else 0)
+    if index >= limit:
+        raise JsonPatchError(f"Índice fuera de rango: {index}")
+    return index
+
+
+def _get(doc: Any, parts: List[str]) -> Any:
+    """Retorna el valor en la ruta indicada."""
+    current = doc
+    for part in parts:
+        if isinstance(current, dict):
+            if part not in current:
+                raise JsonPatchError(f"No existe la clave {part!r}")
+            current = current[part]
+        elif isinstance(current, list):
+            current = current[_list_index(current, part)]
+        else:
+            raise JsonPatchError(f"No se puede acceder a {part!r} en un valor escalar")
+    return current
+
+
+def _copy_path(doc: Any, parts: List[str]) -> Tuple[Any, Any]:
+    """
+    Copia superficialmente los contenedores a lo largo de la ruta.
+
+    El resto del documento se comparte con el original, que nunca se modifica.
+
+    Returns:
+        Tupla (nueva raíz, contenedor padre del último elemento de la ruta).
+    """
+    root = _shallow_copy(doc)
+    parent = root
+    for part in parts[:-1]:
+        if isinstance(parent, dict):
+            if part not in parent:
+                raise JsonPatchError(f"No existe la clave {part!r}")
+            child = _shallow_copy(parent[part])
+            parent[part] = child
+        elif isinstance(parent, list):
+            index = _list_index(parent, part)
+            child = _shallow_copy(parent[index])
+            parent[index] = child
+        else:
+            raise JsonPatchError(f"No se puede acceder a {part!r} en un valor escalar")
+        parent = child
+    return root, parent
+
+
+def _shallow_copy(value: Any) -> Any:
+    if isinstance(value, dict):
+        return dict(value)
+    if isinstance(value, list):
+        return list(value)
+    return value
+
+
+def _add(doc: Any, parts: List[str], value: Any) -> Any:
+    if not parts:
+        return value
+    root, parent = _copy_path(doc, parts)
+    key = parts[-1]
+    if isinstance(parent, dict):
+        parent[key] = value
+    elif isinstance(parent, list):
+        parent.insert(_list_index(parent, key, allow_end=True), value)
+    else:
+        raise JsonPatchError(f"No se puede agregar {key!r} a un valor escalar")
+    return root
+
+
+def _remove(doc: Any, parts: List[str]) -> Any:
+    if not parts:
+        raise JsonPatchError("No se puede eliminar la raíz del documento")
+    root, parent = _copy_path(doc, parts)
+    key = parts[-1]
+    if isinstance(parent, dict):
+        if key not in parent:
+            raise JsonPatchError(f"No existe la clave {key!r}")
+        del parent[key]
+    elif isinstance(parent, list):
+        del parent[_list_index(parent, key)]
+    else:
+        raise JsonPatchError(f"No se puede eliminar {key!r} de un valor escalar")
+    return root
+
+
+def _replace(doc: Any, parts: List[str], value: Any) -> Any:
+    if not parts:
+        return value
+    root, parent = _copy_path(doc, parts)
+    key = parts[-1]
+    if isinstance(parent, dict):
+        if key not in parent:
+            raise JsonPatchError(f"No existe la clave {key!r}")
+        parent[key] = value
+    elif isinstance(parent, list):
+        parent[_list_index(parent, key)] = value
+    else:
+        raise JsonPatchError(f"No se puede reemplazar {key!r} en un valor escalar")
+    return root
+
+
+def apply_patch(doc: Any, operations: List[Dict[str, Any]]) -> Any:
+    """
+    Aplica una lista de operaciones JSON Patch.
+
+    El documento original no se modifica: el resultado comparte con él
+    todas las partes que no fueron tocadas por el patch.
+
+    Args:
+        doc: Documento JSON original.
+        operations: Operaciones RFC 6902 (add, remove, replace, move, copy, test).
+
+    Returns:
+        Nuevo documento con las operaciones aplicadas.
+
+    Raises:
+        JsonPatchError: Si alguna operación es inválida o falla.
+    """
+    if not isinstance(operations, list):
+        raise JsonPatchError("El patch debe ser una lista de operaciones")
+
+    result = doc
+    for number, operation in enumerate(operations):
+        if not isinstance(operation, dict) or 'op' not in operation or 'path' not in operation:
+            raise JsonPatchError(f"Operación #{number}: se requieren 'op' y 'path'")
+        op = operation['op']
+        parts = parse_pointer(operation['path'])
+        try:
+            if op == 'add':
+                result = _add(result, parts, operation['value'])
+            elif op == 'remove':
+                result = _remove(result, parts)
+            elif op == 'replace':
+                result = _replace(result, parts, operation['value'])
+            elif op == 'move':
+                source = parse_pointer(operation['from'])
+                if parts[:len(source)] == source and len(parts) > len(source):
+                    raise JsonPatchError("No se puede mover un valor dentro de sí mismo")
+                value = _get(result, source)
+                result = _add(_remove(result, source), parts, value)
+            elif op == 'copy':
+                value = _get(result, parse_pointer(operation['from']))
+                result = _add(result, parts, value)
+            elif op == 'test':
+                if _get(result, parts) != operation['value']:
+                    raise JsonPatchError(f"La prueba falló en {operation['path']!r}")
+            else:
+                raise JsonPatchError(f"Operación desconocida: {op!r}")
+        except KeyError as e:
+            raise JsonPatchError(f"Operación #{number}: falta el campo {e.args[0]!r}")
+        except JsonPatchError as e:
+            raise JsonPatchError(f"Operación #{number} ({op} {operation['path']}): {e}")
+    return result
+
+
+def changes_to_operations(changes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Convierte un diff por campos ({"campo": nuevo_valor}) en operaciones JSON Patch.
+
+    Un valor None elimina el campo.
+
+    Args:
+        changes: Campos de primer nivel modificados.
+
+    Returns:
+        Lista de operaciones 'add'/'remove'.
+    """
+    if not isinstance(changes, dict):
+        raise JsonPatchError("'changes' debe ser un objeto")
+    operations = []
+    for key, value in changes.items():
+        path = '/' + escape_pointer_part(key)
+        if value is None:
+            operations.append({'op': 'remove', 'path': path})
+        else:
+            operations.append({'op': 'add', 'path': path, 'value': value})
+    return operations
+
+
+# Campos de un elemento de lista que se verifican para identificarlo (ver diff_operations)
+IDENTITY_FIELDS = 2
+IDENTITY_MAX_LENGTH = 200
+
+
+def _identity_tests(old: Any, new: Any, path: str) -> List[Dict[str, Any]]:
+    """
+    Operaciones 'test' que identifican un elemento de lista por su contenido.
+
+    Usa los primeros campos escalares cortos que no cambian (ej: "position" y
+    "duration" de una experiencia), así el 'test' es pequeño y los cambios
+    del resto del elemento en el original no lo invalidan.
+    """
+    if not isinstance(old, dict) or not isinstance(new, dict):
+        return []
+    tests = []
+    for key, value in old.items():
+        if len(tests) >= IDENTITY_FIELDS:
+            break
+        if isinstance(value, dict) or isinstance(value, list) or key not in new or new[key] != value:
+            continue
+        if isinstance(value, str) and len(value) > IDENTITY_MAX_LENGTH:
+            continue
+        tests.append({'op': 'test', 'path': f"{path}/{escape_pointer_part(key)}", 'value': value})
+    return tests
+
+
+def _leaf_tests(old: Any, operations: List[Dict[str, Any]], path: str) -> List[Dict[str, Any]]:
+    """Operaciones 'test' con el valor original de cada ruta que se reemplaza o elimina."""
+    tests = []
+    for operation in operations:
+        if operation['op'] in ('replace', 'remove'):
+            value = _get(old, parse_pointer(operation['path'][len(path):]))
+            tests.append({'op': 'test', 'path': operation['path'], 'value': value})
+    return tests
+
+
+def diff_operations(old: Any, new: Any, path: str = '', guarded: bool = False) -> List[Dict[str, Any]]:
+    """
+    Calcula las operaciones JSON Patch que transforman old en new.
+
+    Recorre los objetos clave por clave y las listas del mismo largo
+    elemento por elemento, de modo que las partes iguales no aparecen en
+    el resultado. Las listas de distinto largo, o con más de la mitad de
+    sus elementos cambiados (ej: reordenadas), se reemplazan completas.
+
+    Las operaciones dentro de un elemento de lista usan su posición, que
+    deja de ser válida si old se reordena. Por eso van precedidas de
+    'test' que identifican el elemento: sus campos escalares que no
+    cambian o, si no tiene, el valor original de cada ruta modificada.
+    Aplicadas sobre una versión de old donde esa posición tiene otro
+    elemento fallan en lugar de modificarlo; los demás cambios de ese
+    elemento en old se conservan.
+
+    Args:
+        old: Documento original.
+        new: Documento modificado.
+        path: JSON Pointer de ambos valores dentro del documento.
+        guarded: Si path ya está dentro de un elemento de lista verificado.
+
+    Returns:
+        Lista de operaciones 'test'/'add'/'remove'/'replace'.
+    """
+    if old is new:
+        return []
+    if isinstance(old, dict) and isinstance(new, dict):
+        operations = []
+        for key, value in old.items():
+            child = f"{path}/{escape_pointer_part(key)}"
+            if key not in new:
+                operations.append({'op': 'remove', 'path': child})
+            else:
+                operations.extend(diff_operations(value, new[key], child, guarded))
+        for key, value in new.items():
+            if key not in old:
+                operations.append({'op': 'add', 'path': f"{path}/{escape_pointer_part(key)}", 'value': value})
+        return operations
+    if isinstance(old, list) and isinstance(new, list) and len(old) == len(new):
+        item_operations = [
+            (index, a, b, diff_operations(a, b, f"{path}/{index}", True))
+            for index, (a, b) in enumerate(zip(old, new))
+        ]
+        changed = sum(1 for *_, operations in item_operations if operations)
+        if changed * 2 <= len(old):
+            result = []
+            for index, a, b, operations in item_operations:
+                if operations and not guarded:
+                    item_path = f"{path}/{index}"
+                    result.extend(_identity_tests(a, b, item_path) or _leaf_tests(a, operations, item_path))
+                result.extend(operations)
+            return result
+    elif type(old) is type(new) and old == new:
+        return []
+    return [{'op': 'replace', 'path': path, 'value': new}]
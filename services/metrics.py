@@ -0,0 +1,216 @@
+"""
+Métricas de rendimiento.
+
+Histogramas de latencia (peticiones HTTP y tramos internos como el parseo
+del CV, cada sección del PDF o las lecturas y escrituras de datos) que se
+exponen en formato de texto de Prometheus.
+
+Los tramos medidos durante una petición se acumulan además en una lista
+por petición, usada para el encabezado Server-Timing.
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Límites superiores (segundos) de los buckets por defecto
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Tramos de la petición en curso: lista de (nombre, segundos), o None fuera de una petición
+_request_spans: ContextVar[Optional[List[Tuple[str, float]]]] = ContextVar('request_spans', default=None)
+
+
+def _escape_label(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    """Histograma acumulativo con etiquetas, seguro entre hilos."""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        """
+        Inicializa el histograma.
+
+        Args:
+            name: Nombre de la métrica (ej: "cv_http_request_duration_seconds").
+            documentation: Descripción para la línea HELP.
+            labelnames: Nombres de las etiquetas.
+            buckets: Límites superiores de los buckets, en orden creciente.
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        # etiquetas -> [conteos por bucket (no acumulados) + desbordados, suma, total]
+        self._series: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        """
+        Registra una observación.
+
+        Args:
+            value: Valor observado (segundos).
+            labels: Valores de las etiquetas, en el orden de labelnames.
+        """
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def snapshot(self) -> Dict[Tuple[str, ...], Tuple[List[int], float, int]]:
+        """Copia de las series: etiquetas -> (conteos por bucket, suma, total)."""
+        with self._lock:
+            return {labels: (list(counts), total, count) for labels, (counts, total, count) in self._series.items()}
+
+    def clear(self) -> None:
+        """Descarta todas las observaciones."""
+        with self._lock:
+            self._series.clear()
+
+    def render(self) -> List[str]:
+        """Líneas del histograma en formato de texto de Prometheus."""
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for labels, (counts, total, count) in sorted(self.snapshot().items()):
+            pairs = [f'{name}="{_escape_label(value)}"' for name, value in zip(self.labelnames, labels)]
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                label_text = ','.join(pairs + [f'le="{_format_value(bound)}"'])
+                lines.append(f"{self.name}_bucket{{{label_text}}} {cumulative}")
+            suffix = f"{{{','.join(pairs)}}}" if pairs else ''
+            lines.append(f"{self.name}_sum{suffix} {_format_value(total)}")
+            lines.append(f"{self.name}_count{suffix} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Conjunto de métricas que se exponen juntas en /metrics."""
+
+    def __init__(self):
+        self._metrics: Dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        """Crea (o retorna, si ya existe) un histograma registrado."""
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = Histogram(name, documentation, labelnames, buckets)
+            return metric
+
+    def render(self) -> str:
+        """Todas las métricas en formato de texto de Prometheus (versión 0.0.4)."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def clear(self) -> None:
+        """Descarta las observaciones de todas las métricas."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            metric.clear()
+
+
+registry = MetricsRegistry()
+
+request_latency = registry.histogram(
+    'cv_http_request_duration_seconds',
+    'Duración de las peticiones HTTP.',
+    ('method', 'endpoint', 'status')
+)
+span_latency = registry.histogram(
+    'cv_span_duration_seconds',
+    'Duración de los tramos internos (parseo, secciones del PDF, E/S de datos).',
+    ('span',)
+)
+
+
+def start_request() -> object:
+    """
+    Empieza a acumular los tramos de la petición en curso.
+
+    Returns:
+        Token para end_request().
+    """
+    return _request_spans.set([])
+
+
+def end_request(token: object) -> List[Tuple[str, float]]:
+    """
+    Termina la acumulación iniciada con start_request().
+
+    Returns:
+        Lista de (nombre del tramo, segundos) medidos durante la petición.
+    """
+    spans = _request_spans.get() or []
+    _request_spans.reset(token)
+    return spans
+
+
+def record_span(name: str, seconds: float) -> None:
+    """Registra un tramo ya medido."""
+    span_latency.observe(seconds, name)
+    spans = _request_spans.get()
+    if spans is not None:
+        spans.append((name, seconds))
+
+
+@contextmanager
+def span(name: str):
+    """
+    Mide la duración de un bloque como tramo interno.
+
+    Args:
+        name: Nombre del tramo (ej: "pdf.doc_build").
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_span(name, time.perf_counter() - start)
+
+
+def server_timing_header(spans: List[Tuple[str, float]], total: float) -> str:
+    """
+    Construye el valor del encabezado Server-Timing.
+
+    Los tramos con el mismo nombre se suman (ej: varias lecturas de datos).
+
+    Args:
+        spans: Tramos de la petición.
+        total: Duración total de la petición (segundos).
+
+    Returns:
+        str: Ej. 'total;dur=12.5, cv.from_dict;dur=0.1'.
+    """
+    durations: Dict[str, float] = {}
+    counts: Dict[str, int] = {}
+    for name, seconds in spans:
+        durations[name] = durations.get(name, 0.0) + seconds
+        counts[name] = counts.get(name, 0) + 1
+    entries = [f"total;dur={total * 1000:.2f}"]
+    for name, seconds in durations.items():
+        entry = f"{name};dur={seconds * 1000:.2f}"
+        if counts[name] > 1:
+            entry += f';desc="x{counts[name]}"'
+        entries.append(entry)
+    return ", ".join(entries)
@@ -0,0 +1,241 @@
+"""
+Caché de PDFs generados.
+Evita reconstruir documentos idénticos guardando el resultado por su hash de contenido.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Tuple
+
+# Incrementar cuando cambie el diseño del PDF para invalidar las entradas existentes
+RENDER_VERSION = 1
+
+
+def make_cache_key(payload: Dict[str, Any]) -> str:
+    """
+    Calcula el hash canónico de un payload de renderizado.
+
+    Args:
+        payload: Diccionario serializable con todo lo que afecta al PDF.
+
+    Returns:
+        str: Hash SHA-256 hexadecimal.
+    """
+    canonical = json.dumps(
+        {'v': RENDER_VERSION, 'payload': payload},
+        sort_keys=True,
+        separators=(',', ':'),
+        ensure_ascii=False
+    )
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+@dataclass
+class PDFRenderResult:
+    """Resultado de un renderizado (posiblemente servido desde caché)."""
+    key: str
+    data: bytes
+    cached: bool
+    # Secciones construidas de nuevo (None si el PDF provino de la caché)
+    sections_rebuilt: Optional[List[str]] = None
+    # Perfil guardado del render (ver services.profiling)
+    profile_path: Optional[str] = None
+
+
+class PDFOutputCache:
+    """
+    Caché de PDFs en memoria con volcado opcional a disco.
+
+    Las entradas expiran por antigüedad (max_age) y se expulsan por LRU
+    cuando la memoria supera max_bytes. Si hay directorio de volcado,
+    las entradas expulsadas de memoria se conservan en disco, y vuelven a
+    memoria cuando se piden de nuevo.
+    """
+
+    def __init__(self, max_bytes: int, max_age: float, spill_dir: Optional[str] = None,
+                 spill_max_bytes: int = 0):
+        """
+        Inicializa la caché.
+
+        Args:
+            max_bytes: Tamaño máximo en memoria (bytes).
+            max_age: Antigüedad máxima de una entrada (segundos).
+            spill_dir: Directorio de volcado a disco (opcional).
+            spill_max_bytes: Tamaño máximo del directorio de volcado (bytes).
+        """
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.spill_dir = spill_dir
+        self.spill_max_bytes = spill_max_bytes
+        self._entries: 'OrderedDict[str, Tuple[bytes, float]]' = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if spill_dir:
+            os.makedirs(spill_dir, exist_ok=True)
+
+    @classmethod
+    def from_config(cls, config) -> 'PDFOutputCache':
+        """Crea la caché a partir de la configuración de la aplicación."""
+        spill_dir = config.PDF_CACHE_SPILL_DIR if config.PDF_CACHE_SPILL_ENABLED else None
+        return cls(
+            max_bytes=config.PDF_CACHE_MAX_BYTES,
+            max_age=config.PDF_CACHE_MAX_AGE,
+            spill_dir=spill_dir,
+            spill_max_bytes=config.PDF_CACHE_SPILL_MAX_BYTES
+        )
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Busca un PDF en la caché.
+
+        Args:
+            key: Hash del payload.
+
+        Returns:
+            bytes del PDF o None si no existe o expiró.
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                data, created = entry
+                if now - created <= self.max_age:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return data
+                self._discard(key)
+
+        spilled = self._read_spilled(key, now)
+        with self._lock:
+            if spilled is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+        data, created = spilled
+        # Una entrada que se vuelve a pedir pasa a memoria (conserva su antigüedad)
+        self._insert(key, data, created)
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        """
+        Guarda un PDF en la caché.
+
+        Args:
+            key: Hash del payload.
+            data: Contenido del PDF.
+        """
+        if len(data) > self.max_bytes:
+            self._spill(key, data, time.time())
+            return
+        self._insert(key, data, time.time())
+
+    def _insert(self, key: str, data: bytes, created: float) -> None:
+        """Guarda una entrada en memoria y vuelca a disco las expulsadas por LRU."""
+        if len(data) > self.max_bytes:
+            return
+        evicted = []
+        with self._lock:
+            if key in self._entries:
+                self._discard(key)
+            self._entries[key] = (data, created)
+            self._size += len(data)
+            while self._size > self.max_bytes:
+                old_key, (old_data, old_created) = self._entries.popitem(last=False)
+                self._size -= len(old_data)
+                evicted.append((old_key, old_data, old_created))
+        for old_key, old_data, old_created in evicted:
+            if time.time() - old_created <= self.max_age:
+                self._spill(old_key, old_data, old_created)
+
+    def stats(self) -> Dict[str, Any]:
+        """Retorna los contadores de la caché."""
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                'hits': self.hits,
+                'diskHits': self.disk_hits,
+                'misses': self.misses,
+                'hitRatio': round((self.hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+                'entries': len(self._entries),
+                'bytes': self._size,
+                'maxBytes': self.max_bytes,
+                'spillDir': self.spill_dir
+            }
+
+    def clear(self) -> None:
+        """Vacía la caché en memoria."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _discard(self, key: str) -> None:
+        """Elimina una entrada de memoria (requiere el lock)."""
+        data, _ = self._entries.pop(key)
+        self._size -= len(data)
+
+    def _spill_path(self, key: str) -> str:
+        return os.path.join(self.spill_dir, f"{key}.pdf")
+
+    def _read_spilled(self, key: str, now: float) -> Optional[Tuple[bytes, float]]:
+        """Lee una entrada volcada a disco (datos, creación), descartándola si expiró."""
+        if not self.spill_dir:
+            return None
+        path = self._spill_path(key)
+        try:
+            created = os.path.getmtime(path)
+            if now - created > self.max_age:
+                os.remove(path)
+                return None
+            with open(path, 'rb') as f:
+                return f.read(), created
+        except OSError:
+            return None
+
+    def _spill(self, key: str, data: bytes, created: float) -> None:
+        """Vuelca una entrada a disco y poda el directorio si excede su límite."""
+        if not self.spill_dir:
+            return
+        path = self._spill_path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            # La fecha del archivo es la antigüedad de la entrada (ver max_age)
+            os.utime(tmp_path, (created, created))
+            os.replace(tmp_path, path)
+            self._prune_spill_dir()
+        except OSError as e:
+            print(f"Error spilling PDF cache entry: {e}")
+
+    def _prune_spill_dir(self) -> None:
+        """Elimina los archivos expirados o más antiguos del directorio de volcado."""
+        now = time.time()
+        files = []
+        for name in os.listdir(self.spill_dir):
+            if not name.endswith('.pdf'):
+                continue
+            path = os.path.join(self.spill_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            if now - stat.st_mtime > self.max_age:
+                os.remove(path)
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.spill_max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
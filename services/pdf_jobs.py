@@ -0,0 +1,203 @@
+"""
+Cola de trabajos de generación de PDF.
+Permite generar PDFs en segundo plano y consultar su estado sin bloquear la petición.
+"""
+import queue
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional
+from models.cv_data import CVData
+from services.pdf_cache import PDFRenderResult
+
+
+class QueueFullError(Exception):
+    """La cola de trabajos alcanzó su límite; el cliente debe reintentar más tarde."""
+
+
+@dataclass
+class PDFJob:
+    """Trabajo de generación de un PDF."""
+    id: str
+    cv_data: CVData
+    font_sizes: Optional[Dict[str, float]]
+    filename: str
+    status: str = 'queued'
+    created_at: float = 0.0
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Optional[PDFRenderResult] = None
+    error: Optional[str] = None
+
+    @property
+    def finished(self) -> bool:
+        """Indica si el trabajo terminó (con o sin error)."""
+        return self.status in ('done', 'failed')
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convierte el estado del trabajo a diccionario (sin el contenido del PDF)."""
+        def elapsed_ms(start, end):
+            if start is None or end is None:
+                return None
+            return round((end - start) * 1000, 2)
+
+        data = {
+            'id': self.id,
+            'status': self.status,
+            'filename': self.filename,
+            'queuedMs': elapsed_ms(self.created_at, self.started_at),
+            'renderMs': elapsed_ms(self.started_at, self.finished_at),
+            'totalMs': elapsed_ms(self.created_at, self.finished_at),
+            'error': self.error
+        }
+        if self.result is not None:
+            data['etag'] = self.result.key
+            data['cached'] = self.result.cached
+            data['size'] = len(self.result.data)
+            data['sectionsRebuilt'] = self.result.sections_rebuilt
+        return data
+
+
+class PDFJobQueue:
+    """
+    Cola acotada de trabajos PDF atendida por un pool fijo de hilos.
+
+    Si la cola está llena, submit() lanza QueueFullError en lugar de
+    aceptar más trabajo (backpressure). Los trabajos terminados se
+    eliminan cuando superan su TTL o, si hay más de max_retained, empezando
+    por los más antiguos.
+    """
+
+    def __init__(self, pdf_service, workers: int, max_queue: int, ttl: float,
+                 max_retained: int = 64):
+        """
+        Inicializa la cola.
+
+        Args:
+            pdf_service: Servicio de PDF usado para renderizar.
+            workers: Número de hilos trabajadores.
+            max_queue: Máximo de trabajos en espera.
+            ttl: Segundos que se conserva un trabajo terminado.
+            max_retained: Máximo de trabajos terminados que se conservan.
+        """
+        self.pdf_service = pdf_service
+        self.workers = max(1, workers)
+        self.max_queue = max(1, max_queue)
+        self.ttl = ttl
+        self.max_retained = max(1, max_retained)
+        self._queue: 'queue.Queue[PDFJob]' = queue.Queue(maxsize=self.max_queue)
+        self._jobs: Dict[str, PDFJob] = {}
+        self._lock = threading.Lock()
+        self._threads: List[threading.Thread] = []
+        self.rejected = 0
+
+    def _ensure_workers(self) -> None:
+        """Arranca los hilos trabajadores la primera vez que se necesitan."""
+        with self._lock:
+            if self._threads:
+                return
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._work, name=f"pdf-job-worker-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def submit(self, cv_data: CVData, font_sizes: Optional[Dict[str, float]], filename: str) -> PDFJob:
+        """
+        Encola la generación de un PDF.
+
+        Si el PDF ya está en la caché, el trabajo se crea terminado.
+
+        Args:
+            cv_data: Datos del CV.
+            font_sizes: Tamaños de fuente personalizados (opcional).
+            filename: Nombre del archivo a descargar.
+
+        Returns:
+            PDFJob: Trabajo creado.
+
+        Raises:
+            QueueFullError: Si la cola alcanzó su límite.
+        """
+        self.cleanup()
+        now = time.time()
+        job = PDFJob(id=uuid.uuid4().hex, cv_data=cv_data, font_sizes=font_sizes,
+                     filename=filename, created_at=now)
+
+        cache = self.pdf_service.output_cache
+        if cache is not None:
+            key = self.pdf_service.cache_key(cv_data, font_sizes)
+            data = cache.get(key)
+            if data is not None:
+                job.result = PDFRenderResult(key, data, True)
+                job.status = 'done'
+                job.started_at = job.finished_at = now
+                with self._lock:
+                    self._jobs[job.id] = job
+                self.cleanup()
+                return job
+
+        self._ensure_workers()
+        with self._lock:
+            self._jobs[job.id] = job
+        try:
+            self._queue.put_nowait(job)
+        except queue.Full:
+            with self._lock:
+                del self._jobs[job.id]
+                self.rejected += 1
+            raise QueueFullError(f"Hay {self.max_queue} PDFs en cola; intenta de nuevo en unos segundos")
+        return job
+
+    def get(self, job_id: str) -> Optional[PDFJob]:
+        """Retorna un trabajo por su id, o None si no existe o expiró."""
+        self.cleanup()
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cleanup(self) -> None:
+        """Elimina los trabajos terminados cuyo TTL venció y los que exceden max_retained."""
+        limit = time.time() - self.ttl
+        with self._lock:
+            finished = sorted(
+                (job for job in self._jobs.values() if job.finished),
+                key=lambda job: job.finished_at
+            )
+            excess = len(finished) - self.max_retained
+            for i, job in enumerate(finished):
+                if i < excess or job.finished_at < limit:
+                    del self._jobs[job.id]
+
+    def stats(self) -> Dict[str, Any]:
+        """Retorna el estado de la cola."""
+        with self._lock:
+            counts = {'queued': 0, 'running': 0, 'done': 0, 'failed': 0}
+            for job in self._jobs.values():
+                counts[job.status] += 1
+            return {
+                'workers': self.workers,
+                'maxQueue': self.max_queue,
+                'depth': self._queue.qsize(),
+                'rejected': self.rejected,
+                'jobs': counts
+            }
+
+    def _work(self) -> None:
+        """Bucle de un hilo trabajador."""
+        while True:
+            job = self._queue.get()
+            job.started_at = time.time()
+            job.status = 'running'
+            try:
+                job.result = self.pdf_service.render(job.cv_data, job.font_sizes)
+                status = 'done'
+            except Exception as e:
+                print(f"Error generating PDF job {job.id}: {e}")
+                job.error = str(e)
+                status = 'failed'
+            # El resultado ya no necesita los datos de entrada
+            job.cv_data = None
+            job.finished_at = time.time()
+            job.status = status
+            self._queue.task_done()
+            self.cleanup()
@@ -2,21 +2,274 @@
 Servicio de generación de PDF.
 Responsable de crear documentos PDF a partir de los datos del CV.
 """
+import copy
+import threading
+from collections import OrderedDict
+from functools import lru_cache
 from io import BytesIO
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Callable, Optional, Tuple
 from reportlab.lib.pagesizes import letter
 from reportlab.lib import colors
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, Flowable
 from models.cv_data import CVData, Skill, EducationItem
 from config.settings import Config
+from services.pdf_cache import PDFOutputCache, PDFRenderResult, make_cache_key
+from services.metrics import span
+from services.profiling import RenderProfiler
+
+
+# Mapping for bold and italic variants
+FONT_VARIANTS = {
+    "Helvetica": {"bold": "Helvetica-Bold", "italic": "Helvetica-Oblique", "normal": "Helvetica"},
+    "Times-Roman": {"bold": "Times-Bold", "italic": "Times-Italic", "normal": "Times-Roman"},
+    "Courier": {"bold": "Courier-Bold", "italic": "Courier-Oblique", "normal": "Courier"},
+    "Georgia": {"bold": "Times-Bold", "italic": "Times-Italic", "normal": "Times-Roman"}
+}
+
+
+@lru_cache(maxsize=1)
+def get_base_styles():
+    """Retorna la hoja de estilos base de ReportLab (se crea una sola vez por proceso)."""
+    return getSampleStyleSheet()
+
+
+@lru_cache(maxsize=64)
+def hex_color(value: str) -> colors.Color:
+    """Retorna el color ReportLab para un valor hexadecimal, reutilizando instancias."""
+    return colors.HexColor(value)
+
+
+class FrozenParagraphStyle(ParagraphStyle):
+    """ParagraphStyle inmutable, seguro para compartir entre peticiones."""
+
+    def __setattr__(self, key, value):
+        if self.__dict__.get('_frozen'):
+            raise AttributeError(f"El estilo '{self.name}' es compartido y no puede modificarse")
+        super().__setattr__(key, value)
+
+    @classmethod
+    def freeze(cls, style: ParagraphStyle) -> 'FrozenParagraphStyle':
+        """Convierte un ParagraphStyle ya construido en su versión inmutable."""
+        style.__class__ = cls
+        style.__dict__['_frozen'] = True
+        return style
+
+
+def normalize_font_family(font_family: Optional[str]) -> str:
+    """Normaliza la familia de fuente, usando Helvetica si es desconocida."""
+    if font_family in FONT_VARIANTS:
+        return font_family
+    return "Helvetica"
+
+
+def normalize_font_sizes(font_sizes: Optional[Dict[str, Any]]) -> Dict[str, float]:
+    """
+    Normaliza el mapa de tamaños de fuente recibido del cliente.
+    
+    Descarta valores no numéricos y redondea para que tamaños equivalentes
+    (ej: 0.9 y 0.90000001) produzcan la misma clave de caché.
+    """
+    normalized = {}
+    for key, value in (font_sizes or {}).items():
+        if isinstance(value, bool):
+            continue
+        try:
+            normalized[key] = round(float(value), 4)
+        except (TypeError, ValueError):
+            continue
+    return normalized
+
+
+class StyleRegistry:
+    """
+    Registro LRU de estilos compartido por todo el proceso.
+    
+    Cada entrada agrupa los estilos inmutables de una combinación
+    (familia de fuente, tamaños de fuente, paleta de colores).
+    """
+
+    def __init__(self, maxsize: int = 32):
+        """
+        Inicializa el registro.
+        
+        Args:
+            maxsize: Número máximo de combinaciones de estilos retenidas.
+        """
+        self.maxsize = max(1, maxsize)
+        self._entries: 'OrderedDict[Tuple, Dict[str, FrozenParagraphStyle]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(font_family: str, font_sizes: Dict[str, float], palette: Dict[str, str]) -> Tuple:
+        """Construye la clave de caché a partir de los parámetros normalizados."""
+        return (font_family, tuple(sorted(font_sizes.items())), tuple(sorted(palette.items())))
+
+    def entry(self, key: Tuple) -> Dict[str, FrozenParagraphStyle]:
+        """Retorna (creándolo si no existe) el grupo de estilos de una clave."""
+        with self._lock:
+            styles = self._entries.get(key)
+            if styles is None:
+                styles = {}
+                self._entries[key] = styles
+                if len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+            else:
+                self._entries.move_to_end(key)
+            return styles
+
+    def get_or_create(self, key: Tuple, name: str,
+                      factory: Callable[[], ParagraphStyle]) -> FrozenParagraphStyle:
+        """
+        Retorna un estilo del registro o lo crea con la fábrica indicada.
+        
+        Args:
+            key: Clave de la combinación de estilos.
+            name: Nombre del estilo dentro de la combinación.
+            factory: Función que construye el estilo si no existe.
+            
+        Returns:
+            FrozenParagraphStyle: Estilo compartido e inmutable.
+        """
+        styles = self.entry(key)
+        style = styles.get(name)
+        if style is not None:
+            with self._lock:
+                self.hits += 1
+            return style
+        style = FrozenParagraphStyle.freeze(factory())
+        with self._lock:
+            self.misses += 1
+            # Otro hilo pudo crearlo mientras tanto; conservar el primero
+            return styles.setdefault(name, style)
+
+    def stats(self) -> Dict[str, Any]:
+        """Retorna los contadores de aciertos y fallos del registro."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hitRatio': round(self.hits / lookups, 4) if lookups else 0.0,
+                'entries': len(self._entries),
+                'maxsize': self.maxsize
+            }
+
+    def clear(self) -> None:
+        """Vacía el registro y reinicia los contadores."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+style_registry = StyleRegistry(Config.PDF_STYLE_CACHE_SIZE)
+
+
+# Tamaños de fuente que afectan a cada sección (además de la familia y la paleta)
+SECTION_FONT_KEYS = {
+    'name': ('name',),
+    'contact': ('contact',),
+    'separator': (),
+    'skills': ('sectionTitle', 'skillsContent'),
+    'experience': ('sectionTitle', 'experienceBullet', 'experienceDuration'),
+    'education': ('sectionTitle', 'educationInstitution', 'educationDegree',
+                  'educationDate', 'educationDescription'),
+}
+
+
+def copy_flowables(flowables: List[Flowable]) -> List[Flowable]:
+    """
+    Retorna copias superficiales de una lista de flowables.
+    
+    Las copias comparten el texto ya parseado (frags) pero no el estado de
+    maquetación que ReportLab guarda al hacer wrap/split, por lo que pueden
+    usarse en varios documentos a la vez. Las tablas copian también sus celdas.
+    """
+    copies = []
+    for flowable in flowables:
+        clone = copy.copy(flowable)
+        if isinstance(flowable, Table):
+            clone._cellvalues = [
+                [copy.copy(cell) if isinstance(cell, Flowable) else cell for cell in row]
+                for row in flowable._cellvalues
+            ]
+        copies.append(clone)
+    return copies
+
+
+class SectionCache:
+    """
+    Caché LRU de secciones del PDF compartida por todo el proceso.
+    
+    Guarda los flowables construidos de cada sección por el hash de sus
+    datos y de los estilos que usa. Las entradas nunca se pasan a
+    ReportLab directamente: se entregan copias con copy_flowables().
+    """
+
+    def __init__(self, maxsize: int = 128):
+        """
+        Inicializa la caché.
+        
+        Args:
+            maxsize: Número máximo de secciones retenidas.
+        """
+        self.maxsize = max(1, maxsize)
+        self._entries: 'OrderedDict[str, List[Flowable]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[List[Flowable]]:
+        """Retorna copias de los flowables de una sección, o None si no está en caché."""
+        with self._lock:
+            flowables = self._entries.get(key)
+            if flowables is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return copy_flowables(flowables)
+
+    def put(self, key: str, flowables: List[Flowable]) -> None:
+        """Guarda los flowables de una sección (no deben haberse maquetado aún)."""
+        with self._lock:
+            self._entries[key] = flowables
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        """Retorna los contadores de aciertos y fallos de la caché."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hitRatio': round(self.hits / lookups, 4) if lookups else 0.0,
+                'entries': len(self._entries),
+                'maxsize': self.maxsize
+            }
+
+    def clear(self) -> None:
+        """Vacía la caché y reinicia los contadores."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+section_cache = SectionCache(Config.PDF_SECTION_CACHE_SIZE)
 
 
 class PDFStyleBuilder:
     """Constructor de estilos para el PDF."""
     
-    def __init__(self, config: Config, font_sizes: Dict[str, float] = None, font_family: str = "Helvetica"):
+    def __init__(self, config: Config, font_sizes: Dict[str, float] = None, font_family: str = "Helvetica",
+                 registry: StyleRegistry = None):
         """
         Inicializa el constructor de estilos.
         
@@ -24,36 +277,37 @@ class PDFStyleBuilder:
             config: Configuración de la aplicación.
             font_sizes: Tamaños de fuente personalizados (opcional).
             font_family: Familia de fuente global (Helvetica, Times-Roman, Courier).
+            registry: Registro de estilos compartido (por defecto el del proceso).
         """
         self.config = config
-        self.base_styles = getSampleStyleSheet()
-        self.font_sizes = font_sizes or {}
-        self.font_family = font_family or "Helvetica"
-
-        # Mapping for bold and italic variants
-        self.font_variants = {
-            "Helvetica": {"bold": "Helvetica-Bold", "italic": "Helvetica-Oblique", "normal": "Helvetica"},
-            "Times-Roman": {"bold": "Times-Bold", "italic": "Times-Italic", "normal": "Times-Roman"},
-            "Courier": {"bold": "Courier-Bold", "italic": "Courier-Oblique", "normal": "Courier"},
-            "Georgia": {"bold": "Times-Bold", "italic": "Times-Italic", "normal": "Times-Roman"}
-        }
+        self.base_styles = get_base_styles()
+        self.font_sizes = normalize_font_sizes(font_sizes)
         # Fallback to Helvetica if unknown
-        if self.font_family not in self.font_variants:
-            self.font_family = "Helvetica"
+        self.font_family = normalize_font_family(font_family)
+        self.font_variants = FONT_VARIANTS
+        self.registry = registry or style_registry
+        self.cache_key = StyleRegistry.make_key(self.font_family, self.font_sizes, self.config.PDF_COLORS)
 
     def _get_font(self, variant: str = "normal") -> str:
         """Retorna el nombre de la fuente según la variante."""
         return self.font_variants.get(self.font_family, self.font_variants["Helvetica"]).get(variant, self.font_family)
+
+    def _cached(self, name: str, factory: Callable[[], ParagraphStyle]) -> FrozenParagraphStyle:
+        """Obtiene un estilo del registro compartido."""
+        return self.registry.get_or_create(self.cache_key, name, factory)
     
     def get_name_style(self) -> ParagraphStyle:
         """Retorna el estilo para el nombre."""
+        return self._cached('name', self._build_name_style)
+
+    def _build_name_style(self) -> ParagraphStyle:
         # Convertir rem a puntos (1rem ≈ 12pt)
         font_size = self.font_sizes.get('name', 2.5) * 12
         return ParagraphStyle(
             'CustomName',
             parent=self.base_styles['Heading1'],
             fontSize=font_size,
-            textColor=colors.HexColor(self.config.PDF_COLORS['primary']),
+            textColor=hex_color(self.config.PDF_COLORS['primary']),
             spaceAfter=14,
             alignment=1,  # Centrado
             fontName=self._get_font("bold")
@@ -61,12 +315,15 @@ class PDFStyleBuilder:
     
     def get_contact_style(self) -> ParagraphStyle:
         """Retorna el estilo para la información de contacto."""
+        return self._cached('contact', self._build_contact_style)
+
+    def _build_contact_style(self) -> ParagraphStyle:
         font_size = self.font_sizes.get('contact', 0.9) * 12
         return ParagraphStyle(
             'ContactInfo',
             parent=self.base_styles['Normal'],
             fontSize=font_size,
-            textColor=colors.HexColor(self.config.PDF_COLORS['secondary']),
+            textColor=hex_color(self.config.PDF_COLORS['secondary']),
             spaceAfter=10,
             alignment=1,  # Centrado
             fontName=self._get_font("normal")
@@ -74,12 +331,15 @@ class PDFStyleBuilder:
     
     def get_section_title_style(self) -> ParagraphStyle:
         """Retorna el estilo para títulos de sección."""
+        return self._cached('sectionTitle', self._build_section_title_style)
+
+    def _build_section_title_style(self) -> ParagraphStyle:
         font_size = self.font_sizes.get('sectionTitle', 1.2) * 12
         return ParagraphStyle(
             'SectionTitle',
             parent=self.base_styles['Heading2'],
             fontSize=font_size,
-            textColor=colors.HexColor(self.config.PDF_COLORS['primary']),
+            textColor=hex_color(self.config.PDF_COLORS['primary']),
             spaceAfter=6,
             spaceBefore=6,
             fontName=self._get_font("bold"),
@@ -88,61 +348,76 @@ class PDFStyleBuilder:
     
     def get_skill_style(self) -> ParagraphStyle:
         """Retorna el estilo para las habilidades."""
+        return self._cached('skill', self._build_skill_style)
+
+    def _build_skill_style(self) -> ParagraphStyle:
         font_size = self.font_sizes.get('skillsContent', 0.95) * 12
         return ParagraphStyle(
             'SkillLine',
             parent=self.base_styles['Normal'],
             fontSize=font_size,
-            textColor=colors.HexColor(self.config.PDF_COLORS['text']),
-            spaceAfter=6,
+            textColor=hex_color(self.config.PDF_COLORS['text']),
+            spaceAfter=6,  # Ensure small spacing between skills
             leftIndent=0,
             fontName=self._get_font("normal")
         )
 
     def get_company_style(self) -> ParagraphStyle:
         """Retorna el estilo para el nombre de la empresa."""
+        return self._cached('company', self._build_company_style)
+
+    def _build_company_style(self) -> ParagraphStyle:
         font_size = self.font_sizes.get('experienceCompany', 1.0) * 12
         return ParagraphStyle(
             'CompanyName',
             parent=self.base_styles['Normal'],
             fontSize=font_size,
-            textColor=colors.HexColor('#2c3e50'), # Dark Blue
+            textColor=hex_color('#2c3e50'), # Dark Blue
             spaceAfter=2,
             fontName=self._get_font("bold")
         )
 
     def get_duration_style(self) -> ParagraphStyle:
         """Retorna el estilo para la duración."""
+        return self._cached('duration', self._build_duration_style)
+
+    def _build_duration_style(self) -> ParagraphStyle:
         font_size = self.font_sizes.get('experienceDuration', 0.9) * 12
         return ParagraphStyle(
             'Duration',
             parent=self.base_styles['Normal'],
             fontSize=font_size,
-            textColor=colors.HexColor('#666666'),
+            textColor=hex_color('#666666'),
             alignment=2, # Right aligned
             fontName=self._get_font("italic")
         )
 
     def get_position_style(self) -> ParagraphStyle:
         """Retorna el estilo para el puesto."""
+        return self._cached('position', self._build_position_style)
+
+    def _build_position_style(self) -> ParagraphStyle:
         font_size = self.font_sizes.get('experiencePosition', 0.95) * 12
         return ParagraphStyle(
             'Position',
             parent=self.base_styles['Normal'],
             fontSize=font_size,
-            textColor=colors.HexColor('#333333'),
+            textColor=hex_color('#333333'),
             spaceAfter=4,
             fontName=self._get_font("bold")
         )
 
     def get_bullet_style(self) -> ParagraphStyle:
         """Retorna el estilo para los puntos (bullets)."""
+        return self._cached('bullet', self._build_bullet_style)
+
+    def _build_bullet_style(self) -> ParagraphStyle:
         font_size = self.font_sizes.get('experienceBullet', 0.9) * 12
         return ParagraphStyle(
             'BulletPoint',
             parent=self.base_styles['Normal'],
             fontSize=font_size,
-            textColor=colors.HexColor('#444444'),
+            textColor=hex_color('#444444'),
             leftIndent=12,
             firstLineIndent=0,
             spaceAfter=6,
@@ -152,72 +427,176 @@ class PDFStyleBuilder:
 
     def get_experience_left_style(self) -> ParagraphStyle:
         """Retorna el estilo para la parte izquierda de la experiencia (Empresa - Puesto)."""
+        return self._cached('experienceLeft', self._build_experience_left_style)
+
+    def _build_experience_left_style(self) -> ParagraphStyle:
         return ParagraphStyle(
             'ExpLeft',
             parent=self.base_styles['Normal'],
             fontSize=11,
-            textColor=colors.HexColor('#2c3e50'),
+            textColor=hex_color('#2c3e50'),
             fontName=self._get_font("normal")
         )
 
     def get_education_institution_style(self) -> ParagraphStyle:
         """Retorna el estilo para la institución educativa."""
+        return self._cached('educationInstitution', self._build_education_institution_style)
+
+    def _build_education_institution_style(self) -> ParagraphStyle:
         font_size = self.font_sizes.get('educationInstitution', 0.95) * 12
         return ParagraphStyle(
             'EducationInstitution',
             parent=self.base_styles['Normal'],
             fontSize=font_size,
-            textColor=colors.HexColor('#2c3e50'),
+            textColor=hex_color('#2c3e50'),
             fontName=self._get_font("bold")
         )
 
     def get_education_degree_style(self) -> ParagraphStyle:
         """Retorna el estilo para el título/grado."""
+        return self._cached('educationDegree', self._build_education_degree_style)
+
+    def _build_education_degree_style(self) -> ParagraphStyle:
         font_size = self.font_sizes.get('educationDegree', 0.95) * 12
         return ParagraphStyle(
             'EducationDegree',
             parent=self.base_styles['Normal'],
             fontSize=font_size,
-            textColor=colors.HexColor('#333333'),
+            textColor=hex_color('#333333'),
             fontName=self._get_font("normal")
         )
 
     def get_education_date_style(self) -> ParagraphStyle:
         """Retorna el estilo para la fecha."""
+        return self._cached('educationDate', self._build_education_date_style)
+
+    def _build_education_date_style(self) -> ParagraphStyle:
         font_size = self.font_sizes.get('educationDate', 0.85) * 12
         return ParagraphStyle(
             'EducationDate',
             parent=self.base_styles['Normal'],
             fontSize=font_size,
-            textColor=colors.HexColor('#666666'),
+            textColor=hex_color('#666666'),
             fontName=self._get_font("italic")
         )
 
     def get_education_description_style(self) -> ParagraphStyle:
         """Retorna el estilo para la descripción de educación."""
+        return self._cached('educationDescription', self._build_education_description_style)
+
+    def _build_education_description_style(self) -> ParagraphStyle:
         font_size = self.font_sizes.get('educationDescription', 0.9) * 12
         return ParagraphStyle(
             'EducationDescription',
             parent=self.base_styles['Normal'],
             fontSize=font_size,
-            textColor=colors.HexColor('#444444'),
+            textColor=hex_color('#444444'),
             leftIndent=12,
             spaceAfter=6,
             fontName=self._get_font("normal")
         )
 
+    def get_education_combined_style(self) -> ParagraphStyle:
+        """Retorna el estilo base de la línea combinada Institución | Título | Fecha."""
+        return self._cached('educationCombined', self._build_education_combined_style)
+
+    def _build_education_combined_style(self) -> ParagraphStyle:
+        base_font_size = self.font_sizes.get('educationInstitution', 0.95) * 12
+        return ParagraphStyle(
+            'EducationCombined',
+            parent=self.base_styles['Normal'],
+            fontSize=base_font_size,
+            textColor=hex_color('#2c3e50'),
+            spaceAfter=2,
+            fontName=self._get_font("normal")
+        )
+
 
 class PDFContentBuilder:
-    """Constructor de contenido para el PDF."""
+    """
+    Constructor de contenido para el PDF.
     
-    def __init__(self, style_builder: PDFStyleBuilder):
+    Cada sección se reutiliza desde la caché de secciones mientras no
+    cambien sus datos ni los estilos que usa; `rebuilt` registra las
+    secciones que sí se construyeron.
+    """
+    
+    def __init__(self, style_builder: PDFStyleBuilder, cache: Optional[SectionCache] = section_cache):
         """
         Inicializa el constructor de contenido.
         
         Args:
             style_builder: Constructor de estilos.
+            cache: Caché de secciones (None para construir siempre).
         """
         self.style_builder = style_builder
+        self.cache = cache
+        self.rebuilt: List[str] = []
+    
+    def _section(self, name: str, payload: Any, factory: Callable[[], List]) -> List:
+        """
+        Retorna los flowables de una sección desde la caché o construyéndolos.
+        
+        Args:
+            name: Nombre de la sección (clave de SECTION_FONT_KEYS).
+            payload: Datos serializables de los que depende la sección.
+            factory: Función que construye la sección.
+            
+        Returns:
+            Lista de elementos para el PDF.
+        """
+        with span(f'pdf.section.{name}'):
+            if self.cache is None:
+                self.rebuilt.append(name)
+                return factory()
+            
+            style_builder = self.style_builder
+            key = make_cache_key({
+                'section': name,
+                'data': payload,
+                'fontFamily': style_builder.font_family,
+                'fontSizes': {k: style_builder.font_sizes.get(k) for k in SECTION_FONT_KEYS[name]},
+                'colors': style_builder.config.PDF_COLORS
+            })
+            elements = self.cache.get(key)
+            if elements is None:
+                elements = factory()
+                self.cache.put(key, elements)
+                elements = copy_flowables(elements)
+                self.rebuilt.append(name)
+            return elements
+    
+    def build_document(self, cv_data: CVData) -> List:
+        """
+        Construye todas las secciones del CV en orden.
+        
+        Args:
+            cv_data: Datos del CV.
+            
+        Returns:
+            Lista de elementos para el PDF.
+        """
+        elements = []
+        
+        # Nombre
+        elements.extend(self.build_name_section(cv_data.full_name))
+        
+        # Contacto
+        elements.extend(self.build_contact_section(cv_data))
+        
+        # Línea separadora
+        elements.extend(self.build_separator_line())
+        
+        # Habilidades
+        elements.extend(self.build_skills_section(cv_data))
+        
+        # Experiencia
+        elements.extend(self.build_experience_section(cv_data))
+        
+        # Educación
+        elements.extend(self.build_education_section(cv_data))
+        
+        return elements
     
     def build_name_section(self, full_name: str) -> List:
         """
@@ -229,6 +608,9 @@ class PDFContentBuilder:
         Returns:
             Lista de elementos para el PDF.
         """
+        return self._section('name', full_name, lambda: self._build_name_section(full_name))
+    
+    def _build_name_section(self, full_name: str) -> List:
         if not full_name:
             return []
         
@@ -245,6 +627,9 @@ class PDFContentBuilder:
         Returns:
             Lista de elementos para el PDF.
         """
+        return self._section('contact', cv_data.contact_info.to_dict(), lambda: self._build_contact_section(cv_data))
+    
+    def _build_contact_section(self, cv_data: CVData) -> List:
         contact_parts = []
         contact_info = cv_data.contact_info
         
@@ -279,10 +664,13 @@ class PDFContentBuilder:
         Returns:
             Lista de elementos para el PDF.
         """
+        return self._section('separator', None, self._build_separator_line)
+    
+    def _build_separator_line(self) -> List:
         line_data = [['']]
         line_table = Table(line_data, colWidths=[6.5*inch])
         line_table.setStyle([
-            ('LINEABOVE', (0, 0), (-1, 0), 2, colors.HexColor('#2c3e50')),
+            ('LINEABOVE', (0, 0), (-1, 0), 2, hex_color('#2c3e50')),
             ('TOPPADDING', (0, 0), (-1, -1), 2),
             ('BOTTOMPADDING', (0, 0), (-1, -1), 2),
         ])
@@ -298,6 +686,12 @@ class PDFContentBuilder:
         Returns:
             Lista de elementos para el PDF.
         """
+        return self._section('skills', {
+            'title': cv_data.skills_section_title,
+            'items': [skill.to_dict() for skill in cv_data.skills]
+        }, lambda: self._build_skills_section(cv_data))
+    
+    def _build_skills_section(self, cv_data: CVData) -> List:
         if not cv_data.skills:
             return []
         
@@ -310,8 +704,6 @@ class PDFContentBuilder:
         
         # Habilidades
         skill_style = self.style_builder.get_skill_style()
-        # Ensure small spacing between skills
-        skill_style.spaceAfter = 6
         
         for skill in cv_data.skills:
             skill_text = self._format_skill(skill)
@@ -337,6 +729,12 @@ class PDFContentBuilder:
         Returns:
             Lista de elementos para el PDF.
         """
+        return self._section('education', {
+            'title': cv_data.education_section_title,
+            'items': [item.to_dict() for item in cv_data.education]
+        }, lambda: self._build_education_section(cv_data))
+    
+    def _build_education_section(self, cv_data: CVData) -> List:
         if not cv_data.education:
             return []
         
@@ -348,21 +746,10 @@ class PDFContentBuilder:
         elements.append(edu_title)
         
         # Get custom education styles
-        institution_style = self.style_builder.get_education_institution_style()
-        degree_style = self.style_builder.get_education_degree_style()
-        date_style = self.style_builder.get_education_date_style()
         description_style = self.style_builder.get_education_description_style()
         
         # Base style for combined line
-        base_font_size = self.style_builder.font_sizes.get('educationInstitution', 0.95) * 12
-        combined_style = ParagraphStyle(
-            'EducationCombined',
-            parent=self.style_builder.base_styles['Normal'],
-            fontSize=base_font_size,
-            textColor=colors.HexColor('#2c3e50'),
-            spaceAfter=2,
-            fontName=self.style_builder._get_font("normal")
-        )
+        combined_style = self.style_builder.get_education_combined_style()
         
         for item in cv_data.education:
             # Line 1: Institution - Degree | Date
@@ -408,6 +795,12 @@ class PDFContentBuilder:
         Returns:
             Lista de elementos para el PDF.
         """
+        return self._section('experience', {
+            'title': cv_data.experience_section_title,
+            'items': [exp.to_dict() for exp in cv_data.experience]
+        }, lambda: self._build_experience_section(cv_data))
+    
+    def _build_experience_section(self, cv_data: CVData) -> List:
         if not cv_data.experience:
             return []
         
@@ -418,6 +811,11 @@ class PDFContentBuilder:
         title = Paragraph(cv_data.experience_section_title, section_title_style)
         elements.append(title)
         
+        # Styles (compartidos por todas las entradas)
+        left_style = self.style_builder.get_experience_left_style()
+        duration_style = self.style_builder.get_duration_style()
+        bullet_style = self.style_builder.get_bullet_style()
+        
         for exp in cv_data.experience:
             # Single line: Company - Position (Left) ..... Duration (Right)
             
@@ -431,11 +829,6 @@ class PDFContentBuilder:
             
             left_content = f"{company_text}{separator}{position_text}"
             
-            # Styles
-            left_style = self.style_builder.get_experience_left_style()
-            
-            duration_style = self.style_builder.get_duration_style()
-            
             row_data = [
                 Paragraph(left_content, left_style),
                 Paragraph(exp.duration, duration_style)
@@ -452,7 +845,6 @@ class PDFContentBuilder:
             
             # Responsibilities
             if exp.responsibilities:
-                bullet_style = self.style_builder.get_bullet_style()
                 for resp in exp.responsibilities:
                     if resp:
                         elements.append(Paragraph(f"• {resp}", bullet_style))
@@ -483,14 +875,94 @@ class PDFContentBuilder:
 class PDFService:
     """Servicio principal para la generación de PDFs."""
     
-    def __init__(self, config: Config):
+    def __init__(self, config: Config, use_output_cache: bool = True):
         """
         Inicializa el servicio de PDF.
         
         Args:
             config: Configuración de la aplicación.
+            use_output_cache: Si se guardan los PDFs generados en caché.
         """
         self.config = config
+        self.output_cache = None
+        if use_output_cache and config.PDF_CACHE_ENABLED:
+            self.output_cache = PDFOutputCache.from_config(config)
+        self.profiler = RenderProfiler(config)
+    
+    def cache_key(self, cv_data: CVData, font_sizes: Dict[str, float] = None) -> str:
+        """
+        Calcula el hash de contenido que identifica un PDF.
+        
+        Args:
+            cv_data: Datos del CV.
+            font_sizes: Tamaños de fuente personalizados (opcional).
+            
+        Returns:
+            str: Hash canónico del CV, los tamaños y la configuración de diseño.
+        """
+        return make_cache_key({
+            'cv': cv_data.to_dict(),
+            'fontSizes': normalize_font_sizes(font_sizes),
+            'colors': self.config.PDF_COLORS,
+            'margins': self.config.PDF_MARGINS
+        })
+    
+    def render(self, cv_data: CVData, font_sizes: Dict[str, float] = None,
+               profile: bool = False) -> PDFRenderResult:
+        """
+        Genera un PDF reutilizando la caché de resultados si es posible.
+        
+        Args:
+            cv_data: Datos del CV.
+            font_sizes: Tamaños de fuente personalizados (opcional).
+            profile: Perfilar el render y guardar el perfil (ignora las cachés).
+            
+        Returns:
+            PDFRenderResult: Hash, contenido y si provino de la caché.
+        """
+        key = self.cache_key(cv_data, font_sizes)
+        if self.output_cache is not None and not profile:
+            data = self.output_cache.get(key)
+            if data is not None:
+                return PDFRenderResult(key, data, True)
+        
+        (buffer, rebuilt), profile_path = self._profiled_build(key, cv_data, font_sizes, profile)
+        data = buffer.getvalue()
+        if self.output_cache is not None:
+            self.output_cache.put(key, data)
+        return PDFRenderResult(key, data, False, rebuilt, profile_path)
+    
+    def autofit(self, cv_data: CVData, font_sizes: Dict[str, float] = None, max_pages: int = 1,
+                mode: str = 'uniform'):
+        """
+        Calcula los tamaños de fuente más grandes con los que el CV cabe en max_pages.
+        
+        Mide la maquetación sin generar el PDF (ver services.autofit_service).
+        
+        Args:
+            cv_data: Datos del CV.
+            font_sizes: Tamaños actuales (se conservan sus proporciones).
+            max_pages: Número máximo de páginas.
+            mode: 'uniform' (un factor para todo) o 'sections' (un factor por sección).
+            
+        Returns:
+            AutofitResult: Tamaños elegidos y páginas resultantes.
+        """
+        from services.autofit_service import FontAutofitter
+        return FontAutofitter(self.config).fit(cv_data, font_sizes, max_pages, mode)
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """
+        Retorna las estadísticas de las cachés del servicio.
+        
+        Returns:
+            Dict: Contadores de aciertos/fallos por caché.
+        """
+        stats = {'styles': style_registry.stats(), 'sections': section_cache.stats(),
+                 'profiler': self.profiler.stats()}
+        if self.output_cache is not None:
+            stats['pdfOutput'] = self.output_cache.stats()
+        return stats
     
     def generate(self, cv_data: CVData, font_sizes: Dict[str, float] = None) -> BytesIO:
         """
@@ -503,9 +975,45 @@ class PDFService:
         Returns:
             BytesIO: Buffer con el PDF generado.
         """
+        if self.profiler.enabled:
+            key = self.cache_key(cv_data, font_sizes)
+            return self._profiled_build(key, cv_data, font_sizes, False)[0][0]
+        return self._build(cv_data, font_sizes)[0]
+    
+    def _profiled_build(self, key: str, cv_data: CVData, font_sizes: Optional[Dict[str, float]],
+                        force: bool):
+        """
+        Construye el PDF a través del perfilador (ver services.profiling).
+        
+        Un perfil forzado construye todas las secciones sin caché, para que
+        el perfil muestre el costo real del contenido.
+        
+        Returns:
+            Tupla (resultado de _build, ruta del perfil guardado o None).
+        """
+        def payload():
+            return dict(cv_data.to_dict(), fontSizes=font_sizes)
+        
+        return self.profiler.run(
+            key, payload,
+            lambda: self._build(cv_data, font_sizes, use_section_cache=not force),
+            force=force
+        )
+    
+    def _build(self, cv_data: CVData, font_sizes: Dict[str, float] = None,
+               use_section_cache: bool = True) -> Tuple[BytesIO, List[str]]:
+        """
+        Construye el PDF y reporta qué secciones no estaban en la caché.
+        
+        Args:
+            use_section_cache: Si se reutilizan las secciones de la caché.
+        
+        Returns:
+            Tupla (buffer con el PDF, nombres de las secciones reconstruidas).
+        """
         # Crear style builder con font sizes personalizados
         style_builder = PDFStyleBuilder(self.config, font_sizes, cv_data.font_family)
-        content_builder = PDFContentBuilder(style_builder)
+        content_builder = PDFContentBuilder(style_builder, section_cache if use_section_cache else None)
         buffer = BytesIO()
         
         # Crear documento
@@ -519,30 +1027,13 @@ class PDFService:
         )
         
         # Construir elementos
-        elements = []
-        
-        # Nombre
-        elements.extend(content_builder.build_name_section(cv_data.full_name))
-        
-        # Contacto
-        elements.extend(content_builder.build_contact_section(cv_data))
-        
-        # Línea separadora
-        elements.extend(content_builder.build_separator_line())
-        
-        # Habilidades
-        elements.extend(content_builder.build_skills_section(cv_data))
-        
-        # Experiencia
-        elements.extend(content_builder.build_experience_section(cv_data))
-        
-        # Educación
-        elements.extend(content_builder.build_education_section(cv_data))
+        elements = content_builder.build_document(cv_data)
         
         # Construir PDF
-        doc.build(elements)
+        with span('pdf.doc_build'):
+            doc.build(elements)
         
         # Resetear buffer
         buffer.seek(0)
         
-        return buffer
+        return buffer, content_builder.rebuilt
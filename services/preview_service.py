@@ -0,0 +1,149 @@
+"""
+Servicio de vista previa del CV.
+Convierte las páginas del PDF real en imágenes de baja resolución (PNG o SVG).
+"""
+import base64
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
+from models.cv_data import CVData
+
+
+@lru_cache(maxsize=1)
+def load_pymupdf():
+    """Importa PyMuPDF la primera vez que se necesita; retorna None si no está instalado."""
+    try:
+        import pymupdf
+        return pymupdf
+    except ImportError:  # pragma: no cover - dependencia opcional
+        try:
+            import fitz  # PyMuPDF < 1.24
+            return fitz
+        except ImportError:
+            return None
+
+PREVIEW_FORMATS = ('png', 'svg')
+
+
+class PreviewUnavailableError(Exception):
+    """No hay un rasterizador de PDF instalado (PyMuPDF)."""
+
+
+@dataclass
+class PreviewResult:
+    """Páginas renderizadas de un PDF."""
+    key: str
+    format: str
+    pages: List[str]
+    cached: bool
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convierte la vista previa a diccionario (páginas como data URIs)."""
+        mimetype = 'image/png' if self.format == 'png' else 'image/svg+xml'
+        return {
+            'etag': self.key,
+            'format': self.format,
+            'pageCount': len(self.pages),
+            'cached': self.cached,
+            'pages': [f"data:{mimetype};base64,{page}" for page in self.pages]
+        }
+
+
+class PreviewService:
+    """
+    Genera vistas previas a partir del mismo PDF que se descarga.
+
+    El PDF se obtiene con PDFService.render(), que reutiliza la caché de
+    PDFs y la de secciones; las páginas ya rasterizadas se guardan en una
+    caché LRU por (hash del PDF, formato, resolución).
+    """
+
+    def __init__(self, pdf_service, max_entries: int = 32, max_dpi: int = 150):
+        """
+        Inicializa el servicio.
+
+        Args:
+            pdf_service: Servicio de PDF usado para renderizar.
+            max_entries: Número máximo de vistas previas retenidas.
+            max_dpi: Resolución máxima permitida para PNG.
+        """
+        self.pdf_service = pdf_service
+        self.max_entries = max(1, max_entries)
+        self.max_dpi = max_dpi
+        self._entries: 'OrderedDict[Tuple[str, str, int], List[str]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def available(self) -> bool:
+        """Indica si hay un rasterizador de PDF instalado."""
+        return load_pymupdf() is not None
+
+    def render(self, cv_data: CVData, font_sizes: Optional[Dict[str, float]] = None,
+               fmt: str = 'png', dpi: int = 50) -> PreviewResult:
+        """
+        Genera la vista previa de todas las páginas del CV.
+
+        Args:
+            cv_data: Datos del CV.
+            font_sizes: Tamaños de fuente personalizados (opcional).
+            fmt: Formato de salida ('png' o 'svg').
+            dpi: Resolución de las imágenes PNG.
+
+        Returns:
+            PreviewResult: Páginas en base64.
+
+        Raises:
+            PreviewUnavailableError: Si PyMuPDF no está instalado.
+            ValueError: Si el formato no es válido.
+        """
+        if not self.available:
+            raise PreviewUnavailableError("La vista previa requiere PyMuPDF (pip install pymupdf)")
+        if fmt not in PREVIEW_FORMATS:
+            raise ValueError(f"Formato no soportado: {fmt}")
+        dpi = min(max(int(dpi), 18), self.max_dpi) if fmt == 'png' else 0
+
+        key = self.pdf_service.cache_key(cv_data, font_sizes)
+        with self._lock:
+            pages = self._entries.get((key, fmt, dpi))
+            if pages is not None:
+                self._entries.move_to_end((key, fmt, dpi))
+                self.hits += 1
+                return PreviewResult(key, fmt, pages, True)
+            self.misses += 1
+
+        result = self.pdf_service.render(cv_data, font_sizes)
+        pages = self._rasterize(result.data, fmt, dpi)
+        with self._lock:
+            self._entries[(result.key, fmt, dpi)] = pages
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return PreviewResult(result.key, fmt, pages, False)
+
+    def stats(self) -> Dict[str, Any]:
+        """Retorna los contadores de la caché de vistas previas."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'available': self.available,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hitRatio': round(self.hits / lookups, 4) if lookups else 0.0,
+                'entries': len(self._entries)
+            }
+
+    @staticmethod
+    def _rasterize(pdf_bytes: bytes, fmt: str, dpi: int) -> List[str]:
+        """Convierte cada página del PDF en una imagen codificada en base64."""
+        pages = []
+        with load_pymupdf().open(stream=pdf_bytes, filetype='pdf') as document:
+            for page in document:
+                if fmt == 'svg':
+                    image = page.get_svg_image(text_as_path=False).encode('utf-8')
+                else:
+                    image = page.get_pixmap(dpi=dpi, alpha=False).tobytes('png')
+                pages.append(base64.b64encode(image).decode('ascii'))
+        return pages
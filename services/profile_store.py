@@ -0,0 +1,308 @@
+"""
+Perfiles de CV: variantes del CV base adaptadas a cada empleo.
+
+Cada variante guarda solo sus diferencias (operaciones JSON Patch) respecto
+del CV base o de otra variante, nunca una copia completa. Al resolverla se
+aplican las capas en orden y el resultado comparte con el base todas las
+partes que no cambian.
+
+Estructura en disco (Config.PROFILES_DIR):
+- index.json: nombre, padre, empleo, título y revisión de cada variante.
+- variants/<nombre>.json: operaciones de la variante (se lee solo al resolverla).
+
+Con STORAGE_BACKEND=sqlite cada variante es una fila de cv_profiles (ver
+services/sqlite_storage.py) en lugar de un archivo.
+"""
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from config.settings import Config
+from services.data_service import DataService, JSONFileBackend, content_revision
+from services.json_patch import JsonPatchError, apply_patch, diff_operations
+from services.sqlite_storage import DEFAULT_PROFILE
+
+VARIANT_NAME_PATTERN = re.compile(r'^[A-Za-z0-9][A-Za-z0-9_-]{0,63}$')
+
+
+class VariantNotFoundError(KeyError):
+    """La variante pedida no existe."""
+
+
+class VariantConflictError(ValueError):
+    """La operación dejaría las variantes en un estado inválido (ej: un ciclo)."""
+
+
+class ProfileStore:
+    """
+    Variantes del CV guardadas como diferencias sobre el CV base.
+
+    Listar las variantes solo lee el índice. Los archivos de cada variante
+    se leen la primera vez que se resuelve y las variantes resueltas se
+    guardan en una caché LRU, invalidada por la revisión del CV base y de
+    cada capa.
+    """
+
+    def __init__(self, base_service: DataService, directory: str, cache_size: int = 32,
+                 max_depth: int = 8):
+        """
+        Inicializa el almacén.
+
+        Args:
+            base_service: Servicio de datos del CV base.
+            directory: Carpeta del índice y de los archivos de variantes.
+            cache_size: Número de variantes resueltas que se mantienen en memoria.
+            max_depth: Máximo de capas (variantes encadenadas) por variante.
+        """
+        self.base_service = base_service
+        self.directory = directory
+        self.cache_size = cache_size
+        self.max_depth = max_depth
+        self.index = self._service(os.path.join(directory, 'index.json'))
+        self._variants: Dict[str, DataService] = {}
+        self._resolved: 'OrderedDict[str, Tuple[Tuple[int, ...], Dict[str, Any]]]' = OrderedDict()
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _service(path: str, variant: Optional[str] = None) -> DataService:
+        """
+        Servicio de datos para el índice (variant None) o una variante, sin escritura diferida.
+
+        Usa archivos JSON compactos, o las filas de cv_profiles con STORAGE_BACKEND=sqlite.
+        """
+        if Config.STORAGE_BACKEND == 'sqlite':
+            from services.sqlite_storage import (SQLiteVariantBackend, SQLiteVariantsIndexBackend,
+                                                 get_sqlite_storage)
+            storage = get_sqlite_storage()
+            backend = (SQLiteVariantsIndexBackend(storage) if variant is None
+                       else SQLiteVariantBackend(storage, variant))
+        else:
+            backend = JSONFileBackend(path, compact=True)
+        service = DataService(path, backend=backend)
+        if DataService._multiprocess:
+            os.makedirs(os.path.dirname(path), exist_ok=True)  # para el archivo de bloqueo
+            service._use_process_lock()
+        return service
+
+    @staticmethod
+    def validate_name(name: str) -> None:
+        """
+        Comprueba que el nombre sirva como nombre de archivo y de fila de cv_profiles.
+
+        Raises:
+            ValueError: Si el nombre no es válido.
+        """
+        if not isinstance(name, str) or not VARIANT_NAME_PATTERN.match(name):
+            raise ValueError("Nombre de variante inválido: use letras, números, '-' o '_' (máx. 64)")
+        if name == DEFAULT_PROFILE:
+            raise ValueError(f"El nombre {name!r} está reservado para el CV base")
+
+    def _variant_service(self, name: str) -> DataService:
+        with self._lock:
+            service = self._variants.get(name)
+            if service is None:
+                service = self._service(os.path.join(self.directory, 'variants', f"{name}.json"), name)
+                self._variants[name] = service
+            return service
+
+    def _entries(self) -> Dict[str, Dict[str, Any]]:
+        return self.index.load_raw().get('variants') or {}
+
+    def list_variants(self) -> List[Dict[str, Any]]:
+        """
+        Lista las variantes sin leer sus archivos.
+
+        Returns:
+            Lista de entradas del índice ordenadas por nombre.
+        """
+        entries = self._entries()
+        return [dict(entries[name], name=name) for name in sorted(entries)]
+
+    def entry(self, name: str) -> Dict[str, Any]:
+        """
+        Retorna la entrada del índice de una variante.
+
+        Raises:
+            VariantNotFoundError: Si no existe.
+        """
+        entry = self._entries().get(name)
+        if entry is None:
+            raise VariantNotFoundError(name)
+        return dict(entry, name=name)
+
+    def _chain(self, name: str, entries: Dict[str, Dict[str, Any]]) -> List[str]:
+        """Nombres de las capas de una variante, desde la más cercana al base."""
+        chain = []
+        current: Optional[str] = name
+        while current is not None:
+            if current not in entries:
+                raise VariantNotFoundError(current)
+            if current in chain:
+                raise VariantConflictError(f"Las variantes forman un ciclo: {' -> '.join(chain + [current])}")
+            if len(chain) >= self.max_depth:
+                raise VariantConflictError(f"La variante {name!r} supera {self.max_depth} capas")
+            chain.append(current)
+            current = entries[current].get('parent')
+        chain.reverse()
+        return chain
+
+    def operations(self, name: str) -> List[Dict[str, Any]]:
+        """Retorna las operaciones guardadas de una variante (sin sus capas inferiores)."""
+        self.entry(name)
+        return self._variant_service(name).load_raw().get('ops') or []
+
+    def resolve(self, name: str) -> Tuple[Dict[str, Any], int]:
+        """
+        Construye el CV de una variante aplicando sus capas sobre el CV base.
+
+        El resultado es compartido con la caché: no debe modificarse.
+
+        Args:
+            name: Nombre de la variante.
+
+        Returns:
+            Tupla (CV resuelto, revisión).
+
+        Raises:
+            VariantNotFoundError: Si la variante (o una de sus capas) no existe.
+            VariantConflictError: Si las capas forman un ciclo o una ya no aplica sobre el base.
+        """
+        base, base_revision = self.base_service.load_with_revision()
+        entries = self._entries()
+        chain = self._chain(name, entries)
+        key = (base_revision,) + tuple(entries[layer].get('revision', 0) for layer in chain)
+
+        with self._lock:
+            cached = self._resolved.get(name)
+            if cached is not None and cached[0] == key:
+                self._resolved.move_to_end(name)
+                self.hits += 1
+                return cached[1], content_revision(key)
+            self.misses += 1
+
+        data = base
+        for depth, layer in enumerate(chain):
+            # Reutilizar las capas inferiores ya resueltas (otra variante con el mismo padre)
+            with self._lock:
+                cached = self._resolved.get(layer)
+            if layer != name and cached is not None and cached[0] == key[:depth + 2]:
+                data = cached[1]
+                continue
+            try:
+                data = apply_patch(data, self.operations(layer))
+            except JsonPatchError as e:
+                raise VariantConflictError(f"La variante {layer!r} no aplica sobre el CV actual: {e}") from None
+
+        with self._lock:
+            self._resolved[name] = (key, data)
+            self._resolved.move_to_end(name)
+            while len(self._resolved) > self.cache_size:
+                self._resolved.popitem(last=False)
+        return data, content_revision(key)
+
+    def save(self, name: str, data: Dict[str, Any], parent: Optional[str] = None,
+             metadata: Optional[Dict[str, Any]] = None,
+             validate: Optional[Callable[[Dict[str, Any]], Any]] = None) -> Dict[str, Any]:
+        """
+        Crea o reemplaza una variante a partir del CV completo adaptado.
+
+        Solo se guardan las diferencias entre data y el CV de su padre (el
+        CV base si parent es None). Las que apuntan a un elemento de una
+        lista por su posición llevan un 'test' de los campos que lo
+        identifican: si el padre se reordena, resolve() reporta el conflicto
+        en lugar de modificar otro elemento.
+
+        Args:
+            name: Nombre de la variante.
+            data: CV completo de la variante.
+            parent: Variante sobre la que se construye (None para el CV base).
+            metadata: Campos descriptivos del índice (ej: empleoId, title).
+            validate: Función que recibe data y lanza una excepción si no es válido.
+
+        Returns:
+            Dict: Entrada del índice de la variante.
+
+        Raises:
+            ValueError: Si el nombre no es válido.
+            VariantNotFoundError: Si parent no existe.
+            VariantConflictError: Si parent depende de la propia variante.
+        """
+        self.validate_name(name)
+        if not isinstance(data, dict):
+            raise ValueError("El CV de la variante debe ser un objeto")
+        if validate is not None:
+            validate(data)
+        if parent is not None:
+            entries = self._entries()
+            if parent == name or name in self._chain(parent, entries):
+                raise VariantConflictError(f"{parent!r} no puede ser padre de {name!r}")
+            origin, _ = self.resolve(parent)
+        else:
+            origin = self.base_service.load_raw()
+
+        operations = diff_operations(origin, data)
+        variant = self._variant_service(name)
+        if not variant.save_raw({'ops': operations}):
+            raise OSError("No se pudo guardar la variante")
+
+        entry = dict(metadata or {})
+        entry.update({
+            'parent': parent,
+            'ops': sum(1 for operation in operations if operation['op'] != 'test'),
+            'revision': variant.revision,
+            'updatedAt': round(time.time(), 3)
+        })
+        self._update_index(name, entry)
+        return dict(entry, name=name)
+
+    def delete(self, name: str) -> None:
+        """
+        Elimina una variante.
+
+        Raises:
+            VariantNotFoundError: Si no existe.
+            VariantConflictError: Si otras variantes la usan como padre.
+        """
+        self.entry(name)
+        children = [child for child, entry in self._entries().items() if entry.get('parent') == name]
+        if children:
+            raise VariantConflictError(f"La variante {name!r} es padre de: {', '.join(sorted(children))}")
+        self._update_index(name, None)
+        with self._lock:
+            self._resolved.pop(name, None)
+            service = self._variants.pop(name, None)
+        path = service.data_file_path if service else os.path.join(self.directory, 'variants', f"{name}.json")
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def _update_index(self, name: str, entry: Optional[Dict[str, Any]]) -> None:
+        """Agrega, reemplaza (entry) o elimina (None) la entrada de una variante."""
+        path = f"/variants/{name}"
+        with self._lock:
+            if entry is None:
+                operations = [{'op': 'remove', 'path': path}]
+            elif 'variants' not in self.index.load_raw():
+                operations = [{'op': 'add', 'path': '/variants', 'value': {name: entry}}]
+            else:
+                operations = [{'op': 'add', 'path': path, 'value': entry}]
+            self.index.patch(operations)
+
+    def stats(self) -> Dict[str, Any]:
+        """Retorna el número de variantes y la eficacia de la caché de resolución."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'variants': len(self._entries()),
+                'loaded': len(self._variants),
+                'resolvedCached': len(self._resolved),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hitRatio': round(self.hits / lookups, 4) if lookups else 0.0
+            }
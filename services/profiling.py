@@ -0,0 +1,157 @@
+"""
+Perfilado de renderizados lentos de PDF.
+
+Envuelve la construcción del PDF con cProfile (archivo .pstats) o con un
+muestreador de pilas (archivo .collapsed, compatible con flamegraph.pl y
+speedscope). Si el render supera el umbral configurado, o si se pidió
+explícitamente, guarda el perfil junto al payload que lo produjo, ambos
+nombrados por el hash del contenido, para poder reproducirlo.
+"""
+import cProfile
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, Optional, Tuple
+
+PROFILE_MODES = ('cprofile', 'sampling')
+
+
+class StackSampler:
+    """Muestreador de pilas de un hilo, en segundo plano."""
+
+    def __init__(self, thread_id: int, interval: float = 0.001, root=None):
+        """
+        Inicializa el muestreador.
+
+        Args:
+            thread_id: Identificador del hilo a muestrear (threading.get_ident()).
+            interval: Segundos entre muestras.
+            root: Marco a partir del cual se registran las pilas (se omiten sus llamadores).
+        """
+        self.thread_id = thread_id
+        self.interval = interval
+        self.root = root
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+
+    @staticmethod
+    def _frame_name(frame) -> str:
+        code = frame.f_code
+        module = os.path.splitext(os.path.basename(code.co_filename))[0]
+        name = getattr(code, 'co_qualname', code.co_name)
+        return f"{module}:{name}".replace(';', ',').replace(' ', '_')
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None and frame is not self.root:
+                stack.append(self._frame_name(frame))
+                frame = frame.f_back
+            if stack:
+                self.stacks[';'.join(reversed(stack))] += 1
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def collapsed(self) -> str:
+        """Pilas en formato "marco;marco;marco conteo", una por línea."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+class RenderProfiler:
+    """Perfila renders de PDF y guarda los artefactos de los lentos."""
+
+    def __init__(self, config):
+        """
+        Inicializa el perfilador.
+
+        Args:
+            config: Configuración (PDF_PROFILE_*).
+        """
+        self.enabled = config.PDF_PROFILE_ENABLED
+        self.mode = config.PDF_PROFILE_MODE if config.PDF_PROFILE_MODE in PROFILE_MODES else 'cprofile'
+        self.threshold = config.PDF_PROFILE_THRESHOLD_MS / 1000
+        self.output_dir = config.PDF_PROFILE_DIR
+        self.sample_interval = config.PDF_PROFILE_SAMPLE_INTERVAL
+        # cProfile no admite dos perfiles activos a la vez en el proceso
+        self._lock = threading.Lock()
+        self.saved = 0
+
+    def run(self, key: str, payload: Callable[[], Dict[str, Any]], fn: Callable[[], Any],
+            force: bool = False) -> Tuple[Any, Optional[str]]:
+        """
+        Ejecuta fn() perfilándola si el perfilado está habilitado o se fuerza.
+
+        Args:
+            key: Hash del payload (nombre de los artefactos).
+            payload: Función que retorna los datos del render (se llama solo si se guarda).
+            fn: Render a ejecutar.
+            force: Perfilar y guardar aunque no se supere el umbral (ej: ?profile=1).
+
+        Returns:
+            Tupla (resultado de fn, ruta del perfil guardado o None).
+        """
+        if not (self.enabled or force) or not self._lock.acquire(blocking=False):
+            return fn(), None
+        try:
+            start = time.perf_counter()
+            if self.mode == 'sampling':
+                sampler = StackSampler(threading.get_ident(), self.sample_interval, sys._getframe())
+                sampler.start()
+                try:
+                    result = fn()
+                finally:
+                    sampler.stop()
+                profile = sampler
+            else:
+                profile = cProfile.Profile()
+                result = profile.runcall(fn)
+            elapsed = time.perf_counter() - start
+        finally:
+            self._lock.release()
+
+        if not force and elapsed < self.threshold:
+            return result, None
+        return result, self._save(key, payload(), profile, elapsed)
+
+    def _save(self, key: str, payload: Dict[str, Any], profile, elapsed: float) -> Optional[str]:
+        """Guarda el perfil y el payload; retorna la ruta del perfil."""
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            base = os.path.join(self.output_dir, f"{key[:16]}-{time.strftime('%Y%m%d-%H%M%S')}")
+            if isinstance(profile, StackSampler):
+                path = f"{base}.collapsed"
+                with open(path, 'w', encoding='utf-8') as f:
+                    f.write(profile.collapsed())
+            else:
+                path = f"{base}.pstats"
+                profile.dump_stats(path)
+            payload_path = os.path.join(self.output_dir, f"{key[:16]}.json")
+            if not os.path.exists(payload_path):
+                with open(payload_path, 'w', encoding='utf-8') as f:
+                    json.dump(dict(payload, renderKey=key), f, indent=2, ensure_ascii=False)
+        except OSError as e:
+            print(f"Error saving PDF profile: {e}")
+            return None
+        self.saved += 1
+        print(f"Perfil de render lento ({elapsed * 1000:.0f} ms) guardado en {path}")
+        return path
+
+    def stats(self) -> Dict[str, Any]:
+        """Retorna la configuración y el número de perfiles guardados."""
+        return {
+            'enabled': self.enabled,
+            'mode': self.mode,
+            'thresholdMs': round(self.threshold * 1000, 1),
+            'dir': self.output_dir,
+            'saved': self.saved
+        }
@@ -0,0 +1,275 @@
+"""
+Armado del prompt para la IA en el servidor.
+
+Las plantillas tienen nombre y marcadores:
+- {{nombre}}: se reemplaza por el valor (prompt, job_info, cv_json).
+- {{#nombre}}...{{/nombre}}: el bloque solo se incluye si el valor no está vacío.
+
+Las plantillas (las incluidas más Config.PROMPT_TEMPLATES) se compilan una
+sola vez, al crear el armador, a una lista de partes, y los textos armados se guardan en una caché LRU por (versión de
+la plantilla, revisión del CV, hash del prompt y de la información del
+puesto), que también sirve de ETag.
+"""
+import hashlib
+import json
+import math
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+try:
+    import tiktoken
+except ImportError:  # opcional: sin él se usa una estimación
+    tiktoken = None
+
+from services.codec import codec
+
+PLACEHOLDERS = ('prompt', 'job_info', 'cv_json')
+
+# Misma composición que armaba antes el botón "Copiar Todo" de Prompt IA
+BUILTIN_TEMPLATES = {
+    'combined': (
+        "{{#prompt}}PROMPT:\n{{prompt}}\n\n{{/prompt}}"
+        "{{#job_info}}INFORMACIÓN DEL PUESTO:\n{{job_info}}\n\n{{/job_info}}"
+        "DATOS ACTUALES (JSON):\n{{cv_json}}"
+    ),
+    'cv_only': "{{#prompt}}{{prompt}}\n\n{{/prompt}}{{cv_json}}",
+}
+
+# Campos del CV que no se envían a la IA (tipografía del PDF)
+TYPOGRAPHY_KEYS = ('fontFamily', 'fontSizes')
+
+TAG_PATTERN = re.compile(r'{{\s*([#/]?)\s*([A-Za-z_][A-Za-z0-9_]*)\s*}}')
+TOKEN_PIECE_PATTERN = re.compile(r'\w+|[^\w\s]', re.UNICODE)
+
+Part = Union[str, Tuple[str, str], Tuple[str, str, list]]
+
+
+class TemplateError(ValueError):
+    """La plantilla tiene un error de sintaxis o un marcador desconocido."""
+
+
+class TemplateNotFoundError(KeyError):
+    """La plantilla pedida no existe."""
+
+
+def compile_template(source: str) -> List[Part]:
+    """
+    Compila una plantilla a una lista de partes.
+
+    Returns:
+        Lista de textos literales, ('var', nombre) y ('section', nombre, partes).
+
+    Raises:
+        TemplateError: Si un bloque no está cerrado o un marcador no existe.
+    """
+    root: List[Part] = []
+    stack: List[Tuple[Optional[str], List[Part]]] = [(None, root)]
+    position = 0
+    for match in TAG_PATTERN.finditer(source):
+        parts = stack[-1][1]
+        if match.start() > position:
+            parts.append(source[position:match.start()])
+        position = match.end()
+        kind, name = match.groups()
+        if name not in PLACEHOLDERS:
+            raise TemplateError(f"Marcador desconocido: {name!r} (disponibles: {', '.join(PLACEHOLDERS)})")
+        if kind == '#':
+            section: List[Part] = []
+            parts.append(('section', name, section))
+            stack.append((name, section))
+        elif kind == '/':
+            if stack[-1][0] != name:
+                raise TemplateError(f"Cierre de bloque inesperado: {{{{/{name}}}}}")
+            stack.pop()
+        else:
+            parts.append(('var', name))
+    if len(stack) > 1:
+        raise TemplateError(f"Bloque sin cerrar: {{{{#{stack[-1][0]}}}}}")
+    if position < len(source):
+        root.append(source[position:])
+    return root
+
+
+def render_parts(parts: List[Part], values: Dict[str, str], out: List[str]) -> None:
+    """Agrega a out el texto de una plantilla compilada."""
+    for part in parts:
+        if isinstance(part, str):
+            out.append(part)
+        elif part[0] == 'var':
+            out.append(values.get(part[1], ''))
+        elif values.get(part[1]):
+            render_parts(part[2], values, out)
+
+
+def cv_json(cv: Dict[str, Any]) -> str:
+    """CV sin la tipografía, con sangría de 4 espacios (igual que JSON.stringify(data, null, 4))."""
+    filtered = {key: value for key, value in cv.items() if key not in TYPOGRAPHY_KEYS}
+    return json.dumps(filtered, indent=4, ensure_ascii=False)
+
+
+_encoding = None
+_encoding_lock = threading.Lock()
+
+
+def _tiktoken_encoding():
+    """Codificación de tiktoken, o None si no está disponible."""
+    global _encoding
+    if tiktoken is None:
+        return None
+    with _encoding_lock:
+        if _encoding is None:
+            try:
+                _encoding = tiktoken.get_encoding('cl100k_base')
+            except Exception as e:  # ej: sin red para descargar el vocabulario
+                print(f"tiktoken no disponible, se estiman los tokens: {e}")
+                _encoding = False
+    return _encoding or None
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Cantidad de tokens de un texto, para presupuestar el prompt.
+
+    Con tiktoken instalado es la cuenta exacta de cl100k_base; si no, una
+    estimación por palabras (una cada 6 letras) y signos, que suele quedar
+    algo por encima de la real.
+    """
+    if not text:
+        return 0
+    encoding = _tiktoken_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    count = 0
+    for piece in TOKEN_PIECE_PATTERN.findall(text):
+        count += math.ceil(len(piece) / 6) if piece[0].isalnum() or piece[0] == '_' else 1
+    return count
+
+
+class RenderedPrompt:
+    """Prompt armado, con su ETag y la estimación de tokens por parte."""
+
+    __slots__ = ('text', 'etag', 'tokens', 'template', '_encoded')
+
+    def __init__(self, text: str, etag: str, tokens: Dict[str, int], template: str):
+        self.text = text
+        self.etag = etag
+        self.tokens = tokens
+        self.template = template
+        self._encoded: Optional[bytes] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'template': self.template,
+            'text': self.text,
+            'chars': len(self.text),
+            'tokens': self.tokens
+        }
+
+    def encoded(self) -> bytes:
+        """to_dict() en JSON (se codifica una sola vez)."""
+        if self._encoded is None:
+            self._encoded = codec.dumps(self.to_dict())
+        return self._encoded
+
+
+class PromptBuilder:
+    """
+    Arma el prompt a partir de una plantilla, el prompt, el puesto y el CV.
+
+    Es seguro usar una instancia desde varios hilos.
+    """
+
+    def __init__(self, cache_size: int = 64, templates: Optional[Dict[str, str]] = None):
+        """
+        Inicializa el armador y compila las plantillas.
+
+        Args:
+            cache_size: Prompts armados que se mantienen en memoria.
+            templates: Plantillas adicionales por nombre (pueden reemplazar las incluidas).
+
+        Raises:
+            TemplateError: Si alguna plantilla no es válida.
+        """
+        self.cache_size = cache_size
+        self._templates: Dict[str, Tuple[str, List[Part]]] = {}
+        for name, source in dict(BUILTIN_TEMPLATES, **(templates or {})).items():
+            try:
+                self._templates[name] = (self._hash(source), compile_template(source))
+            except TemplateError as e:
+                raise TemplateError(f"Plantilla {name!r}: {e}") from None
+        self._rendered: 'OrderedDict[Tuple, RenderedPrompt]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _hash(*texts: str) -> str:
+        digest = hashlib.blake2b(digest_size=16)
+        for text in texts:
+            digest.update(text.encode('utf-8'))
+            digest.update(b'\x00')
+        return digest.hexdigest()
+
+    def template_names(self) -> List[str]:
+        """Nombres de las plantillas disponibles."""
+        return sorted(self._templates)
+
+    def render(self, template: str, prompt: str, job_info: str,
+               cv: Dict[str, Any], cv_revision: Union[int, str]) -> RenderedPrompt:
+        """
+        Arma el prompt (o lo toma de la caché).
+
+        Args:
+            template: Nombre de la plantilla.
+            prompt: Instrucciones para la IA.
+            job_info: Información del puesto.
+            cv: Datos del CV.
+            cv_revision: Revisión del CV (identifica su contenido).
+
+        Returns:
+            RenderedPrompt con el texto, el ETag y los tokens estimados.
+
+        Raises:
+            TemplateNotFoundError: Si la plantilla no existe.
+        """
+        compiled = self._templates.get(template)
+        if compiled is None:
+            raise TemplateNotFoundError(template)
+        version, parts = compiled
+        key = (template, version, cv_revision, self._hash(prompt, job_info))
+        with self._lock:
+            cached = self._rendered.get(key)
+            if cached is not None:
+                self._rendered.move_to_end(key)
+                self.hits += 1
+                return cached
+            self.misses += 1
+
+        values = {'prompt': prompt, 'job_info': job_info, 'cv_json': cv_json(cv)}
+        out: List[str] = []
+        render_parts(parts, values, out)
+        text = ''.join(out)
+        tokens = {name: estimate_tokens(value) for name, value in values.items()}
+        tokens['total'] = estimate_tokens(text)
+        rendered = RenderedPrompt(text, self._hash(*map(str, key)), tokens, template)
+
+        with self._lock:
+            self._rendered[key] = rendered
+            while len(self._rendered) > self.cache_size:
+                self._rendered.popitem(last=False)
+        return rendered
+
+    def stats(self) -> Dict[str, Any]:
+        """Retorna el número de plantillas y la eficacia de la caché de prompts."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'tokenizer': 'tiktoken' if _encoding else 'estimate',
+                'templates': len(self._templates),
+                'rendered': len(self._rendered),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hitRatio': round(self.hits / lookups, 4) if lookups else 0.0
+            }
@@ -0,0 +1,584 @@
+"""
+Almacenamiento SQLite para perfiles de CV, prompts y empleos.
+Alternativa a los archivos JSON con actualizaciones por fila en lugar de reescrituras completas.
+
+La tabla cv_profiles guarda el CV base (kind = 'cv') y sus variantes por
+empleo (kind = 'variant'): de cada variante, sus operaciones JSON Patch en
+data y su entrada del índice en entry.
+"""
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Any, List, Optional
+from config.settings import Config
+from services.codec import codec
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS revisions (
+    name TEXT PRIMARY KEY,
+    revision INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS documents (
+    name TEXT PRIMARY KEY,
+    data TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS cv_profiles (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL UNIQUE,
+    full_name TEXT,
+    data TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    kind TEXT NOT NULL DEFAULT 'cv',
+    entry TEXT
+);
+
+CREATE TABLE IF NOT EXISTS experience_items (
+    profile_id INTEGER NOT NULL REFERENCES cv_profiles(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    company TEXT,
+    role TEXT,
+    duration TEXT,
+    data TEXT NOT NULL,
+    PRIMARY KEY (profile_id, position)
+);
+
+CREATE TABLE IF NOT EXISTS empleos (
+    id TEXT PRIMARY KEY,
+    seq INTEGER NOT NULL,
+    nombre_empresa TEXT,
+    link_empleo TEXT,
+    fecha TEXT,
+    data TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_empleos_seq ON empleos(seq);
+CREATE INDEX IF NOT EXISTS idx_empleos_fecha ON empleos(fecha);
+CREATE INDEX IF NOT EXISTS idx_empleos_empresa ON empleos(nombre_empresa COLLATE NOCASE);
+"""
+
+# Columnas agregadas después de la primera versión del esquema
+MIGRATIONS = {
+    'cv_profiles': (
+        ('kind', "TEXT NOT NULL DEFAULT 'cv'"),
+        ('entry', 'TEXT'),
+    ),
+}
+
+# Nombre del perfil que corresponde a cv_data.json
+DEFAULT_PROFILE = 'default'
+
+# Revisión del índice de variantes
+VARIANTS_REVISION = 'variants'
+
+
+def _dumps(data: Any) -> str:
+    """Serializa de forma estable para poder comparar filas."""
+    return codec.dumps(data, sort_keys=True).decode('utf-8')
+
+
+class SQLiteStorage:
+    """
+    Base de datos SQLite en modo WAL con una conexión por hilo.
+
+    Guarda los CVs como perfiles (una fila por perfil más una fila por
+    experiencia), los empleos como una fila cada uno y cualquier otro
+    documento (ej: prompts) como JSON en la tabla documents.
+    """
+
+    def __init__(self, db_path: str):
+        """
+        Inicializa la base de datos y crea el esquema si no existe.
+
+        Args:
+            db_path: Ruta al archivo SQLite.
+        """
+        self.db_path = db_path
+        self._local = threading.local()
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self._connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(SCHEMA)
+        self._migrate(conn)
+
+    @staticmethod
+    def _migrate(conn: sqlite3.Connection) -> None:
+        """Agrega a una base de datos existente las columnas que le falten."""
+        for table, columns in MIGRATIONS.items():
+            existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+            for column, definition in columns:
+                if column not in existing:
+                    conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+    def _connection(self) -> sqlite3.Connection:
+        """Retorna la conexión del hilo actual, creándola si hace falta."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA foreign_keys=ON")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _transaction(self):
+        """Abre una transacción de escritura (BEGIN IMMEDIATE)."""
+        return _Transaction(self._connection())
+
+    # --- Revisiones ---
+
+    def revision(self, name: str) -> int:
+        """Retorna la revisión actual de un documento (0 si nunca se escribió)."""
+        row = self._connection().execute(
+            "SELECT revision FROM revisions WHERE name = ?", (name,)
+        ).fetchone()
+        return row[0] if row else 0
+
+    def _bump_revision(self, conn: sqlite3.Connection, name: str) -> None:
+        conn.execute(
+            "INSERT INTO revisions (name, revision) VALUES (?, 1) "
+            "ON CONFLICT(name) DO UPDATE SET revision = revision + 1",
+            (name,)
+        )
+
+    # --- Documentos genéricos ---
+
+    def read_document(self, name: str) -> Optional[Dict[str, Any]]:
+        """Lee un documento genérico, o None si no existe."""
+        row = self._connection().execute(
+            "SELECT data FROM documents WHERE name = ?", (name,)
+        ).fetchone()
+        return codec.loads(row[0]) if row else None
+
+    def write_document(self, name: str, data: Dict[str, Any]) -> None:
+        """Guarda un documento genérico completo."""
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO documents (name, data, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET data = excluded.data, updated_at = excluded.updated_at",
+                (name, _dumps(data), time.time())
+            )
+            self._bump_revision(conn, name)
+
+    # --- Perfiles de CV ---
+
+    def list_profiles(self) -> List[Dict[str, Any]]:
+        """Lista los perfiles guardados (sin cargar su contenido ni las variantes)."""
+        rows = self._connection().execute(
+            "SELECT name, full_name, updated_at FROM cv_profiles WHERE kind = 'cv' ORDER BY name"
+        ).fetchall()
+        return [{'name': name, 'fullName': full_name, 'updatedAt': updated_at}
+                for name, full_name, updated_at in rows]
+
+    def read_profile(self, name: str = DEFAULT_PROFILE) -> Optional[Dict[str, Any]]:
+        """
+        Lee un perfil de CV completo.
+
+        Args:
+            name: Nombre del perfil.
+
+        Returns:
+            Dict con el mismo formato que cv_data.json, o None si no existe.
+        """
+        conn = self._connection()
+        row = conn.execute(
+            "SELECT id, data FROM cv_profiles WHERE name = ? AND kind = 'cv'", (name,)
+        ).fetchone()
+        if row is None:
+            return None
+        profile_id, data = row
+        result = codec.loads(data)
+        items = conn.execute(
+            "SELECT data FROM experience_items WHERE profile_id = ? ORDER BY position",
+            (profile_id,)
+        ).fetchall()
+        result['experience'] = [codec.loads(item_data) for (item_data,) in items]
+        return result
+
+    def write_profile(self, data: Dict[str, Any], name: str = DEFAULT_PROFILE) -> None:
+        """
+        Guarda un perfil de CV actualizando solo las filas que cambiaron.
+
+        Args:
+            data: Datos del CV con el formato de cv_data.json.
+            name: Nombre del perfil.
+        """
+        profile_data = {key: value for key, value in data.items() if key != 'experience'}
+        experience = data.get('experience') or []
+        now = time.time()
+
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT id, data, kind FROM cv_profiles WHERE name = ?", (name,)
+            ).fetchone()
+            if row is not None and row[2] != 'cv':
+                raise ValueError(f"{name!r} es una variante, no un perfil de CV")
+            encoded = _dumps(profile_data)
+            if row is None:
+                cursor = conn.execute(
+                    "INSERT INTO cv_profiles (name, full_name, data, updated_at) VALUES (?, ?, ?, ?)",
+                    (name, data.get('fullName'), encoded, now)
+                )
+                profile_id = cursor.lastrowid
+            else:
+                profile_id = row[0]
+                if row[1] != encoded:
+                    conn.execute(
+                        "UPDATE cv_profiles SET full_name = ?, data = ?, updated_at = ? WHERE id = ?",
+                        (data.get('fullName'), encoded, now, profile_id)
+                    )
+
+            existing = dict(conn.execute(
+                "SELECT position, data FROM experience_items WHERE profile_id = ?", (profile_id,)
+            ).fetchall())
+            for position, item in enumerate(experience):
+                item_encoded = _dumps(item)
+                if existing.get(position) == item_encoded:
+                    continue
+                conn.execute(
+                    "INSERT INTO experience_items (profile_id, position, company, role, duration, data) "
+                    "VALUES (?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT(profile_id, position) DO UPDATE SET company = excluded.company, "
+                    "role = excluded.role, duration = excluded.duration, data = excluded.data",
+                    (profile_id, position, item.get('company'), item.get('position'),
+                     item.get('duration'), item_encoded)
+                )
+            conn.execute(
+                "DELETE FROM experience_items WHERE profile_id = ? AND position >= ?",
+                (profile_id, len(experience))
+            )
+            self._bump_revision(conn, f"profile:{name}")
+
+    # --- Variantes de CV ---
+
+    def read_variant_entries(self) -> Dict[str, Dict[str, Any]]:
+        """Retorna las entradas del índice de variantes por nombre."""
+        rows = self._connection().execute(
+            "SELECT name, entry FROM cv_profiles WHERE kind = 'variant' AND entry IS NOT NULL"
+        ).fetchall()
+        return {name: codec.loads(entry) for name, entry in rows}
+
+    def write_variant_entries(self, entries: Dict[str, Dict[str, Any]]) -> None:
+        """
+        Sincroniza el índice de variantes con las filas de cv_profiles.
+
+        Actualiza la entrada de las variantes que cambiaron y borra las
+        indexadas que ya no están en entries. Las variantes recién guardadas
+        (todavía sin entrada) no se tocan.
+
+        Args:
+            entries: Índice completo (nombre -> entrada).
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            existing = dict(conn.execute(
+                "SELECT name, entry FROM cv_profiles WHERE kind = 'variant'"
+            ).fetchall())
+            for name, entry in entries.items():
+                if name not in existing:
+                    raise ValueError(f"La variante {name!r} no tiene operaciones guardadas")
+                encoded = _dumps(entry)
+                if existing[name] != encoded:
+                    conn.execute(
+                        "UPDATE cv_profiles SET full_name = ?, entry = ?, updated_at = ? "
+                        "WHERE name = ? AND kind = 'variant'",
+                        (entry.get('title'), encoded, now, name)
+                    )
+            for name, entry in existing.items():
+                if entry is not None and name not in entries:
+                    conn.execute("DELETE FROM cv_profiles WHERE name = ? AND kind = 'variant'", (name,))
+                    self._bump_revision(conn, f"variant:{name}")
+            self._bump_revision(conn, VARIANTS_REVISION)
+
+    def read_variant(self, name: str) -> Optional[Dict[str, Any]]:
+        """Lee las operaciones de una variante ({'ops': [...]}), o None si no existe."""
+        row = self._connection().execute(
+            "SELECT data FROM cv_profiles WHERE name = ? AND kind = 'variant'", (name,)
+        ).fetchone()
+        return codec.loads(row[0]) if row else None
+
+    def write_variant(self, name: str, data: Dict[str, Any]) -> None:
+        """
+        Guarda las operaciones de una variante.
+
+        Raises:
+            ValueError: Si name es el de un perfil de CV (ej: el CV base).
+        """
+        with self._transaction() as conn:
+            row = conn.execute("SELECT kind FROM cv_profiles WHERE name = ?", (name,)).fetchone()
+            if name == DEFAULT_PROFILE or (row is not None and row[0] != 'variant'):
+                raise ValueError(f"El nombre {name!r} está reservado para un perfil de CV")
+            conn.execute(
+                "INSERT INTO cv_profiles (name, data, updated_at, kind) VALUES (?, ?, ?, 'variant') "
+                "ON CONFLICT(name) DO UPDATE SET data = excluded.data, updated_at = excluded.updated_at",
+                (name, _dumps(data), time.time())
+            )
+            self._bump_revision(conn, f"variant:{name}")
+
+    # --- Empleos ---
+
+    def read_empleos(self) -> List[Dict[str, Any]]:
+        """Lee todos los empleos en el orden en que se registraron."""
+        rows = self._connection().execute("SELECT data FROM empleos ORDER BY seq").fetchall()
+        return [codec.loads(data) for (data,) in rows]
+
+    def write_empleos(self, empleos: List[Dict[str, Any]]) -> None:
+        """
+        Sincroniza la lista de empleos insertando, actualizando o borrando solo las filas necesarias.
+
+        Args:
+            empleos: Lista completa de empleos.
+        """
+        with self._transaction() as conn:
+            existing = {
+                empleo_id: (seq, data)
+                for empleo_id, seq, data in conn.execute("SELECT id, seq, data FROM empleos")
+            }
+            seen = set()
+            for seq, empleo in enumerate(empleos):
+                empleo_id = self._row_key(empleo, seq, seen)
+                seen.add(empleo_id)
+                encoded = _dumps(empleo)
+                row = existing.get(empleo_id)
+                if row is not None and row[1] == encoded:
+                    if row[0] != seq:
+                        # Solo cambió el orden (ej: se borró un empleo anterior)
+                        conn.execute("UPDATE empleos SET seq = ? WHERE id = ?", (seq, empleo_id))
+                    continue
+                self._upsert_empleo(conn, empleo_id, seq, empleo, encoded)
+            for empleo_id in existing.keys() - seen:
+                conn.execute("DELETE FROM empleos WHERE id = ?", (empleo_id,))
+            self._bump_revision(conn, 'empleos')
+
+    @staticmethod
+    def _row_key(empleo: Dict[str, Any], seq: int, seen: set) -> str:
+        """
+        Clave de fila única para un empleo.
+
+        Es su id como texto (1 y "1" son el mismo empleo, como en
+        EmpleosService); los empleos sin id usan "#<posición>". Si la clave
+        ya la usa otro empleo de la lista se le agrega un sufijo, para no
+        pisar su fila.
+        """
+        empleo_id = empleo.get('id')
+        key = f"#{seq}" if empleo_id is None else str(empleo_id)
+        if key in seen:
+            suffix = 2
+            while f"{key}#{suffix}" in seen:
+                suffix += 1
+            key = f"{key}#{suffix}"
+        return key
+
+    def _upsert_empleo(self, conn: sqlite3.Connection, empleo_id: str, seq: int,
+                       empleo: Dict[str, Any], encoded: str) -> None:
+        conn.execute(
+            "INSERT INTO empleos (id, seq, nombre_empresa, link_empleo, fecha, data) "
+            "VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(id) DO UPDATE SET seq = excluded.seq, nombre_empresa = excluded.nombre_empresa, "
+            "link_empleo = excluded.link_empleo, fecha = excluded.fecha, data = excluded.data",
+            (empleo_id, seq, empleo.get('nombreEmpresa'), empleo.get('linkEmpleo'),
+             empleo.get('fecha'), encoded)
+        )
+
+    # --- Migración ---
+
+    def migrate_from_json(self, files: Dict[str, str], overwrite: bool = False) -> Dict[str, str]:
+        """
+        Importa los archivos JSON existentes a la base de datos.
+
+        Args:
+            files: Mapa nombre de documento -> ruta del archivo JSON
+                ('cv_data', 'prompts_data', 'empleos_data', ...).
+            overwrite: Si es True, reemplaza lo que ya exista en la base de datos.
+
+        Un documento con diario (ej: empleos_data.jsonl, ver
+        services/journal_storage.py) se importa con el diario aplicado sobre
+        la instantánea, y después el diario se incorpora a la instantánea.
+
+        Returns:
+            Dict: Resultado por documento ('imported', 'skipped' o 'missing').
+        """
+        from services.journal_storage import JournalBackend
+
+        results = {}
+        for document, path in files.items():
+            source = JournalBackend(path, compact_bytes=0)
+            has_journal = os.path.exists(source.journal_path)
+            if not os.path.exists(path) and not has_journal:
+                results[document] = 'missing'
+                continue
+            backend = SQLiteDocumentBackend(self, document)
+            if backend.signature() is not None and not overwrite:
+                results[document] = 'skipped'
+                continue
+            data = source.read()
+            backend.write(data)
+            if has_journal:
+                # Ya está en SQLite: el diario no debe quedar pendiente junto a los JSON
+                source.write(data)
+            results[document] = 'imported'
+        return results
+
+    def migrate_variants_from_json(self, directory: str, overwrite: bool = False) -> str:
+        """
+        Importa las variantes guardadas como archivos (Config.PROFILES_DIR).
+
+        Args:
+            directory: Carpeta con index.json y variants/<nombre>.json.
+            overwrite: Si es True, reemplaza las variantes que ya existan.
+
+        Returns:
+            str: 'imported', 'skipped' o 'missing'.
+        """
+        index_path = os.path.join(directory, 'index.json')
+        if not os.path.exists(index_path):
+            return 'missing'
+        if self.read_variant_entries() and not overwrite:
+            return 'skipped'
+        with open(index_path, 'rb') as f:
+            entries = codec.loads(f.read()).get('variants') or {}
+        for name in entries:
+            path = os.path.join(directory, 'variants', f"{name}.json")
+            try:
+                with open(path, 'rb') as f:
+                    variant = codec.loads(f.read())
+            except FileNotFoundError:
+                variant = {'ops': []}
+            self.write_variant(name, variant)
+        self.write_variant_entries(entries)
+        return 'imported'
+
+
+class _Transaction:
+    """Context manager de transacción explícita sobre una conexión en autocommit."""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+    def __enter__(self) -> sqlite3.Connection:
+        self.conn.execute("BEGIN IMMEDIATE")
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.conn.execute("ROLLBACK" if exc_type else "COMMIT")
+
+
+class SQLiteDocumentBackend:
+    """
+    Backend de DataService que guarda un documento en SQLite.
+
+    'cv_data' se guarda como el perfil por defecto, 'empleos_data' como
+    filas de la tabla empleos y el resto como documentos JSON.
+    """
+
+    def __init__(self, storage: SQLiteStorage, document: str):
+        """
+        Inicializa el backend.
+
+        Args:
+            storage: Base de datos compartida.
+            document: Nombre del documento (nombre del archivo JSON sin extensión).
+        """
+        self.storage = storage
+        self.document = document
+
+    def _revision_name(self) -> str:
+        if self.document == 'cv_data':
+            return f"profile:{DEFAULT_PROFILE}"
+        if self.document == 'empleos_data':
+            return 'empleos'
+        return self.document
+
+    def signature(self) -> Optional[int]:
+        """Retorna la revisión del documento, o None si nunca se escribió."""
+        revision = self.storage.revision(self._revision_name())
+        return revision or None
+
+    def read(self) -> Dict[str, Any]:
+        """Lee el documento completo."""
+        if self.document == 'cv_data':
+            return self.storage.read_profile() or {}
+        if self.document == 'empleos_data':
+            return {'empleos': self.storage.read_empleos()}
+        return self.storage.read_document(self.document) or {}
+
+    def write(self, data: Dict[str, Any]) -> None:
+        """Guarda el documento (por filas cuando el tipo de documento lo permite)."""
+        if self.document == 'cv_data':
+            self.storage.write_profile(data)
+        elif self.document == 'empleos_data':
+            self.storage.write_empleos(data.get('empleos') or [])
+        else:
+            self.storage.write_document(self.document, data)
+
+
+class SQLiteVariantsIndexBackend:
+    """Backend de DataService para el índice de variantes ({'variants': {...}})."""
+
+    def __init__(self, storage: SQLiteStorage):
+        self.storage = storage
+
+    def signature(self) -> Optional[int]:
+        """Retorna la revisión del índice, o None si nunca se escribió."""
+        return self.storage.revision(VARIANTS_REVISION) or None
+
+    def read(self) -> Dict[str, Any]:
+        return {'variants': self.storage.read_variant_entries()}
+
+    def write(self, data: Dict[str, Any]) -> None:
+        self.storage.write_variant_entries(data.get('variants') or {})
+
+
+class SQLiteVariantBackend:
+    """Backend de DataService para las operaciones de una variante."""
+
+    def __init__(self, storage: SQLiteStorage, name: str):
+        self.storage = storage
+        self.name = name
+
+    def signature(self) -> Optional[int]:
+        """Retorna la revisión de la variante, o None si nunca se escribió."""
+        return self.storage.revision(f"variant:{self.name}") or None
+
+    def read(self) -> Dict[str, Any]:
+        return self.storage.read_variant(self.name) or {}
+
+    def write(self, data: Dict[str, Any]) -> None:
+        self.storage.write_variant(self.name, data)
+
+
+_storage: Optional[SQLiteStorage] = None
+_storage_lock = threading.Lock()
+
+
+def get_sqlite_storage() -> SQLiteStorage:
+    """Retorna la base de datos SQLite compartida (Config.SQLITE_DB_FILE)."""
+    global _storage
+    with _storage_lock:
+        if _storage is None:
+            _storage = SQLiteStorage(Config.SQLITE_DB_FILE)
+        return _storage
+
+
+def migrate_json_to_sqlite(overwrite: bool = False) -> Dict[str, str]:
+    """
+    Migra cv_data.json, prompts_data.json, empleos_data.json y las variantes del CV a SQLite.
+
+    Args:
+        overwrite: Si es True, reemplaza los datos que ya existan en la base de datos.
+
+    Returns:
+        Dict: Resultado por documento.
+    """
+    files = {
+        os.path.splitext(os.path.basename(path))[0]: path
+        for path in (Config.CV_DATA_FILE, Config.PROMPTS_DATA_FILE, Config.EMPLEOS_DATA_FILE)
+    }
+    storage = get_sqlite_storage()
+    results = storage.migrate_from_json(files, overwrite=overwrite)
+    results['profiles'] = storage.migrate_variants_from_json(Config.PROFILES_DIR, overwrite=overwrite)
+    return results
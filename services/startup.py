@@ -0,0 +1,113 @@
+"""
+Medición del arranque de la aplicación.
+Registra cuánto tarda cada fase (imports, creación de la app, precalentamiento)
+y si los servicios de PDF ya están listos.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Any, List, Optional, Tuple
+
+# Instante de referencia: el import más temprano de este módulo (desde app.py)
+PROCESS_START = time.perf_counter()
+
+
+class StartupTimer:
+    """Cronómetro de las fases de arranque."""
+
+    def __init__(self, start: float = PROCESS_START):
+        """
+        Inicializa el cronómetro.
+
+        Args:
+            start: Instante (perf_counter) desde el que se mide el arranque.
+        """
+        self.start = start
+        self._phases: List[Tuple[str, float, float]] = []
+        self._lock = threading.Lock()
+        self._milestones: Dict[str, float] = {}
+        self.pdf_ready = threading.Event()
+        self.warmup_error: Optional[str] = None
+
+    @contextmanager
+    def phase(self, name: str):
+        """
+        Mide la duración de un bloque.
+
+        Args:
+            name: Nombre de la fase (ej: "import routes").
+        """
+        begin = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            with self._lock:
+                self._phases.append((name, begin - self.start, end - begin))
+
+    def mark(self, name: str) -> None:
+        """Registra un hito (ej: "server bound") en milisegundos desde el arranque."""
+        with self._lock:
+            self._milestones[name] = time.perf_counter() - self.start
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Retorna el desglose del arranque.
+
+        Returns:
+            Dict: Fases (inicio y duración en ms), hitos y estado del precalentamiento.
+        """
+        with self._lock:
+            return {
+                'phases': [
+                    {'name': name, 'startMs': round(offset * 1000, 1), 'ms': round(duration * 1000, 1)}
+                    for name, offset, duration in self._phases
+                ],
+                'milestones': {name: round(offset * 1000, 1) for name, offset in self._milestones.items()},
+                'pdfReady': self.pdf_ready.is_set(),
+                'warmupError': self.warmup_error
+            }
+
+    def format_report(self) -> str:
+        """Retorna el desglose del arranque como texto para la consola."""
+        report = self.report()
+        lines = ["Tiempos de arranque:"]
+        for phase in report['phases']:
+            lines.append(f"  {phase['name']:<28} {phase['ms']:>8.1f} ms  (desde {phase['startMs']:.1f} ms)")
+        for name, offset in report['milestones'].items():
+            lines.append(f"  {name:<28} @ {offset:.1f} ms")
+        return "\n".join(lines)
+
+
+startup_timer = StartupTimer()
+
+
+def warm_up_pdf(load_services: Callable[[], Any], timer: StartupTimer = startup_timer) -> None:
+    """
+    Importa ReportLab y crea los servicios de PDF en segundo plano.
+
+    Pensado para ejecutarse en un hilo después de que el servidor acepta
+    conexiones, de modo que la primera página no espere a ReportLab.
+
+    Args:
+        load_services: Función que crea (una sola vez) los servicios de PDF.
+        timer: Cronómetro donde registrar las fases.
+    """
+    try:
+        with timer.phase('warm-up: import reportlab'):
+            import reportlab.platypus  # noqa: F401
+        with timer.phase('warm-up: base styles'):
+            from services.pdf_service import get_base_styles
+            get_base_styles()
+        with timer.phase('warm-up: pdf services'):
+            services = load_services()
+        with timer.phase('warm-up: first render'):
+            # Carga las métricas de las fuentes estándar
+            from models.cv_data import CVData
+            services.pdf.generate(CVData(full_name="Warm Up"))
+    except Exception as e:
+        timer.warmup_error = str(e)
+        print(f"Error warming up PDF services: {e}")
+    finally:
+        timer.mark('pdf ready')
+        timer.pdf_ready.set()
@@ -840,6 +840,47 @@ document.addEventListener('DOMContentLoaded', () => {
         resetFontSizesBtn.addEventListener('click', resetFontSizes);
     }
 
+    // Ajuste automático: el servidor calcula los tamaños más grandes que caben en una página
+    const autofitBtn = document.getElementById('autofitBtn');
+    const autofitMode = document.getElementById('autofitMode');
+
+    if (autofitBtn) {
+        autofitBtn.addEventListener('click', () => {
+            const data = collectCvData();
+            data.maxPages = 1;
+            data.mode = autofitMode ? autofitMode.value : 'uniform';
+
+            autofitBtn.disabled = true;
+            saveStatus.textContent = "Ajustando tamaños...";
+
+            fetch('/autofit', {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json',
+                },
+                body: JSON.stringify(data),
+            })
+                .then(response => response.json())
+                .then(result => {
+                    if (!result.fontSizes) {
+                        throw new Error(result.error || 'Error al ajustar');
+                    }
+                    loadFontSizes({ fontSizes: result.fontSizes });
+                    saveStatus.textContent = result.fits
+                        ? `Ajustado a ${result.pages} página(s) en ${Math.round(result.elapsedMs)} ms. Cambios sin guardar...`
+                        : `No cabe en una página ni con el tamaño mínimo (${result.pages}+ páginas)`;
+                    schedulePreview();
+                })
+                .catch(err => {
+                    console.error('Error in autofit:', err);
+                    saveStatus.textContent = "Error al ajustar tamaños";
+                })
+                .finally(() => {
+                    autofitBtn.disabled = false;
+                });
+        });
+    }
+
     // Reset Education Font Sizes
     function resetEducationFontSizes() {
         const educationKeys = ['educationInstitution', 'educationDegree', 'educationDate', 'educationDescription'];
@@ -891,10 +932,59 @@ document.addEventListener('DOMContentLoaded', () => {
         }
     }
 
+    // Último estado guardado en el servidor y su revisión: al guardar solo se envía lo que cambió
+    let lastSaved = null;
+    let cvRevision = null;
+
+    const parseRevision = etag => {
+        const value = etag ? parseInt(etag.replace(/^W\//, '').replace(/"/g, ''), 10) : NaN;
+        return Number.isNaN(value) ? null : value;
+    };
+
+    const pointerPart = key => String(key).replace(/~/g, '~0').replace(/\//g, '~1');
+    const isPlainObject = value => value !== null && typeof value === 'object' && !Array.isArray(value);
+
+    // Operaciones JSON Patch que llevan los campos de `current` desde `previous`
+    function diffOps(previous, current) {
+        const ops = [];
+        Object.keys(current).forEach(key => {
+            const path = '/' + pointerPart(key);
+            const before = previous[key];
+            const after = current[key];
+            if (!(key in previous)) {
+                ops.push({ op: 'add', path, value: after });
+            } else if (JSON.stringify(before) === JSON.stringify(after)) {
+                return;
+            } else if (Array.isArray(before) && Array.isArray(after) && before.length === after.length) {
+                after.forEach((item, index) => {
+                    if (JSON.stringify(before[index]) !== JSON.stringify(item)) {
+                        ops.push({ op: 'replace', path: `${path}/${index}`, value: item });
+                    }
+                });
+            } else if (isPlainObject(before) && isPlainObject(after)) {
+                Object.keys(before).forEach(subKey => {
+                    if (!(subKey in after)) ops.push({ op: 'remove', path: `${path}/${pointerPart(subKey)}` });
+                });
+                Object.keys(after).forEach(subKey => {
+                    if (JSON.stringify(before[subKey]) !== JSON.stringify(after[subKey])) {
+                        ops.push({ op: 'add', path: `${path}/${pointerPart(subKey)}`, value: after[subKey] });
+                    }
+                });
+            } else {
+                ops.push({ op: 'replace', path, value: after });
+            }
+        });
+        return ops;
+    }
+
     // Load initial data
     fetch('/get_cv_data')
-        .then(response => response.json())
+        .then(response => {
+            cvRevision = parseRevision(response.headers.get('ETag'));
+            return response.json();
+        })
         .then(data => {
+            lastSaved = data;
             if (data.fullName) {
                 fullNameInput.value = data.fullName;
                 previewName.textContent = data.fullName;
@@ -996,9 +1086,9 @@ document.addEventListener('DOMContentLoaded', () => {
         saveStatus.textContent = "Cambios sin guardar...";
     });
 
-    // Save Data
-    saveBtn.addEventListener('click', () => {
-        const data = {
+    // Datos actuales del formulario, en el formato que espera el servidor
+    function collectCvData() {
+        return {
             fullName: fullNameInput.value,
             emailUser: emailUserInput.value,
             emailDomain: emailDomainSelect.value,
@@ -1014,24 +1104,180 @@ document.addEventListener('DOMContentLoaded', () => {
             fontSizes: getFontSizes(),
             fontFamily: globalFontFamilySelect ? globalFontFamilySelect.value : 'Helvetica'
         };
+    }
+
+    // Vista previa exacta: páginas del PDF real renderizadas por el servidor
+    const exactPreviewToggle = document.getElementById('exactPreviewToggle');
+    const htmlPreview = document.getElementById('htmlPreview');
+    const serverPreview = document.getElementById('serverPreview');
+    const PREVIEW_DEBOUNCE_MS = 400;
+    let previewTimer = null;
+    let previewController = null;
+    let previewEtag = null;
+
+    function showHtmlPreview() {
+        htmlPreview.style.display = '';
+        serverPreview.style.display = 'none';
+    }
+
+    async function refreshServerPreview() {
+        // Cancelar la petición anterior: su resultado ya no corresponde al formulario
+        if (previewController) previewController.abort();
+        const controller = new AbortController();
+        previewController = controller;
+
+        const headers = { 'Content-Type': 'application/json' };
+        if (previewEtag) headers['If-None-Match'] = previewEtag;
+        try {
+            const response = await fetch('/preview', {
+                method: 'POST',
+                headers,
+                body: JSON.stringify(collectCvData()),
+                signal: controller.signal,
+            });
+            if (response.status === 304) return;
+            if (response.status === 501) {
+                // Servidor sin PyMuPDF: se mantiene la vista previa HTML
+                exactPreviewToggle.checked = false;
+                exactPreviewToggle.disabled = true;
+                exactPreviewToggle.title = 'Requiere PyMuPDF en el servidor';
+                showHtmlPreview();
+                return;
+            }
+            if (!response.ok) throw new Error(`HTTP ${response.status}`);
+            const preview = await response.json();
+            if (controller.signal.aborted) return;
+            previewEtag = response.headers.get('ETag');
+            serverPreview.replaceChildren(...preview.pages.map((src, index) => {
+                const img = document.createElement('img');
+                img.src = src;
+                img.alt = `Página ${index + 1}`;
+                img.className = 'server-preview-page';
+                return img;
+            }));
+        } catch (err) {
+            if (err.name !== 'AbortError') console.error('Error loading preview:', err);
+        } finally {
+            if (previewController === controller) previewController = null;
+        }
+    }
+
+    function schedulePreview(event) {
+        if (!exactPreviewToggle || !exactPreviewToggle.checked) return;
+        if (event && event.target === exactPreviewToggle) return;
+        clearTimeout(previewTimer);
+        previewTimer = setTimeout(refreshServerPreview, PREVIEW_DEBOUNCE_MS);
+    }
+
+    if (exactPreviewToggle) {
+        exactPreviewToggle.addEventListener('change', () => {
+            if (exactPreviewToggle.checked) {
+                htmlPreview.style.display = 'none';
+                serverPreview.style.display = '';
+                previewEtag = null;
+                refreshServerPreview();
+            } else {
+                if (previewController) previewController.abort();
+                clearTimeout(previewTimer);
+                showHtmlPreview();
+            }
+        });
+        // Cualquier cambio en el editor (incluidos los campos dinámicos) actualiza la vista previa
+        document.addEventListener('input', schedulePreview);
+        document.addEventListener('change', schedulePreview);
+        document.addEventListener('click', event => {
+            if (event.target.closest('button')) schedulePreview();
+        });
+    }
+
+    // Save Data
+    saveBtn.addEventListener('click', () => {
+        const data = collectCvData();
+
+        // Sin estado previo conocido se envían los datos completos
+        const ops = lastSaved && cvRevision !== null ? diffOps(lastSaved, data) : null;
+        if (ops && ops.length === 0) {
+            saveStatus.textContent = "Sin cambios";
+            setTimeout(() => { saveStatus.textContent = ""; }, 2000);
+            return;
+        }
 
         saveStatus.textContent = "Guardando...";
         saveBtn.disabled = true;
 
-        fetch('/save_cv_data', {
+        const saveFull = () => fetch('/save_cv_data', {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json',
             },
             body: JSON.stringify(data),
-        })
-            .then(response => response.json())
+        }).then(response => response.json()).then(result => ({ ...result, full: true }));
+
+        const sendPatch = (patchOps, revision) => fetch('/cv_data', {
+            method: 'PATCH',
+            headers: {
+                'Content-Type': 'application/json-patch+json',
+                'If-Match': `"${revision}"`,
+            },
+            body: JSON.stringify(patchOps),
+        }).then(response => response.json()
+            .catch(() => ({}))  // ej: 405 de un servidor sin la ruta, con cuerpo HTML
+            .then(result => ({ ...result, status: response.status })));
+
+        // El CV cambió en el servidor desde la última carga (409): se traen sus datos y los
+        // campos editados acá se vuelven a aplicar sobre ellos. Si otra sesión cambió los
+        // mismos campos se pregunta antes de sobrescribirlos.
+        const rebase = () => fetch('/get_cv_data')
+            .then(response => response.json().then(server => ({
+                server,
+                revision: parseRevision(response.headers.get('ETag'))
+            })))
+            .then(({ server, revision }) => {
+                const changed = (before, after) => Object.keys(after)
+                    .filter(key => JSON.stringify(before[key]) !== JSON.stringify(after[key]));
+                const mine = changed(lastSaved, data);
+                const theirs = changed(lastSaved, server);
+                const overlap = mine.filter(key => theirs.includes(key));
+                if (overlap.length && !confirm(
+                    `El CV fue modificado en otra sesión (${overlap.join(', ')}).\n` +
+                    'Aceptar: guardar tus cambios sobre esos campos.\n' +
+                    'Cancelar: recargar la versión guardada (se pierden tus cambios).'
+                )) {
+                    location.reload();
+                    return { success: false, reloaded: true };
+                }
+                const mineOnly = Object.fromEntries(mine.map(key => [key, data[key]]));
+                return sendPatch(diffOps(server, mineOnly), revision)
+                    .then(result => ({ ...result, theirs: theirs.filter(key => !mine.includes(key)) }));
+            });
+
+        // Sin soporte de PATCH en el servidor se guarda completo
+        const PATCH_UNSUPPORTED = [404, 405, 415, 501];
+        const save = ops
+            ? sendPatch(ops, cvRevision).then(result => {
+                if (PATCH_UNSUPPORTED.includes(result.status)) return saveFull();
+                if (result.status === 409) return rebase();
+                return result;
+            })
+            : saveFull();
+
+        save
             .then(result => {
                 if (result.success) {
-                    saveStatus.textContent = "¡Guardado!";
-                    setTimeout(() => { saveStatus.textContent = ""; }, 2000);
-                } else {
-                    saveStatus.textContent = "Error al guardar";
+                    // Los campos que cambió otra sesión siguen en el servidor: no se reenvían
+                    lastSaved = result.full ? data : { ...lastSaved, ...data };
+                    cvRevision = result.revision ?? null;
+                    if (result.theirs && result.theirs.length) {
+                        saveStatus.textContent = `¡Guardado! Otra sesión cambió: ${result.theirs.join(', ')} (recarga para verlo)`;
+                        setTimeout(() => { saveStatus.textContent = ""; }, 6000);
+                    } else {
+                        saveStatus.textContent = "¡Guardado!";
+                        setTimeout(() => { saveStatus.textContent = ""; }, 2000);
+                    }
+                } else if (result.status === 409) {
+                    saveStatus.textContent = "El CV volvió a cambiar en otra sesión, intenta de nuevo";
+                } else if (!result.reloaded) {
+                    saveStatus.textContent = result.error ? `Error al guardar: ${result.error}` : "Error al guardar";
                 }
             })
             .catch(err => {
@@ -1043,41 +1289,75 @@ document.addEventListener('DOMContentLoaded', () => {
             });
     });
 
-    // Generate PDF
-    generatePdfBtn.addEventListener('click', () => {
-        const data = {
-            fullName: fullNameInput.value,
-            emailUser: emailUserInput.value,
-            emailDomain: emailDomainSelect.value,
-            phone: phoneInput.value,
-            location: locationInput.value,
-            linkText: linkTextInput.value,
-            linkUrl: linkUrlInput.value,
-            skillsSectionTitle: skillsSectionTitleInput.value || 'TECHNICAL SKILLS',
-            skills: getAllSkills(),
-            experience: getExperienceData(),
-            educationSectionTitle: educationSectionTitleInput.value || 'EDUCATION',
-            education: getAllEducation(),
-            fontSizes: getFontSizes(),
-            fontFamily: globalFontFamilySelect ? globalFontFamilySelect.value : 'Helvetica'
-        };
+    // Último PDF descargado: si el servidor reporta el mismo ETag se reutiliza sin volver a descargarlo
+    let lastPdf = null;
 
-        generatePdfBtn.disabled = true;
-        const originalText = generatePdfBtn.querySelector('span').lastChild.textContent;
-        generatePdfBtn.querySelector('span').lastChild.textContent = ' Generando...';
+    const sleep = ms => new Promise(resolve => setTimeout(resolve, ms));
 
-        fetch('/generate_pdf', {
+    // Encola la generación del PDF; si la cola está llena reintenta según Retry-After
+    async function createPdfJob(data, attempt = 0) {
+        const response = await fetch('/pdf_jobs', {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json',
             },
             body: JSON.stringify(data),
-        })
-            .then(response => {
-                if (response.ok) {
-                    return response.blob();
+        });
+        if (response.status === 429 && attempt < 5) {
+            const retryAfter = parseFloat(response.headers.get('Retry-After')) || 2;
+            await sleep(retryAfter * 1000);
+            return createPdfJob(data, attempt + 1);
+        }
+        if (!response.ok) {
+            throw new Error('Error al generar PDF');
+        }
+        return response.json();
+    }
+
+    // Consulta el estado del trabajo hasta que termine, con espera creciente
+    async function waitForPdfJob(job) {
+        let delay = 100;
+        while (job.status === 'queued' || job.status === 'running') {
+            await sleep(delay);
+            delay = Math.min(delay * 1.5, 1000);
+            const response = await fetch(`/pdf_jobs/${job.id}`);
+            if (!response.ok) {
+                throw new Error('Error al consultar el PDF');
+            }
+            job = await response.json();
+        }
+        if (job.status !== 'done') {
+            throw new Error(job.error || 'Error al generar PDF');
+        }
+        return job;
+    }
+
+    // Generate PDF
+    generatePdfBtn.addEventListener('click', () => {
+        const data = collectCvData();
+
+        generatePdfBtn.disabled = true;
+        const originalText = generatePdfBtn.querySelector('span').lastChild.textContent;
+        generatePdfBtn.querySelector('span').lastChild.textContent = ' Generando...';
+
+        createPdfJob(data)
+            .then(job => waitForPdfJob(job))
+            .then(job => {
+                // Mismo contenido que el último PDF descargado: no hace falta volver a bajarlo
+                if (lastPdf && lastPdf.etag === job.etag) {
+                    return lastPdf.blob;
                 }
-                throw new Error('Error al generar PDF');
+                return fetch(`/pdf_jobs/${job.id}/file`)
+                    .then(response => {
+                        if (!response.ok) {
+                            throw new Error('Error al descargar PDF');
+                        }
+                        return response.blob();
+                    })
+                    .then(blob => {
+                        lastPdf = { etag: job.etag, blob };
+                        return blob;
+                    });
             })
             .then(blob => {
                 const url = window.URL.createObjectURL(blob);
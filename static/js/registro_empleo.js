@@ -7,43 +7,87 @@ document.addEventListener('DOMContentLoaded', () => {
     const empleosList = document.getElementById('empleosList');
     const empleosCount = document.getElementById('empleosCount');
     const emptyState = document.getElementById('emptyState');
+    const empleosSearch = document.getElementById('empleosSearch');
+    const loadMoreButton = document.getElementById('loadMoreEmpleos');
+    const rankButton = document.getElementById('rankEmpleos');
 
+    // Página actual de resultados (el servidor busca, ordena y pagina)
     let empleos = [];
+    let total = 0;
+    let nextCursor = null;
+    // Consulta de los resultados mostrados (la página siguiente debe ser de la misma)
+    let currentQuery = '';
+    let searchTimer = null;
+    // Mostrando el orden por compatibilidad en lugar de la búsqueda
+    let ranking = false;
+    // Petición de lista en curso (búsqueda, página siguiente u orden por compatibilidad)
+    let listController = null;
+
+    /**
+     * Cancela la petición de lista anterior: su resultado ya no corresponde a lo pedido
+     * @returns {AbortController} controlador de la nueva petición
+     */
+    function startListRequest() {
+        if (listController) listController.abort();
+        listController = new AbortController();
+        return listController;
+    }
 
     // Cargar empleos al iniciar
     loadEmpleos();
 
+    // Buscar mientras se escribe (con una breve espera entre teclas)
+    empleosSearch.addEventListener('input', () => {
+        ranking = false;
+        clearTimeout(searchTimer);
+        searchTimer = setTimeout(() => loadEmpleos(), 200);
+    });
+
+    loadMoreButton.addEventListener('click', () => loadEmpleos(true));
+
+    rankButton.addEventListener('click', () => {
+        if (ranking) {
+            ranking = false;
+            loadEmpleos();
+        } else {
+            rankEmpleos();
+        }
+    });
+
     // Manejar el envío del formulario
     empleoForm.addEventListener('submit', async (e) => {
         e.preventDefault();
 
         const nombreEmpresa = document.getElementById('nombreEmpresa').value.trim();
         const linkEmpleo = document.getElementById('linkEmpleo').value.trim();
+        const descripcion = document.getElementById('descripcion').value.trim();
 
         if (!nombreEmpresa) {
             alert('Por favor ingresa el nombre de la empresa');
             return;
         }
 
-        // Crear nuevo empleo
+        // Crear nuevo empleo (solo se envía el nuevo, no la lista completa)
         const nuevoEmpleo = {
             id: Date.now(),
             nombreEmpresa,
             linkEmpleo: linkEmpleo || '', // Permitir link vacío
             fecha: new Date().toISOString()
         };
+        if (descripcion) {
+            nuevoEmpleo.descripcion = descripcion;
+        }
 
-        // Agregar a la lista
-        empleos.push(nuevoEmpleo);
-
-        // Guardar en el servidor
-        await saveEmpleos();
+        if (!await addEmpleo(nuevoEmpleo)) {
+            return;
+        }
 
         // Limpiar formulario
         empleoForm.reset();
 
         // Actualizar vista
-        renderEmpleos();
+        ranking = false;
+        await loadEmpleos();
     });
 
     /**
@@ -57,6 +101,7 @@ document.addEventListener('DOMContentLoaded', () => {
         const modalEmpresa = document.getElementById('modalEmpresa');
         const modalLink = document.getElementById('modalLink');
         const modalFecha = document.getElementById('modalFecha');
+        const modalDescripcion = document.getElementById('modalDescripcion');
 
         // Llenar datos del modal
         modalEmpresa.textContent = empleo.nombreEmpresa;
@@ -78,6 +123,12 @@ document.addEventListener('DOMContentLoaded', () => {
         });
         modalFecha.textContent = fechaFormateada;
 
+        if (empleo.descripcion) {
+            modalDescripcion.textContent = empleo.descripcion;
+        } else {
+            modalDescripcion.innerHTML = '<span style="color: #a0aec0; font-style: italic;">Sin descripción</span>';
+        }
+
         // Mostrar modal
         modal.classList.add('active');
         document.body.style.overflow = 'hidden';
@@ -93,41 +144,91 @@ document.addEventListener('DOMContentLoaded', () => {
     }
 
     /**
-     * Cargar empleos desde el servidor
+     * Cargar una página de empleos desde el servidor
+     * @param {boolean} append - Agregar la página siguiente a las ya mostradas
      */
-    async function loadEmpleos() {
+    async function loadEmpleos(append = false) {
+        const controller = startListRequest();
+        const query = append ? currentQuery : empleosSearch.value.trim();
+        const params = new URLSearchParams({ q: query });
+        if (append && nextCursor) {
+            params.set('cursor', nextCursor);
+        }
         try {
-            const response = await fetch('/get_empleos');
+            const response = await fetch(`/empleos?${params}`, { signal: controller.signal });
             const data = await response.json();
-            empleos = data.empleos || [];
-            renderEmpleos();
+            if (controller.signal.aborted) return;
+            if (!response.ok) {
+                throw new Error(data.error || 'Error al cargar');
+            }
+            empleos = append ? empleos.concat(data.empleos) : data.empleos;
+            currentQuery = query;
+            total = data.total;
+            nextCursor = data.nextCursor;
         } catch (error) {
+            if (error.name === 'AbortError' || controller.signal.aborted) return;
             console.error('Error al cargar empleos:', error);
-            empleos = [];
-            renderEmpleos();
+            if (!append) {
+                empleos = [];
+                total = 0;
+                nextCursor = null;
+            }
+        } finally {
+            if (listController === controller) listController = null;
         }
+        renderEmpleos();
     }
 
     /**
-     * Guardar empleos en el servidor
+     * Cargar los empleos con descripción ordenados por compatibilidad con el CV
      */
-    async function saveEmpleos() {
+    async function rankEmpleos() {
+        const controller = startListRequest();
         try {
-            const response = await fetch('/save_empleos', {
+            const response = await fetch(`/empleos/rank?limit=200`, { signal: controller.signal });
+            const data = await response.json();
+            if (controller.signal.aborted) return;
+            if (!response.ok) {
+                throw new Error(data.error || 'Error al ordenar');
+            }
+            empleos = data.empleos.map(item => ({ ...item.empleo, matchScore: item.score }));
+            total = data.total;
+            nextCursor = null;
+            ranking = true;
+        } catch (error) {
+            if (error.name === 'AbortError' || controller.signal.aborted) return;
+            console.error('Error al ordenar empleos:', error);
+            alert('No se pudieron ordenar los empleos: ' + error.message);
+            return;
+        } finally {
+            if (listController === controller) listController = null;
+        }
+        renderEmpleos();
+    }
+
+    /**
+     * Guardar un empleo nuevo en el servidor
+     * @returns {Promise<boolean>} true si se guardó
+     */
+    async function addEmpleo(empleo) {
+        try {
+            const response = await fetch('/empleos', {
                 method: 'POST',
                 headers: {
                     'Content-Type': 'application/json'
                 },
-                body: JSON.stringify({ empleos })
+                body: JSON.stringify(empleo)
             });
 
             const result = await response.json();
             if (!result.success) {
-                throw new Error('Error al guardar');
+                throw new Error(result.error || 'Error al guardar');
             }
+            return true;
         } catch (error) {
-            console.error('Error al guardar empleos:', error);
-            alert('Error al guardar los empleos. Por favor intenta de nuevo.');
+            console.error('Error al guardar empleo:', error);
+            alert('Error al guardar el empleo. Por favor intenta de nuevo.');
+            return false;
         }
     }
 
@@ -139,8 +240,20 @@ document.addEventListener('DOMContentLoaded', () => {
             return;
         }
 
+        try {
+            const response = await fetch(`/empleos/${encodeURIComponent(id)}`, { method: 'DELETE' });
+            const result = await response.json();
+            if (!result.success) {
+                throw new Error(result.error || 'Error al eliminar');
+            }
+        } catch (error) {
+            console.error('Error al eliminar empleo:', error);
+            alert('Error al eliminar el empleo. Por favor intenta de nuevo.');
+            return;
+        }
+
         empleos = empleos.filter(empleo => empleo.id !== id);
-        await saveEmpleos();
+        total = Math.max(0, total - 1);
         renderEmpleos();
     }
 
@@ -148,12 +261,13 @@ document.addEventListener('DOMContentLoaded', () => {
      * Renderizar la lista de empleos
      */
     function renderEmpleos() {
-        // Actualizar contador
-        const count = empleos.length;
-        empleosCount.textContent = `${count} empleo${count !== 1 ? 's' : ''}`;
+        // Actualizar contador (total de coincidencias, no solo las cargadas)
+        empleosCount.textContent = `${total} empleo${total !== 1 ? 's' : ''}`;
+        loadMoreButton.style.display = nextCursor ? 'block' : 'none';
+        rankButton.textContent = ranking ? 'Volver al orden por fecha' : 'Ordenar por compatibilidad con mi CV';
 
         // Mostrar/ocultar estado vacío
-        if (count === 0) {
+        if (empleos.length === 0) {
             emptyState.style.display = 'block';
             empleosList.innerHTML = '';
             empleosList.appendChild(emptyState);
@@ -162,9 +276,8 @@ document.addEventListener('DOMContentLoaded', () => {
 
         emptyState.style.display = 'none';
 
-        // Renderizar empleos (más recientes primero)
-        const empleosOrdenados = [...empleos].reverse();
-        empleosList.innerHTML = empleosOrdenados.map(empleo => {
+        // Renderizar empleos (el servidor los envía más recientes primero)
+        empleosList.innerHTML = empleos.map(empleo => {
             const fecha = new Date(empleo.fecha);
             const fechaFormateada = fecha.toLocaleDateString('es-ES', {
                 year: 'numeric',
@@ -192,6 +305,9 @@ document.addEventListener('DOMContentLoaded', () => {
             return `
                 <div class="empleo-item">
                     <h3>${escapeHtml(empleo.nombreEmpresa)}</h3>
+                    ${empleo.matchScore !== undefined
+                        ? `<div class="empleo-fecha" style="font-weight: 600; color: #2b6cb0;">Compatibilidad: ${Math.round(empleo.matchScore)}%</div>`
+                        : ''}
                     <div class="empleo-fecha">
                         <svg xmlns="http://www.w3.org/2000/svg" style="width: 14px; height: 14px; display: inline-block; vertical-align: middle; margin-right: 4px;" fill="none" viewBox="0 0 24 24" stroke="currentColor">
                             <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M12 8v4l3 3m6-3a9 9 0 11-18 0 9 9 0 0118 0z" />